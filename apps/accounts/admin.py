@@ -1,3 +1,61 @@
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
-# Register your models here.
+from apps.accounts.forms import UserChangeAdminForm, UserCreationAdminForm
+from apps.accounts.models import User
+from apps.common.admin import LargeTableAdmin
+
+
+@admin.register(User)
+class UserAdmin(LargeTableAdmin, BaseUserAdmin):
+    """Админка пользователей.
+    Создание пользователя и смена пароля работают как в стандартной админке Django:
+    пароль вводится дважды и сохраняется в виде хеша, а на странице пользователя
+    есть ссылка на форму смены пароля. Поиск выполняется по началу email (индекс
+    `varchar_pattern_ops`, который PostgreSQL-бэкенд Django создаёт для
+    уникального поля) или по идентификатору."""
+
+    form = UserChangeAdminForm
+    add_form = UserCreationAdminForm
+    list_display = (
+        "email",
+        "first_name",
+        "last_name",
+        "account_type",
+        "is_active",
+        "is_deleted",
+    )
+    list_filter = ("account_type", "is_staff", "is_active", "is_deleted")
+    search_fields = ("email__startswith",)
+    ordering = LargeTableAdmin.cursor_ordering
+    readonly_fields = ("last_login", "created_at", "updated_at", "deleted_at")
+    filter_horizontal = ("groups", "user_permissions")
+    fieldsets = (
+        (None, {"fields": ("email", "password")}),
+        (
+            "Личные данные",
+            {"fields": ("first_name", "last_name", "phone_number", "avatar", "account_type")},
+        ),
+        (
+            "Права доступа",
+            {"fields": ("is_active", "is_staff", "is_superuser", "groups", "user_permissions")},
+        ),
+        ("Удаление", {"fields": ("is_deleted", "deleted_at")}),
+        ("Даты", {"fields": ("last_login", "created_at", "updated_at")}),
+    )
+    add_fieldsets = (
+        (
+            None,
+            {
+                "classes": ("wide",),
+                "fields": (
+                    "email",
+                    "first_name",
+                    "last_name",
+                    "usable_password",
+                    "password1",
+                    "password2",
+                ),
+            },
+        ),
+    )
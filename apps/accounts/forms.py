@@ -0,0 +1,25 @@
+from django.contrib.auth.forms import AdminUserCreationForm, UserChangeForm
+
+from apps.accounts.models import User
+
+
+class UserCreationAdminForm(AdminUserCreationForm):
+    """Форма создания пользователя в админке: email вместо имени пользователя,
+    пароль задаётся дважды и сохраняется в виде хеша."""
+
+    class Meta(AdminUserCreationForm.Meta):
+        """Метаданные формы."""
+
+        model = User
+        fields = ("email", "first_name", "last_name")
+
+
+class UserChangeAdminForm(UserChangeForm):
+    """Форма изменения пользователя в админке. Пароль показывается только в виде
+    хеша со ссылкой на форму смены пароля."""
+
+    class Meta(UserChangeForm.Meta):
+        """Метаданные формы."""
+
+        model = User
+        fields = "__all__"
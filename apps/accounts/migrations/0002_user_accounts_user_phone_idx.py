@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 04:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('phone_number', ''), _negated=True), fields=['phone_number'], name='accounts_user_phone_idx'),
+        ),
+    ]
@@ -1,8 +1,8 @@
-from phonenumber_field.modelfields import PhoneNumberField
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 
 from apps.accounts.managers import CustomUserManager
+from apps.common.fields import PhoneNumberField
 from apps.common.models import IsDeletedModel
 from apps.common.services.validators import IMAGE_VALIDATORS
 
@@ -52,3 +52,11 @@ class User(AbstractUser, IsDeletedModel):
 
         verbose_name = "Пользователь"
         verbose_name_plural = "Пользователи"
+        indexes = [
+            models.Index(fields=["-created_at"], name="accounts_user_created_idx"),
+            models.Index(
+                fields=["phone_number"],
+                condition=~models.Q(phone_number=""),
+                name="accounts_user_phone_idx",
+            ),
+        ]
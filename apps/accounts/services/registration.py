@@ -0,0 +1,16 @@
+from apps.accounts.models import User
+from apps.common.services.mail import enqueue_email
+
+
+WELCOME_SUBJECT = "Добро пожаловать!"
+WELCOME_MESSAGE = (
+    "Здравствуйте! Вы зарегистрировались с адресом {email}. "
+    "Теперь вы можете покупать и продавать товары."
+)
+
+
+def queue_welcome_email(user: User):
+    """Ставит приветственное письмо в очередь отправки; само письмо отправит
+    процесс `send_emails`, поэтому регистрация не ждёт почтового сервера."""
+
+    enqueue_email(user.email, WELCOME_SUBJECT, WELCOME_MESSAGE.format(email=user.email))
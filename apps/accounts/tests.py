@@ -1,3 +1,107 @@
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.accounts.models import User
+from apps.common.models import OutgoingEmail
+from apps.common.services.idempotency import REPLAYED_HEADER
+
+
+class RegistrationTests(TestCase):
+    """Регистрация пользователя и приветственное письмо."""
+
+    data = {
+        "email": "new@example.com",
+        "password": "Xx-123456789",
+        "confirm_password": "Xx-123456789",
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_registration_enqueues_one_welcome_email(self):
+        """Регистрация ставит в очередь ровно одно письмо, не отправляя его."""
+
+        response = self.client.post(reverse("registration"), self.data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.to, "new@example.com")
+        self.assertEqual(email.status, "pending")
+
+    def test_invalid_registration_enqueues_nothing(self):
+        """Отклонённая регистрация не ставит письмо в очередь."""
+
+        data = {**self.data, "confirm_password": "other"}
+        response = self.client.post(reverse("registration"), data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(OutgoingEmail.objects.exists())
+
+    def test_repeated_registration_with_idempotency_key_is_replayed(self):
+        """Повтор с тем же Idempotency-Key получает тот же ответ без второго письма."""
+
+        first = self.client.post(
+            reverse("registration"), self.data, format="json", HTTP_IDEMPOTENCY_KEY="signup-1"
+        )
+        replay = self.client.post(
+            reverse("registration"), self.data, format="json", HTTP_IDEMPOTENCY_KEY="signup-1"
+        )
+
+        self.assertEqual(replay.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(replay.json(), first.json())
+        self.assertEqual(replay[REPLAYED_HEADER], "true")
+        self.assertEqual(User.objects.count(), 1)
+        self.assertEqual(OutgoingEmail.objects.count(), 1)
+
+
+class UserAdminTests(TestCase):
+    """Создание пользователя и смена пароля в админке."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(
+            email="admin@example.com", is_staff=True, is_superuser=True
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_changelist_uses_cursor_pagination(self):
+        """Список пользователей открывается с навигацией по курсору."""
+
+        response = self.client.get(reverse("admin:accounts_user_changelist"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["cl"].result_list, [self.admin])
+
+    def test_add_user_hashes_password(self):
+        """Пользователь из админки создаётся с захешированным паролем."""
+
+        response = self.client.post(
+            reverse("admin:accounts_user_add"),
+            {
+                "email": "staff@example.com",
+                "first_name": "Иван",
+                "last_name": "Петров",
+                "usable_password": "true",
+                "password1": "Xx-123456789",
+                "password2": "Xx-123456789",
+            },
+        )
+
+        self.assertEqual(response.status_code, 302)
+        user = User.objects.get(email="staff@example.com")
+        self.assertTrue(user.check_password("Xx-123456789"))
+
+    def test_change_page_links_to_password_form(self):
+        """Страница пользователя ссылается на форму смены пароля, и форма открывается."""
+
+        user = User.objects.create(email="user@example.com")
+        password_url = reverse("admin:auth_user_password_change", args=[user.pk])
+
+        response = self.client.get(reverse("admin:accounts_user_change", args=[user.pk]))
+
+        self.assertContains(response, "../password/")
+        self.assertEqual(self.client.get(password_url).status_code, 200)
@@ -1,7 +1,12 @@
+from django.db import transaction
 from rest_framework import generics
+from rest_framework.request import Request
+from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from apps.accounts.serializers import CreateUserSerializer, MyTokenObtainPairSerializer
+from apps.accounts.services.registration import queue_welcome_email
+from apps.common.services.idempotency import idempotent
 
 
 class RegisterAPIView(generics.CreateAPIView):
@@ -12,6 +17,21 @@ class RegisterAPIView(generics.CreateAPIView):
 
     serializer_class = CreateUserSerializer
 
+    @idempotent
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        """Регистрирует пользователя; повтор запроса с тем же `Idempotency-Key`
+        получает сохранённый ответ без повторной регистрации."""
+
+        return super().post(request, *args, **kwargs)
+
+    def perform_create(self, serializer: CreateUserSerializer):
+        """Создаёт пользователя и в той же транзакции ставит в очередь приветственное
+        письмо: письмо отправляется отдельным процессом, а не во время запроса."""
+
+        with transaction.atomic():
+            user = serializer.save()
+            queue_welcome_email(user)
+
 
 class MyTokenObtainPairView(TokenObtainPairView):
     """Представление для получения пары JWT-токенов (access и refresh) при аутентификации пользователя.
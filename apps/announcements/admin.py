@@ -1,3 +1,50 @@
 from django.contrib import admin
+from django.db.models import QuerySet
+from django.http import HttpRequest
 
-# Register your models here.
+from apps.announcements.models import Announcement, Category
+from apps.common.admin import LargeTableAdmin
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    """Админка категорий. Поиск по началу названия используется автодополнением
+    в админке объявлений."""
+
+    list_display = ("name", "slug", "created_at")
+    search_fields = ("name__startswith",)
+    ordering = ("name",)
+
+
+@admin.register(Announcement)
+class AnnouncementAdmin(LargeTableAdmin):
+    """Админка объявлений.
+    Категория и продавец выбираются автодополнением и загружаются вместе со
+    списком. Показываются и помеченные удалёнными объявления. Поиск выполняется
+    по началу slug или по идентификатору."""
+
+    list_display = (
+        "title",
+        "category",
+        "seller",
+        "price",
+        "condition",
+        "is_deleted",
+        "created_at",
+    )
+    list_filter = ("condition", "is_deleted")
+    list_select_related = ("category", "seller")
+    search_fields = ("slug__startswith",)
+    autocomplete_fields = ("category", "seller")
+    readonly_fields = (
+        "views_count",
+        "popularity",
+        "deleted_at",
+        "created_at",
+        "updated_at",
+    )
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet[Announcement]:
+        """Возвращает все объявления, включая помеченные удалёнными."""
+
+        return Announcement.objects.unfiltered().select_related(*self.list_select_related)
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AnnouncementsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.announcements"
+
+    def ready(self):
+        """Подключает обработчики сигналов приложения."""
+
+        from apps.announcements import signals  # noqa: F401
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from apps.announcements.services.similar import REBUILD_CHUNK_SIZE, rebuild
+
+
+class Command(BaseCommand):
+    """Перестраивает индекс похожих объявлений для всех объявлений.
+    Нужна при первом запуске и после изменения параметров MinHash; дальше индекс
+    обновляет команда `reindex_similar` после изменений объявлений. Сигнатуры и
+    списки похожих рассчитываются в пуле процессов, по части объявлений на задачу;
+    во время перестроения похожие объявления продолжают отдаваться."""
+
+    help = "Перестроение индекса похожих объявлений."
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы командной строки."""
+
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Число процессов (по умолчанию по числу ядер).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=REBUILD_CHUNK_SIZE,
+            help="Сколько объявлений обрабатывает одна задача.",
+        )
+
+    def handle(self, *args, **options):
+        """Перестраивает индекс и печатает ход выполнения."""
+
+        stages = {"index": "Сигнатуры", "similar": "Похожие"}
+        for stage, done in rebuild(options["workers"], options["chunk_size"]):
+            self.stdout.write(f"{stages[stage]}: {done}")
+        self.stdout.write(self.style.SUCCESS("Индекс похожих объявлений перестроен."))
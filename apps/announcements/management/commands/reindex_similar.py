@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from apps.announcements.services.similar import SimilarityReindexWorker
+
+
+class Command(BaseCommand):
+    """Пересчитывает похожие объявления для объявлений из очереди пересчёта.
+    Объявления попадают в очередь при изменении заголовка, описания, цены,
+    категории или пометки удаления."""
+
+    help = "Пересчитывает похожие объявления для изменённых объявлений."
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы командной строки."""
+
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Размер пачки (по умолчанию SIMILAR_REINDEX_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1,
+            help="Пауза между проверками, если очередь пуста.",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Пересчитать очередь и завершиться."
+        )
+
+    def handle(self, *args, **options):
+        """Пересчитывает объявления один раз или непрерывно."""
+
+        worker = SimilarityReindexWorker(batch_size=options["batch_size"])
+        if not options["once"]:
+            worker.run(interval=options["interval"])
+            return
+
+        total = 0
+        while processed := worker.run_once():
+            total += processed
+        self.stdout.write(self.style.SUCCESS(f"Пересчитано объявлений: {total}"))
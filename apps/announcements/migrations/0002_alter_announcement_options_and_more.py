@@ -0,0 +1,26 @@
+# Generated by Django 6.0 on 2026-10-19 04:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0001_initial'),
+        ('sellers', '0002_seller_sellers_seller_phone_idx'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='announcement',
+            options={'ordering': ['-created_at'], 'verbose_name': 'Объявление', 'verbose_name_plural': 'Объявления'},
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['-created_at'], name='announcement_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['category', '-created_at'], name='announcement_category_feed_idx'),
+        ),
+    ]
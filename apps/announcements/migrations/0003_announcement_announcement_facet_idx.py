@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 04:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0002_alter_announcement_options_and_more'),
+        ('sellers', '0002_seller_sellers_seller_phone_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['category', 'condition', 'price'], name='announcement_facet_idx'),
+        ),
+    ]
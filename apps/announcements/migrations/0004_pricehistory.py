@@ -0,0 +1,49 @@
+# Generated by Django 6.0 on 2026-10-19 04:43
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def record_initial_prices(apps, schema_editor):
+    """Записывает текущую цену существующих объявлений как начало истории цен."""
+
+    Announcement = apps.get_model("announcements", "Announcement")
+    PriceHistory = apps.get_model("announcements", "PriceHistory")
+    db_alias = schema_editor.connection.alias
+    rows = Announcement.objects.using(db_alias).values_list("id", "price", "created_at")
+    batch = []
+    for pk, price, created_at in rows.iterator(chunk_size=2000):
+        batch.append(PriceHistory(announcement_id=pk, price=price, changed_at=created_at))
+        if len(batch) >= 2000:
+            PriceHistory.objects.using(db_alias).bulk_create(batch)
+            batch = []
+    PriceHistory.objects.using(db_alias).bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0003_announcement_announcement_facet_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceHistory',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Цена')),
+                ('previous_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name='Предыдущая цена')),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата изменения')),
+                ('announcement', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='price_history', to='announcements.announcement', verbose_name='Объявление')),
+            ],
+            options={
+                'verbose_name': 'Изменение цены',
+                'verbose_name_plural': 'История цен',
+                'ordering': ['changed_at'],
+                'indexes': [django.contrib.postgres.indexes.BrinIndex(fields=['changed_at'], name='price_history_changed_brin'), models.Index(fields=['announcement', 'changed_at'], name='price_history_series_idx')],
+            },
+        ),
+        migrations.RunPython(record_initial_prices, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-19 04:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0004_pricehistory'),
+        ('sellers', '0002_seller_sellers_seller_phone_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='announcement',
+            name='popularity',
+            field=models.FloatField(default=0, editable=False, verbose_name='Популярность'),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='views_count',
+            field=models.PositiveBigIntegerField(default=0, editable=False, verbose_name='Просмотры'),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['category', '-popularity'], name='announcement_popular_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 04:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0005_announcement_popularity'),
+        ('sellers', '0005_seller_sellers_seller_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['updated_at', 'id'], name='announcement_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 6.0 on 2026-10-19 04:56
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0006_announcement_announcement_updated_idx'),
+        ('sellers', '0006_seller_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='announcement',
+            name='geohash',
+            field=models.BigIntegerField(editable=False, null=True, verbose_name='Геохеш'),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)], verbose_name='Широта'),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)], verbose_name='Долгота'),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(condition=models.Q(('geohash__isnull', False), ('is_deleted', False)), fields=['geohash'], name='announcement_geohash_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(condition=models.Q(('geohash__isnull', False), ('is_deleted', False)), fields=['category', 'geohash'], name='announcement_category_geo_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 6.0 on 2026-10-19 04:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0007_announcement_location'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnnouncementSignature',
+            fields=[
+                ('announcement', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='announcements.announcement', verbose_name='Объявление')),
+                ('signature', models.BinaryField(verbose_name='Сигнатура')),
+            ],
+            options={
+                'verbose_name': 'Сигнатура объявления',
+                'verbose_name_plural': 'Сигнатуры объявлений',
+            },
+        ),
+        migrations.CreateModel(
+            name='SimilarAnnouncement',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('score', models.FloatField(verbose_name='Сходство')),
+                ('announcement', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='similar_announcements', to='announcements.announcement', verbose_name='Объявление')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_to', to='announcements.announcement', verbose_name='Похожее объявление')),
+            ],
+            options={
+                'verbose_name': 'Похожее объявление',
+                'verbose_name_plural': 'Похожие объявления',
+                'indexes': [models.Index(fields=['announcement', '-score'], name='similar_announcement_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SimilarityBucket',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('bucket', models.BigIntegerField(verbose_name='Корзина')),
+                ('announcement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='announcements.announcement', verbose_name='Объявление')),
+            ],
+            options={
+                'verbose_name': 'Корзина похожих объявлений',
+                'verbose_name_plural': 'Корзины похожих объявлений',
+                'indexes': [models.Index(fields=['bucket', 'announcement'], name='similarity_bucket_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0 on 2026-10-19 05:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0008_similar_announcements'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacetSummaryVersion',
+            fields=[
+                ('id', models.PositiveSmallIntegerField(default=1, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField(default=0, verbose_name='Версия')),
+            ],
+            options={
+                'verbose_name': 'Версия сводки фасетов',
+                'verbose_name_plural': 'Версии сводки фасетов',
+            },
+        ),
+    ]
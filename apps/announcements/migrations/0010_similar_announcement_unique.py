@@ -0,0 +1,36 @@
+# Generated by Django 6.0 on 2026-10-19 05:17
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def remove_duplicates(apps, schema_editor):
+    """Оставляет для каждой пары (объявление, похожее) одну строку с наибольшим id."""
+
+    SimilarAnnouncement = apps.get_model("announcements", "SimilarAnnouncement")
+    db_alias = schema_editor.connection.alias
+    duplicates = (
+        SimilarAnnouncement.objects.using(db_alias)
+        .values("announcement_id", "similar_id")
+        .annotate(count=Count("id"), keep=Max("id"))
+        .filter(count__gt=1)
+    )
+    for row in duplicates:
+        SimilarAnnouncement.objects.using(db_alias).filter(
+            announcement_id=row["announcement_id"], similar_id=row["similar_id"]
+        ).exclude(id=row["keep"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0009_facet_summary_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='similarannouncement',
+            constraint=models.UniqueConstraint(fields=('announcement', 'similar'), name='similar_announcement_unique'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 6.0 on 2026-10-19 05:41
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0010_similar_announcement_unique'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='FacetSummaryVersion',
+        ),
+    ]
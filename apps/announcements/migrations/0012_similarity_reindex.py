@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-19 05:43
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0011_delete_facet_summary_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarityReindex',
+            fields=[
+                ('announcement', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='announcements.announcement', verbose_name='Объявление')),
+                ('queued_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата постановки')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='Занято до')),
+            ],
+            options={
+                'verbose_name': 'Пересчёт похожих объявлений',
+                'verbose_name_plural': 'Очередь пересчёта похожих объявлений',
+                'indexes': [models.Index(fields=['queued_at'], name='similarity_reindex_queue_idx')],
+            },
+        ),
+    ]
@@ -1,7 +1,11 @@
 from autoslug import AutoSlugField
-from django.db import models
+from django.contrib.postgres.indexes import BrinIndex
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, router, transaction
+from django.utils import timezone
 
 from apps.common.models import BaseModel, IsDeletedModel
+from apps.common.services.geo import encode_geohash
 from apps.common.services.validators import IMAGE_VALIDATORS
 from apps.sellers.models import Seller
 
@@ -11,6 +15,14 @@ CONDITION_TYPE_CHOICES = (
     ("USED", "Подержанный"),
 )
 
+# Поля, которые обновляются только пакетной записью просмотров и не должны
+# перезаписываться значениями из памяти при сохранении объявления.
+COUNTER_FIELDS = ("views_count", "popularity")
+
+# Поля, от которых зависят похожие объявления: при их изменении (в том числе при
+# восстановлении удалённого объявления) объявление пересчитывается в индексе похожих.
+SIMILARITY_FIELDS = ("title", "description", "price", "category_id", "is_deleted")
+
 
 class Category(BaseModel):
     """Модель категории для классификации объявлений на маркетплейсе.
@@ -77,14 +89,346 @@ class Announcement(IsDeletedModel):
         validators=IMAGE_VALIDATORS,
         verbose_name="Изображение",
     )
+    views_count = models.PositiveBigIntegerField(
+        default=0, editable=False, verbose_name="Просмотры"
+    )
+    popularity = models.FloatField(default=0, editable=False, verbose_name="Популярность")
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+        verbose_name="Широта",
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+        verbose_name="Долгота",
+    )
+    geohash = models.BigIntegerField(null=True, editable=False, verbose_name="Геохеш")
 
     def __str__(self) -> str:
         """Возвращает строковое представление объекта объявления."""
 
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает цену и поля похожести, загруженные из БД, чтобы при сохранении
+        определить их изменение без дополнительного запроса."""
+
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_price = instance.__dict__.get("price", models.DEFERRED)
+        instance._loaded_similarity = instance._similarity_values()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        """Перечитывает поля из БД и обновляет запомненные значения."""
+
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if "price" in self.__dict__ and (fields is None or "price" in fields):
+            self._loaded_price = self.price
+        refreshed = None if fields is None else {self._meta.get_field(f).attname for f in fields}
+        self._loaded_similarity = {
+            **getattr(self, "_loaded_similarity", {}),
+            **{
+                name: value
+                for name, value in self._similarity_values().items()
+                if refreshed is None or name in refreshed
+            },
+        }
+
+    def _similarity_values(self) -> dict:
+        """Возвращает текущие значения полей SIMILARITY_FIELDS (DEFERRED — не загружено).
+        Цена приводится к Decimal: в памяти она может быть задана строкой."""
+
+        values = {name: self.__dict__.get(name, models.DEFERRED) for name in SIMILARITY_FIELDS}
+        if values["price"] is not models.DEFERRED:
+            values["price"] = self._meta.get_field("price").to_python(values["price"])
+        return values
+
+    def similarity_changed(self) -> bool:
+        """Проверяет, изменились ли с момента загрузки поля, от которых зависят похожие
+        объявления. Если значение не было загружено, но задано, изменение возможно."""
+
+        loaded = getattr(self, "_loaded_similarity", {})
+        for name, value in self._similarity_values().items():
+            previous = loaded.get(name, models.DEFERRED)
+            if value is models.DEFERRED and previous is models.DEFERRED:
+                continue
+            if value is models.DEFERRED or previous is models.DEFERRED:
+                return True
+            if value != previous:
+                return True
+        return False
+
+    def _get_previous_price(self, using: str):
+        """Возвращает цену, сохранённую в БД, или None для нового объявления.
+        Запрос к БД выполняется только если цена не была загружена вместе с объектом."""
+
+        if self._state.adding:
+            return None
+        previous_price = getattr(self, "_loaded_price", models.DEFERRED)
+        if previous_price is models.DEFERRED:
+            previous_price = (
+                Announcement._base_manager.using(using)
+                .filter(pk=self.pk)
+                .values_list("price", flat=True)
+                .first()
+            )
+        return previous_price
+
+    def _update_location(self, using: str):
+        """Заполняет координаты нового объявления координатами продавца, если они
+        не заданы явно, и пересчитывает геохеш."""
+
+        if self._state.adding and self.latitude is None and self.longitude is None:
+            if self.seller_id is not None:
+                location = (
+                    Seller.objects.using(using)
+                    .filter(pk=self.seller_id)
+                    .values_list("latitude", "longitude")
+                    .first()
+                )
+                if location is not None:
+                    self.latitude, self.longitude = location
+
+        self.geohash = None
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = encode_geohash(self.latitude, self.longitude)
+
+    def save(self, *args, **kwargs):
+        """Сохраняет объявление (см. `_save`) и запоминает сохранённые значения полей
+        похожести: обработчик post_save сравнивает их с загруженными до сохранения."""
+
+        self._save(*args, **kwargs)
+        self._loaded_similarity = self._similarity_values()
+
+    def _save(self, *args, **kwargs):
+        """Сохраняет объявление и записывает историю цены, если цена изменилась.
+        Пока цена не меняется, сохранение выполняется как обычно, без транзакции и
+        дополнительных запросов; при изменении цены в той же транзакции добавляется
+        одна строка в `PriceHistory`. Массовые `update()` историю не записывают.
+        Счётчики просмотров при сохранении существующего объявления не записываются,
+        чтобы не затереть просмотры, записанные в БД после загрузки объекта.
+        Новое объявление без координат получает координаты продавца."""
+
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in COUNTER_FIELDS
+                and field.attname not in deferred
+            ]
+
+        using = kwargs.get("using") or router.db_for_write(Announcement, instance=self)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"latitude", "longitude"} & set(update_fields):
+            self._update_location(using)
+            if update_fields is not None and "geohash" not in update_fields:
+                kwargs["update_fields"] = update_fields = [*update_fields, "geohash"]
+
+        if update_fields is not None and "price" not in update_fields:
+            return super().save(*args, **kwargs)
+
+        previous_price = self._get_previous_price(using)
+        price = self._meta.get_field("price").to_python(self.price)
+        if previous_price is not None and previous_price == price:
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+            PriceHistory.objects.using(using).create(
+                announcement=self, price=price, previous_price=previous_price
+            )
+        self._loaded_price = price
+
     class Meta:
         """Метакласс для настройки модели."""
 
         verbose_name = "Объявление"
         verbose_name_plural = "Объявления"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at"], name="announcement_created_idx"),
+            models.Index(fields=["updated_at", "id"], name="announcement_updated_idx"),
+            models.Index(
+                fields=["category", "-created_at"],
+                condition=models.Q(is_deleted=False),
+                name="announcement_category_feed_idx",
+            ),
+            models.Index(
+                fields=["category", "condition", "price"],
+                condition=models.Q(is_deleted=False),
+                name="announcement_facet_idx",
+            ),
+            models.Index(
+                fields=["category", "-popularity"],
+                condition=models.Q(is_deleted=False),
+                name="announcement_popular_idx",
+            ),
+            # Поиск рядом: диапазоны геохешей по всем объявлениям и внутри категории.
+            models.Index(
+                fields=["geohash"],
+                condition=models.Q(is_deleted=False, geohash__isnull=False),
+                name="announcement_geohash_idx",
+            ),
+            models.Index(
+                fields=["category", "geohash"],
+                condition=models.Q(is_deleted=False, geohash__isnull=False),
+                name="announcement_category_geo_idx",
+            ),
+        ]
+
+
+class PriceHistory(models.Model):
+    """Журнал изменений цены объявления.
+    Таблица только пополняется: строка добавляется при создании объявления и при
+    каждом изменении цены. Для компактности у строк целочисленный ключ вместо UUID,
+    а время изменения индексируется BRIN-индексом, который занимает несколько страниц
+    и подходит для таблицы, куда строки пишутся в порядке времени."""
+
+    id = models.BigAutoField(primary_key=True)
+    announcement = models.ForeignKey(
+        Announcement,
+        on_delete=models.CASCADE,
+        related_name="price_history",
+        db_index=False,
+        verbose_name="Объявление",
+    )
+    price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Цена")
+    previous_price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name="Предыдущая цена",
+    )
+    changed_at = models.DateTimeField(default=timezone.now, verbose_name="Дата изменения")
+
+    def __str__(self) -> str:
+        """Возвращает строковое представление изменения цены."""
+
+        return f"{self.previous_price} → {self.price}"
+
+    class Meta:
+        """Метакласс для настройки модели."""
+
+        verbose_name = "Изменение цены"
+        verbose_name_plural = "История цен"
+        ordering = ["changed_at"]
+        indexes = [
+            BrinIndex(fields=["changed_at"], name="price_history_changed_brin"),
+            models.Index(
+                fields=["announcement", "changed_at"], name="price_history_series_idx"
+            ),
+        ]
+
+
+class AnnouncementSignature(models.Model):
+    """MinHash-сигнатура текста объявления для поиска похожих объявлений.
+    Доля совпадающих позиций двух сигнатур оценивает сходство Жаккара множеств
+    слов объявлений."""
+
+    announcement = models.OneToOneField(
+        Announcement,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="signature",
+        verbose_name="Объявление",
+    )
+    signature = models.BinaryField(verbose_name="Сигнатура")
+
+    class Meta:
+        """Метакласс для настройки модели."""
+
+        verbose_name = "Сигнатура объявления"
+        verbose_name_plural = "Сигнатуры объявлений"
+
+
+class SimilarityBucket(models.Model):
+    """Корзина LSH-индекса: объявления одной категории с совпадающей полосой сигнатуры.
+    Объявления, попавшие хотя бы в одну общую корзину, — кандидаты в похожие."""
+
+    id = models.BigAutoField(primary_key=True)
+    announcement = models.ForeignKey(
+        Announcement,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name="Объявление",
+    )
+    bucket = models.BigIntegerField(verbose_name="Корзина")
+
+    class Meta:
+        """Метакласс для настройки модели."""
+
+        verbose_name = "Корзина похожих объявлений"
+        verbose_name_plural = "Корзины похожих объявлений"
+        indexes = [
+            models.Index(fields=["bucket", "announcement"], name="similarity_bucket_idx"),
+        ]
+
+
+class SimilarAnnouncement(models.Model):
+    """Заранее рассчитанное похожее объявление и оценка сходства с исходным.
+    Для каждого объявления хранится не больше SIMILAR_ANNOUNCEMENTS_COUNT строк,
+    каждое похожее объявление — не больше одного раза."""
+
+    id = models.BigAutoField(primary_key=True)
+    announcement = models.ForeignKey(
+        Announcement,
+        on_delete=models.CASCADE,
+        related_name="similar_announcements",
+        db_index=False,
+        verbose_name="Объявление",
+    )
+    similar = models.ForeignKey(
+        Announcement,
+        on_delete=models.CASCADE,
+        related_name="similar_to",
+        verbose_name="Похожее объявление",
+    )
+    score = models.FloatField(verbose_name="Сходство")
+
+    class Meta:
+        """Метакласс для настройки модели."""
+
+        verbose_name = "Похожее объявление"
+        verbose_name_plural = "Похожие объявления"
+        indexes = [
+            models.Index(fields=["announcement", "-score"], name="similar_announcement_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["announcement", "similar"], name="similar_announcement_unique"
+            ),
+        ]
+
+
+class SimilarityReindex(models.Model):
+    """Объявление, ожидающее пересчёта в индексе похожих.
+    Строка добавляется в той же транзакции, что и изменение объявления, а индекс
+    пересчитывает отдельный процесс (`reindex_similar`), поэтому запрос на изменение
+    не ждёт пересчёта. Повторное изменение до пересчёта обновляет `queued_at`:
+    строка удаляется, только если после её выборки объявление не менялось."""
+
+    announcement = models.OneToOneField(
+        Announcement,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="+",
+        verbose_name="Объявление",
+    )
+    queued_at = models.DateTimeField(default=timezone.now, verbose_name="Дата постановки")
+    locked_until = models.DateTimeField(null=True, blank=True, verbose_name="Занято до")
+
+    class Meta:
+        """Метакласс для настройки модели."""
+
+        verbose_name = "Пересчёт похожих объявлений"
+        verbose_name_plural = "Очередь пересчёта похожих объявлений"
+        indexes = [
+            models.Index(fields=["queued_at"], name="similarity_reindex_queue_idx"),
+        ]
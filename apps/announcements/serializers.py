@@ -0,0 +1,151 @@
+from rest_framework import serializers
+
+from apps.announcements.models import (
+    CONDITION_TYPE_CHOICES,
+    Announcement,
+    Category,
+    PriceHistory,
+)
+from apps.common.services.read_serializers import ReadSerializer
+
+
+class CategorySerializer(serializers.ModelSerializer):
+    """Сериализатор категории объявлений."""
+
+    class Meta:
+        """Метаданные сериализатора."""
+
+        model = Category
+        fields = ("id", "name", "slug", "image")
+
+
+class AnnouncementSerializer(serializers.ModelSerializer):
+    """Сериализатор объявления для выдачи в каталоге.
+    Категория и продавец представлены идентификаторами, поэтому для
+    сериализации не требуются дополнительные запросы к связанным таблицам."""
+
+    class Meta:
+        """Метаданные сериализатора."""
+
+        model = Announcement
+        fields = (
+            "id",
+            "title",
+            "slug",
+            "description",
+            "price",
+            "condition",
+            "image",
+            "category",
+            "seller",
+            "latitude",
+            "longitude",
+            "views_count",
+            "created_at",
+            "updated_at",
+        )
+        read_only_fields = fields
+
+
+class NearbyAnnouncementSerializer(AnnouncementSerializer):
+    """Сериализатор объявления в поиске рядом.
+    Дополнительно содержит расстояние до точки поиска в километрах."""
+
+    distance = serializers.FloatField(read_only=True)
+
+    class Meta(AnnouncementSerializer.Meta):
+        """Метаданные сериализатора."""
+
+        fields = AnnouncementSerializer.Meta.fields + ("distance",)
+        read_only_fields = fields
+
+
+class PriceDropSerializer(AnnouncementSerializer):
+    """Сериализатор объявления со сниженной ценой.
+    Дополнительно содержит цену на начало рассматриваемого периода."""
+
+    old_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+
+    class Meta(AnnouncementSerializer.Meta):
+        """Метаданные сериализатора."""
+
+        fields = AnnouncementSerializer.Meta.fields + ("old_price",)
+        read_only_fields = fields
+
+
+class PriceHistorySerializer(serializers.ModelSerializer):
+    """Сериализатор точки истории цены объявления."""
+
+    class Meta:
+        """Метаданные сериализатора."""
+
+        model = PriceHistory
+        fields = ("price", "previous_price", "changed_at")
+        read_only_fields = fields
+
+
+class SellerAnnouncementSerializer(serializers.ModelSerializer):
+    """Сериализатор объявления в кабинете продавца.
+    Продавец определяется по запросу и не передаётся клиентом."""
+
+    class Meta:
+        """Метаданные сериализатора."""
+
+        model = Announcement
+        fields = (
+            "id",
+            "title",
+            "slug",
+            "description",
+            "price",
+            "condition",
+            "image",
+            "category",
+            "latitude",
+            "longitude",
+            "views_count",
+            "created_at",
+            "updated_at",
+        )
+        read_only_fields = ("id", "slug", "views_count", "created_at", "updated_at")
+
+    def validate(self, attrs: dict) -> dict:
+        """Проверяет, что широта и долгота передаются вместе."""
+
+        if ("latitude" in attrs) != ("longitude" in attrs) or (
+            (attrs.get("latitude") is None) != (attrs.get("longitude") is None)
+        ):
+            raise serializers.ValidationError("Широта и долгота задаются вместе.")
+        return attrs
+
+
+class AnnouncementBulkItemSerializer(serializers.Serializer):
+    """Элемент массового изменения объявлений: идентификатор и изменяемые поля.
+    Существование категории проверяется сервисом одним запросом на весь запрос."""
+
+    id = serializers.UUIDField()
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, required=False)
+    condition = serializers.ChoiceField(choices=CONDITION_TYPE_CHOICES, required=False)
+    category = serializers.UUIDField(required=False)
+
+    def validate(self, attrs: dict) -> dict:
+        """Проверяет, что передано хотя бы одно изменяемое поле."""
+
+        if len(attrs) == 1:
+            raise serializers.ValidationError("Не передано ни одного изменяемого поля.")
+        return attrs
+
+
+class AnnouncementIdsSerializer(serializers.Serializer):
+    """Список идентификаторов объявлений для массовой операции."""
+
+    ids = serializers.ListField(
+        child=serializers.UUIDField(), allow_empty=False, max_length=5000
+    )
+
+
+# Быстрая сериализация списков в каталоге: тот же ответ, что у сериализаторов выше.
+category_reader = ReadSerializer(CategorySerializer)
+announcement_reader = ReadSerializer(AnnouncementSerializer)
+nearby_announcement_reader = ReadSerializer(NearbyAnnouncementSerializer)
+price_drop_reader = ReadSerializer(PriceDropSerializer)
@@ -0,0 +1,171 @@
+import uuid
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.announcements.models import Announcement, Category, PriceHistory
+from apps.announcements.serializers import AnnouncementBulkItemSerializer
+from apps.announcements.services.facets import mark_summary_dirty
+from apps.announcements.services.feed import hot_feed
+from apps.announcements.services.similar import queue_reindex
+from apps.common.services import outbox
+
+
+# Сколько объявлений изменяется в одной транзакции. Блокировки строк держатся
+# до конца транзакции, поэтому большой запрос разбивается на части.
+BULK_CHUNK_SIZE = 500
+
+BULK_FIELDS = ("price", "condition", "category_id")
+
+
+def _chunks(items: list, size: int = BULK_CHUNK_SIZE):
+    """Разбивает список на части по `size` элементов."""
+
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def bulk_update_announcements(seller_id: uuid.UUID, items: list[dict]) -> list[dict]:
+    """Изменяет цену, состояние и категорию нескольких объявлений продавца.
+    Каждый элемент валидируется отдельно, а результат возвращается по каждому
+    элементу: `updated`, `unchanged`, `not_found` (объявление не найдено или
+    принадлежит другому продавцу) или `invalid` с ошибками. Категории проверяются
+    одним запросом на весь запрос, а объявления изменяются частями по
+    BULK_CHUNK_SIZE: в каждой части объявления продавца блокируются и читаются
+    одним запросом и сохраняются одним `bulk_update` только по изменённым полям.
+    Для изменённых цен в той же транзакции записывается история цен, а объявления с
+    изменёнными ценой или категорией ставятся в очередь пересчёта похожих."""
+
+    item_serializers = [AnnouncementBulkItemSerializer(data=item) for item in items]
+    results: list[dict] = []
+    valid = []
+    for item, serializer in zip(items, item_serializers):
+        if serializer.is_valid():
+            results.append({"id": serializer.validated_data["id"], "status": None})
+            valid.append((results[-1], serializer.validated_data))
+        else:
+            item_id = serializer.initial_data.get("id") if isinstance(item, dict) else None
+            results.append({"id": item_id, "status": "invalid", "errors": serializer.errors})
+
+    category_ids = {data["category"] for _result, data in valid if "category" in data}
+    existing_categories = set(
+        Category.objects.filter(pk__in=category_ids).values_list("pk", flat=True)
+    )
+
+    for chunk in _chunks(valid):
+        _update_chunk(seller_id, chunk, existing_categories)
+    return results
+
+
+@transaction.atomic
+def _update_chunk(seller_id: uuid.UUID, chunk: list[tuple[dict, dict]], categories: set):
+    """Применяет изменения одной части объявлений в одной транзакции."""
+
+    announcements = (
+        Announcement.objects.select_for_update()
+        .filter(seller_id=seller_id)
+        .only("id", "seller_id", "is_deleted", "updated_at", *BULK_FIELDS)
+        .in_bulk([data["id"] for _result, data in chunk])
+    )
+
+    now = timezone.now()
+    changed, fields, history, moved, reindexed = [], {"updated_at"}, [], [], []
+    for result, data in chunk:
+        announcement = announcements.get(data["id"])
+        if announcement is None:
+            result["status"] = "not_found"
+            continue
+        if "category" in data and data["category"] not in categories:
+            result["status"] = "invalid"
+            result["errors"] = {"category": ["Категория не найдена."]}
+            continue
+
+        changes = {
+            "price": data.get("price", announcement.price),
+            "condition": data.get("condition", announcement.condition),
+            "category_id": data.get("category", announcement.category_id),
+        }
+        changes = {
+            name: value for name, value in changes.items() if getattr(announcement, name) != value
+        }
+        if not changes:
+            result["status"] = "unchanged"
+            continue
+
+        if "price" in changes:
+            history.append(
+                PriceHistory(
+                    announcement_id=announcement.pk,
+                    price=changes["price"],
+                    previous_price=announcement.price,
+                    changed_at=now,
+                )
+            )
+        if "category_id" in changes:
+            moved.append(announcement.pk)
+        if {"price", "category_id"} & changes.keys():
+            reindexed.append(announcement.pk)
+        for name, value in changes.items():
+            setattr(announcement, name, value)
+            fields.add(name)
+        announcement.updated_at = now
+        changed.append(announcement)
+        result["status"] = "updated"
+
+    if not changed:
+        return
+
+    Announcement.objects.bulk_update(changed, fields=sorted(fields))
+    PriceHistory.objects.bulk_create(history)
+    if Announcement.outbox_tracked:
+        outbox.record_instances(changed, "updated", changed[0]._state.db)
+    if reindexed:
+        queue_reindex(reindexed, changed[0]._state.db)
+    transaction.on_commit(mark_summary_dirty)
+    if moved:
+        transaction.on_commit(lambda: hot_feed.refresh(moved))
+
+
+def _set_deleted(seller_id: uuid.UUID, ids: list[uuid.UUID], is_deleted: bool) -> list[dict]:
+    """Помечает объявления продавца удалёнными или восстанавливает их частями.
+    Каждая часть — одна транзакция: выборка текущего состояния объявлений и один
+    UPDATE через `IsDeletedQuerySet`, который уведомляет ленты, фасеты и outbox."""
+
+    results = []
+    for chunk in _chunks(list(dict.fromkeys(ids))):
+        with transaction.atomic():
+            states = dict(
+                Announcement.objects.unfiltered()
+                .select_for_update()
+                .filter(seller_id=seller_id, pk__in=chunk)
+                .values_list("pk", "is_deleted")
+            )
+            to_change = [pk for pk in chunk if states.get(pk) == (not is_deleted)]
+            queryset = Announcement.objects.unfiltered().filter(pk__in=to_change)
+            if to_change:
+                if is_deleted:
+                    queryset.delete()
+                else:
+                    queryset.restore()
+
+        status = "deleted" if is_deleted else "restored"
+        for pk in chunk:
+            if pk not in states:
+                results.append({"id": pk, "status": "not_found"})
+            elif pk in to_change:
+                results.append({"id": pk, "status": status})
+            else:
+                results.append({"id": pk, "status": "unchanged"})
+    return results
+
+
+def bulk_delete_announcements(seller_id: uuid.UUID, ids: list[uuid.UUID]) -> list[dict]:
+    """Помечает удалёнными объявления продавца и возвращает результат по каждому."""
+
+    return _set_deleted(seller_id, ids, is_deleted=True)
+
+
+def bulk_restore_announcements(seller_id: uuid.UUID, ids: list[uuid.UUID]) -> list[dict]:
+    """Восстанавливает объявления продавца и возвращает результат по каждому."""
+
+    return _set_deleted(seller_id, ids, is_deleted=False)
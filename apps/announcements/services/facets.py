@@ -0,0 +1,189 @@
+import time
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, Q, QuerySet, Value, When
+
+from apps.announcements.models import CONDITION_TYPE_CHOICES, Announcement
+
+
+# Ценовые диапазоны фасета: (ключ, нижняя граница включительно, верхняя не включительно).
+PRICE_BUCKETS = (
+    ("0-1000", Decimal(0), Decimal(1000)),
+    ("1000-5000", Decimal(1000), Decimal(5000)),
+    ("5000-20000", Decimal(5000), Decimal(20000)),
+    ("20000-100000", Decimal(20000), Decimal(100000)),
+    ("100000+", Decimal(100000), None),
+)
+
+SUMMARY_CACHE_KEY = "announcements:facets:summary"
+VERSION_CACHE_KEY = "announcements:facets:version"
+
+
+@dataclass(frozen=True)
+class FacetFilters:
+    """Выбранные покупателем значения фасетов."""
+
+    category: uuid.UUID | None = None
+    condition: str | None = None
+    price: str | None = None
+
+
+def price_bucket_expression() -> Case:
+    """Выражение SQL, относящее цену объявления к ценовому диапазону."""
+
+    whens = []
+    for key, low, high in PRICE_BUCKETS:
+        condition = Q(price__gte=low) if high is None else Q(price__gte=low, price__lt=high)
+        whens.append(When(condition, then=Value(key)))
+    return Case(*whens, output_field=CharField())
+
+
+def price_bucket_filter(key: str) -> Q:
+    """Условие фильтрации объявлений по ключу ценового диапазона."""
+
+    for bucket_key, low, high in PRICE_BUCKETS:
+        if bucket_key == key:
+            return Q(price__gte=low) if high is None else Q(price__gte=low, price__lt=high)
+    raise ValueError(f"Неизвестный ценовой диапазон: {key}")
+
+
+def build_summary() -> dict:
+    """Строит сводку количества активных объявлений по (категория, состояние, цена).
+    Выполняется одним запросом GROUP BY, который читает только индекс
+    `(category, condition, price) WHERE NOT is_deleted`. Размер сводки не зависит
+    от числа объявлений: не более (категорий × состояний × диапазонов) строк."""
+
+    rows = (
+        Announcement.objects.annotate(bucket=price_bucket_expression())
+        .values_list("category_id", "category__slug", "category__name", "condition", "bucket")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    categories, counts = {}, []
+    for category_id, slug, name, condition, bucket, count in rows:
+        categories[str(category_id)] = {"id": str(category_id), "slug": slug, "name": name}
+        counts.append((str(category_id), condition, bucket, count))
+    return {"built_at": time.time(), "categories": categories, "counts": counts}
+
+
+def new_summary_version() -> int:
+    """Задаёт версию данных сводки, если её нет в кэше (ещё не задана или вытеснена),
+    и возвращает текущую версию. Новая версия берётся из текущего времени, поэтому
+    она не совпадает с версией ни одной из ранее построенных сводок."""
+
+    cache.add(VERSION_CACHE_KEY, time.time_ns(), None)
+    return cache.get(VERSION_CACHE_KEY)
+
+
+def get_summary() -> dict:
+    """Возвращает сводку фасетов из кэша.
+    Сводка хранится вместе с версией данных, по которой построена, а текущая
+    версия — в отдельном ключе общего кэша; оба ключа читаются одним обращением к
+    кэшу, без запросов к БД. Если версия изменилась (объявления изменены в любом
+    процессе), сводка перестраивается при следующем чтении, но не чаще, чем раз в
+    FACET_SUMMARY_MIN_AGE секунд, чтобы поток изменений не приводил к постоянному
+    пересчёту."""
+
+    cached = cache.get_many([SUMMARY_CACHE_KEY, VERSION_CACHE_KEY])
+    summary = cached.get(SUMMARY_CACHE_KEY)
+    version = cached.get(VERSION_CACHE_KEY)
+    if version is None:
+        version = new_summary_version()
+    if summary is not None:
+        age = time.time() - summary["built_at"]
+        if summary["version"] == version or age < settings.FACET_SUMMARY_MIN_AGE:
+            return summary
+
+    # Версия прочитана до построения: изменения, сделанные во время построения,
+    # увеличат её, и сводка будет перестроена ещё раз.
+    summary = {**build_summary(), "version": version}
+    cache.set(SUMMARY_CACHE_KEY, summary, settings.FACET_SUMMARY_TTL)
+    return summary
+
+
+def mark_summary_dirty():
+    """Помечает сводку фасетов устаревшей после изменения объявлений: атомарно
+    увеличивает версию данных в общем кэше, которую сравнивают с версией своей
+    сводки все процессы."""
+
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        new_summary_version()
+
+
+def facet_counts(summary: dict, filters: FacetFilters) -> dict:
+    """Вычисляет количество объявлений для каждого значения каждого фасета.
+    Для фасета учитываются фильтры по всем остальным фасетам, поэтому покупатель
+    видит, сколько объявлений останется, если изменить значение этого фасета."""
+
+    category = str(filters.category) if filters.category else None
+    by_category: dict[str, int] = {}
+    by_condition: dict[str, int] = {}
+    by_price: dict[str, int] = {}
+    total = 0
+
+    for category_id, condition, bucket, count in summary["counts"]:
+        category_match = category is None or category_id == category
+        condition_match = filters.condition is None or condition == filters.condition
+        price_match = filters.price is None or bucket == filters.price
+
+        if condition_match and price_match:
+            by_category[category_id] = by_category.get(category_id, 0) + count
+        if category_match and price_match:
+            by_condition[condition] = by_condition.get(condition, 0) + count
+        if category_match and condition_match:
+            by_price[bucket] = by_price.get(bucket, 0) + count
+        if category_match and condition_match and price_match:
+            total += count
+
+    return {
+        "count": total,
+        "facets": {
+            "category": [
+                {**summary["categories"][category_id], "count": count}
+                for category_id, count in sorted(
+                    by_category.items(), key=lambda item: item[1], reverse=True
+                )
+            ],
+            "condition": [
+                {"value": value, "label": label, "count": by_condition.get(value, 0)}
+                for value, label in CONDITION_TYPE_CHOICES
+            ],
+            "price": [
+                {
+                    "key": key,
+                    "min": int(low),
+                    "max": int(high) if high is not None else None,
+                    "count": by_price.get(key, 0),
+                }
+                for key, low, high in PRICE_BUCKETS
+            ],
+        },
+    }
+
+
+def category_id_by_slug(summary: dict, slug: str) -> uuid.UUID | None:
+    """Находит идентификатор категории по slug в сводке, без запроса к БД."""
+
+    for category in summary["categories"].values():
+        if category["slug"] == slug:
+            return uuid.UUID(category["id"])
+    return None
+
+
+def filter_announcements(filters: FacetFilters) -> QuerySet[Announcement]:
+    """Возвращает активные объявления, отфильтрованные по выбранным фасетам."""
+
+    queryset = Announcement.objects.all()
+    if filters.category:
+        queryset = queryset.filter(category_id=filters.category)
+    if filters.condition:
+        queryset = queryset.filter(condition=filters.condition)
+    if filters.price:
+        queryset = queryset.filter(price_bucket_filter(filters.price))
+    return queryset
@@ -0,0 +1,166 @@
+import bisect
+import threading
+import time
+import uuid
+from collections.abc import Iterable
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connection
+
+from apps.announcements.models import Announcement, Category
+
+
+# Элемент ленты: (-timestamp создания, id). Список по возрастанию ключа —
+# это объявления от новых к старым.
+FeedEntry = tuple[float, str]
+
+
+class CategoryFeed:
+    """Ограниченный отсортированный список последних объявлений одной категории."""
+
+    __slots__ = ("entries", "built_at", "complete")
+
+    def __init__(self, entries: list[FeedEntry]):
+        self.entries = entries
+        self.built_at = time.monotonic()
+        # False, если из заполненной ленты удаляли объявления: следующее по
+        # давности объявление неизвестно, и ленту нужно перечитать из БД.
+        self.complete = True
+
+
+class HotFeed:
+    """Лента свежих объявлений по категориям, хранящаяся в памяти процесса.
+    Для каждой категории хранится не более `size` идентификаторов последних
+    объявлений, поэтому чтение ленты не требует сортировки в PostgreSQL.
+    Лента обновляется инкрементально при создании, мягком удалении и
+    восстановлении объявлений, а при холодном старте строится одним запросом
+    `LATERAL JOIN`, который читает по индексу не более `size` строк на категорию.
+    Чтобы учесть изменения из других процессов, лента категории перечитывается
+    из БД не реже, чем раз в `ttl` секунд."""
+
+    def __init__(self, size: int | None = None, ttl: float | None = None):
+        self.size = size or settings.HOT_FEED_SIZE
+        self.ttl = ttl if ttl is not None else settings.HOT_FEED_TTL
+        self._feeds: dict[uuid.UUID, CategoryFeed] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _entry(pk: uuid.UUID, created_at: datetime) -> FeedEntry:
+        return (-created_at.timestamp(), str(pk))
+
+    def rebuild(self):
+        """Строит ленты всех категорий одним запросом.
+        Для каждой категории подзапрос `LATERAL` читает последние объявления по
+        частичному индексу `(category, -created_at) WHERE NOT is_deleted`, поэтому
+        сортировка всей таблицы не выполняется."""
+
+        sql = f"""
+            SELECT c.id, a.id, a.created_at
+            FROM {Category._meta.db_table} c
+            CROSS JOIN LATERAL (
+                SELECT id, created_at
+                FROM {Announcement._meta.db_table}
+                WHERE category_id = c.id AND NOT is_deleted
+                ORDER BY created_at DESC
+                LIMIT %s
+            ) a
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [self.size])
+            rows = cursor.fetchall()
+
+        entries: dict[uuid.UUID, list[FeedEntry]] = {}
+        for category_id, pk, created_at in rows:
+            entries.setdefault(category_id, []).append(self._entry(pk, created_at))
+
+        with self._lock:
+            self._feeds = {
+                category_id: CategoryFeed(sorted(items))
+                for category_id, items in entries.items()
+            }
+            self._loaded = True
+
+    def rebuild_category(self, category_id: uuid.UUID) -> CategoryFeed:
+        """Перечитывает ленту одной категории по индексу `(category, -created_at)`."""
+
+        rows = (
+            Announcement.objects.filter(category_id=category_id)
+            .order_by("-created_at")
+            .values_list("id", "created_at")[: self.size]
+        )
+        feed = CategoryFeed([self._entry(pk, created_at) for pk, created_at in rows])
+        with self._lock:
+            self._feeds[category_id] = feed
+        return feed
+
+    def get_ids(self, category_id: uuid.UUID) -> list[uuid.UUID]:
+        """Возвращает идентификаторы последних объявлений категории, от новых к старым."""
+
+        if not self._loaded:
+            self.rebuild()
+
+        feed = self._feeds.get(category_id)
+        if feed is None or not feed.complete or time.monotonic() - feed.built_at > self.ttl:
+            feed = self.rebuild_category(category_id)
+        return [uuid.UUID(pk) for _key, pk in feed.entries]
+
+    def _remove(self, feed: CategoryFeed, pks: set[str]):
+        """Удаляет объявления из ленты (вызывается под блокировкой).
+        Если из заполненной ленты что-то удалено, её следующий элемент неизвестен,
+        поэтому лента будет перечитана из БД при следующем обращении."""
+
+        remaining = [entry for entry in feed.entries if entry[1] not in pks]
+        if len(remaining) != len(feed.entries):
+            if len(feed.entries) >= self.size:
+                feed.complete = False
+            feed.entries = remaining
+
+    def add(self, category_id: uuid.UUID, pk: uuid.UUID, created_at: datetime):
+        """Добавляет или перемещает объявление в ленту категории.
+        Объявление удаляется из лент других категорий (на случай смены категории),
+        а при переполнении ленты вытесняется самое старое объявление."""
+
+        entry = self._entry(pk, created_at)
+        with self._lock:
+            for other_id, other in self._feeds.items():
+                if other_id != category_id:
+                    self._remove(other, {entry[1]})
+
+            feed = self._feeds.get(category_id)
+            if feed is None or entry in feed.entries:
+                return
+            if len(feed.entries) >= self.size and entry > feed.entries[-1]:
+                return
+            bisect.insort(feed.entries, entry)
+            del feed.entries[self.size :]
+
+    def discard(self, pks: Iterable[uuid.UUID]):
+        """Удаляет объявления из всех лент."""
+
+        pks = {str(pk) for pk in pks}
+        with self._lock:
+            for feed in self._feeds.values():
+                self._remove(feed, pks)
+
+    def refresh(self, pks: Iterable[uuid.UUID]):
+        """Приводит ленты в соответствие с текущим состоянием объявлений `pks` в БД."""
+
+        pks = list(pks)
+        self.discard(pks)
+        rows = Announcement.objects.filter(pk__in=pks).values_list(
+            "category_id", "id", "created_at"
+        )
+        for category_id, pk, created_at in rows:
+            self.add(category_id, pk, created_at)
+
+    def clear(self):
+        """Сбрасывает все ленты; они будут построены заново при следующем обращении."""
+
+        with self._lock:
+            self._feeds = {}
+            self._loaded = False
+
+
+hot_feed = HotFeed()
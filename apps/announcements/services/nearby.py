@@ -0,0 +1,23 @@
+from django.db.models import QuerySet
+
+from apps.announcements.models import Announcement
+from apps.announcements.services.facets import FacetFilters, filter_announcements
+from apps.common.services.geo import distance_expression, within_radius_filter
+
+
+def get_nearby(
+    latitude: float, longitude: float, radius_km: float, filters: FacetFilters
+) -> QuerySet[Announcement]:
+    """Возвращает активные объявления в пределах `radius_km` от точки, от ближних к дальним.
+    Кандидаты выбираются по диапазонам геохешей из индекса `(geohash)` или, при
+    фильтре по категории, `(category, geohash)`, поэтому расстояние вычисляется
+    только для объявлений в окрестности точки, а не для всей таблицы. В каждом
+    объявлении доступно поле `distance` — расстояние в километрах."""
+
+    return (
+        filter_announcements(filters)
+        .filter(within_radius_filter(latitude, longitude, radius_km))
+        .annotate(distance=distance_expression(latitude, longitude))
+        .filter(distance__lte=radius_km)
+        .order_by("distance", "id")
+    )
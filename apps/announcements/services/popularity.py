@@ -0,0 +1,170 @@
+import atexit
+import logging
+import math
+import threading
+import uuid
+from collections import Counter
+from datetime import UTC, datetime
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from apps.announcements.models import Announcement
+
+
+logger = logging.getLogger(__name__)
+
+# Точка отсчёта для популярности. Вес просмотра растёт как 2^((t - POPULARITY_EPOCH) / T½),
+# поэтому отношение весов двух просмотров зависит только от разницы во времени, а
+# сортировка по сохранённому значению совпадает с сортировкой по затухающему счёту.
+POPULARITY_EPOCH = datetime(2024, 1, 1, tzinfo=UTC)
+
+FLUSH_BATCH_SIZE = 500
+
+
+def popularity_increment(views: int, viewed_at: datetime) -> float:
+    """Возвращает логарифм суммарного веса `views` просмотров в момент `viewed_at`."""
+
+    elapsed = (viewed_at - POPULARITY_EPOCH).total_seconds()
+    return math.log(views) + elapsed * math.log(2) / settings.POPULARITY_HALF_LIFE
+
+
+def write_views(counts: dict[uuid.UUID, int], viewed_at: datetime):
+    """Записывает накопленные просмотры в БД пачками по FLUSH_BATCH_SIZE объявлений.
+    Каждая пачка — один UPDATE ... FROM (VALUES ...), который увеличивает счётчик
+    просмотров и добавляет вес просмотров к популярности. Популярность хранится как
+    логарифм суммы весов, поэтому сложение выполняется как log(e^a + e^b) и значение
+    не переполняется со временем. Разница ограничена 50, потому что меньшие
+    поправки не различимы в double precision, а EXP от большого отрицательного
+    числа в PostgreSQL завершается ошибкой потери значимости."""
+
+    table = Announcement._meta.db_table
+    items = list(counts.items())
+    with transaction.atomic():
+        for start in range(0, len(items), FLUSH_BATCH_SIZE):
+            batch = items[start : start + FLUSH_BATCH_SIZE]
+            rows = ", ".join(["(%s::uuid, %s::bigint, %s::double precision)"] * len(batch))
+            params = []
+            for pk, views in batch:
+                params.extend([str(pk), views, popularity_increment(views, viewed_at)])
+            sql = f"""
+                UPDATE {table} AS a
+                SET views_count = a.views_count + v.views,
+                    popularity = CASE
+                        WHEN a.views_count = 0 THEN v.score
+                        ELSE GREATEST(a.popularity, v.score)
+                            + LN(1 + EXP(-LEAST(ABS(a.popularity - v.score), 50)))
+                    END
+                FROM (VALUES {rows}) AS v(id, views, score)
+                WHERE a.id = v.id
+            """
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+
+
+class ViewCounter:
+    """Буфер просмотров объявлений в памяти процесса.
+    Просмотр увеличивает счётчик в словаре и не обращается к БД. Фоновый поток
+    записывает накопленные просмотры пачкой раз в `flush_interval` секунд или
+    раньше, если накопилось `max_pending` просмотров, а также при завершении
+    процесса. Буфер не растёт больше `max_pending` просмотров: пока накопленное не
+    записано (например, БД недоступна), новые просмотры отбрасываются, а их
+    количество пишется в лог при следующей записи. При аварийном завершении
+    теряются только просмотры, накопленные с последней записи, то есть не больше
+    `max_pending` просмотров."""
+
+    def __init__(self, flush_interval: float | None = None, max_pending: int | None = None):
+        self.flush_interval = flush_interval or settings.POPULARITY_FLUSH_INTERVAL
+        self.max_pending = max_pending or settings.POPULARITY_FLUSH_MAX_PENDING
+        self._pending: Counter[uuid.UUID] = Counter()
+        self._pending_total = 0
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def record(self, pk: uuid.UUID, views: int = 1):
+        """Учитывает просмотр объявления или отбрасывает его, если буфер заполнен."""
+
+        with self._lock:
+            if self._pending_total + views > self.max_pending:
+                self._dropped += views
+            else:
+                self._pending[pk] += views
+                self._pending_total += views
+            is_full = self._pending_total >= self.max_pending
+            if self._thread is None:
+                self._start()
+        if is_full:
+            self._flush_requested.set()
+
+    def _start(self):
+        """Запускает фоновый поток записи (вызывается под блокировкой)."""
+
+        self._thread = threading.Thread(
+            target=self._run, name="announcement-view-counter", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self):
+        """Периодически записывает накопленные просмотры в БД."""
+
+        while True:
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Не удалось записать просмотры объявлений")
+
+    def _take(self) -> tuple[Counter[uuid.UUID], int]:
+        """Забирает накопленные просмотры и число отброшенных, освобождая буфер."""
+
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            dropped, self._dropped = self._dropped, 0
+            self._pending_total = 0
+        return pending, dropped
+
+    def flush(self) -> int:
+        """Записывает накопленные просмотры в БД и возвращает их количество.
+        Если запись не удалась, просмотры возвращаются в буфер, только если он
+        останется не больше `max_pending`, чтобы недоступность БД не приводила к
+        росту памяти; иначе они отбрасываются."""
+
+        pending, dropped = self._take()
+        if dropped:
+            logger.warning("Буфер просмотров переполнен, отброшено просмотров: %s", dropped)
+        if not pending:
+            return 0
+        try:
+            write_views(pending, timezone.now())
+        except Exception:
+            with self._lock:
+                if self._pending_total + pending.total() <= self.max_pending:
+                    self._pending.update(pending)
+                    self._pending_total += pending.total()
+                else:
+                    self._dropped += pending.total()
+            raise
+        return pending.total()
+
+    def pending(self) -> int:
+        """Возвращает количество просмотров, ещё не записанных в БД."""
+
+        with self._lock:
+            return self._pending_total
+
+
+view_counter = ViewCounter()
+
+
+def get_popular(category_id: uuid.UUID) -> QuerySet[Announcement]:
+    """Возвращает активные объявления категории от популярных к менее популярным.
+    Читается по частичному индексу `(category, -popularity) WHERE NOT is_deleted`."""
+
+    return Announcement.objects.filter(category_id=category_id).order_by("-popularity")
@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.db.models import F, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.announcements.models import Announcement, PriceHistory
+
+
+def get_price_series(announcement_id) -> QuerySet[PriceHistory]:
+    """Возвращает историю цены объявления, от старых изменений к новым.
+    Читается по индексу `(announcement, changed_at)`."""
+
+    return (
+        PriceHistory.objects.filter(announcement_id=announcement_id)
+        .order_by("changed_at", "id")
+        .only("price", "previous_price", "changed_at")
+    )
+
+
+def get_price_drops(hours: int) -> QuerySet[Announcement]:
+    """Возвращает активные объявления, цена которых снизилась за последние `hours` часов.
+    Объявление попадает в выборку, если за период было хотя бы одно снижение цены
+    и текущая цена ниже цены на начало периода или цены при создании объявления
+    внутри периода (она доступна в аннотации `old_price`).
+    Изменения за период находятся по BRIN-индексу на `changed_at`, поэтому запрос
+    читает только последние блоки журнала цен."""
+
+    since = timezone.now() - timedelta(hours=hours)
+    dropped_ids = PriceHistory.objects.filter(
+        changed_at__gte=since, price__lt=F("previous_price")
+    ).values("announcement_id")
+    first_change = PriceHistory.objects.filter(
+        announcement_id=OuterRef("pk"), changed_at__gte=since
+    ).order_by("changed_at", "id")
+    # У первой записи истории нет предыдущей цены: объявление создано внутри периода.
+    start_price = Coalesce("previous_price", "price")
+
+    return (
+        Announcement.objects.filter(pk__in=dropped_ids)
+        .annotate(old_price=Subquery(first_change.values(price_before=start_price)[:1]))
+        .filter(price__lt=F("old_price"))
+    )
@@ -0,0 +1,415 @@
+import hashlib
+import heapq
+import random
+import re
+import struct
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import django
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F, Q, QuerySet
+from django.utils import timezone
+
+from apps.announcements.models import (
+    Announcement,
+    AnnouncementSignature,
+    SimilarAnnouncement,
+    SimilarityBucket,
+    SimilarityReindex,
+)
+
+
+# Число хеш-функций MinHash и разбиение сигнатуры на полосы LSH. Объявления
+# становятся кандидатами, если у них совпадает хотя бы одна полоса из BANDS по
+# ROWS значений: при сходстве 0,3 вероятность этого около 95%, при 0,1 — около 27%.
+NUM_PERM = 64
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+
+# Сколько слов описания учитывается: начало описания характеризует товар лучше,
+# чем условия доставки и контакты в конце.
+DESCRIPTION_WORDS = 200
+
+# Объявления с меньшей оценкой сходства не считаются похожими.
+MIN_SCORE = 0.1
+
+# Сколько объявлений обрабатывается за раз при построении индекса.
+REBUILD_CHUNK_SIZE = 200
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(20240101)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+_SIGNATURE_FORMAT = f"<{NUM_PERM}I"
+_WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(title: str, description: str) -> set[str]:
+    """Возвращает множество признаков объявления: слова заголовка и начала
+    описания, а также пары соседних слов заголовка."""
+
+    title_words = _WORD_RE.findall(title.lower())
+    description_words = _WORD_RE.findall(description.lower())[:DESCRIPTION_WORDS]
+    tokens = set(title_words) | set(description_words)
+    tokens.update(f"{first} {second}" for first, second in zip(title_words, title_words[1:]))
+    return tokens
+
+
+def _hash_token(token: str) -> int:
+    """Возвращает 64-битный хеш признака."""
+
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+
+
+def compute_signature(title: str, description: str) -> bytes | None:
+    """Возвращает MinHash-сигнатуру объявления или None, если в тексте нет слов."""
+
+    hashes = [_hash_token(token) for token in tokenize(title, description)]
+    if not hashes:
+        return None
+    signature = [
+        min((a * value + b) % _MERSENNE_PRIME for value in hashes) & _MAX_HASH
+        for a, b in _PERMUTATIONS
+    ]
+    return struct.pack(_SIGNATURE_FORMAT, *signature)
+
+
+def band_buckets(category_id: uuid.UUID, signature: bytes) -> list[int]:
+    """Возвращает корзины LSH объявления: по одной на каждую полосу сигнатуры.
+    В хеш корзины входит категория, поэтому кандидаты всегда из той же категории."""
+
+    width = ROWS * 4
+    buckets = []
+    for band in range(BANDS):
+        digest = hashlib.blake2b(
+            category_id.bytes + bytes([band]) + signature[band * width : (band + 1) * width],
+            digest_size=8,
+        ).digest()
+        buckets.append(int.from_bytes(digest, "little", signed=True))
+    return buckets
+
+
+def similarity(first: bytes, second: bytes) -> float:
+    """Оценивает сходство Жаккара по доле совпадающих значений сигнатур."""
+
+    first_values = struct.unpack(_SIGNATURE_FORMAT, first)
+    second_values = struct.unpack(_SIGNATURE_FORMAT, second)
+    return sum(a == b for a, b in zip(first_values, second_values)) / NUM_PERM
+
+
+def _price_matches(price: Decimal, other: Decimal) -> bool:
+    """Проверяет, что цены отличаются не больше чем в SIMILAR_PRICE_RATIO раз."""
+
+    ratio = Decimal(str(settings.SIMILAR_PRICE_RATIO))
+    return other * ratio >= price and other <= price * ratio
+
+
+def index_announcements(pks: list[uuid.UUID]):
+    """Пересчитывает сигнатуры и корзины LSH объявлений `pks`.
+    Удалённые объявления исключаются из индекса."""
+
+    signatures, buckets = [], []
+    rows = Announcement.objects.filter(pk__in=pks).values_list(
+        "pk", "category_id", "title", "description"
+    )
+    for pk, category_id, title, description in rows:
+        signature = compute_signature(title, description)
+        if signature is None:
+            continue
+        signatures.append(AnnouncementSignature(announcement_id=pk, signature=signature))
+        buckets.extend(
+            SimilarityBucket(announcement_id=pk, bucket=bucket)
+            for bucket in band_buckets(category_id, signature)
+        )
+
+    with transaction.atomic():
+        AnnouncementSignature.objects.filter(announcement_id__in=pks).delete()
+        SimilarityBucket.objects.filter(announcement_id__in=pks).delete()
+        AnnouncementSignature.objects.bulk_create(signatures)
+        SimilarityBucket.objects.bulk_create(buckets)
+
+
+def compute_similar(pks: list[uuid.UUID]) -> dict[uuid.UUID, list[tuple[uuid.UUID, float]]]:
+    """Возвращает для объявлений `pks` до SIMILAR_ANNOUNCEMENTS_COUNT похожих с оценками.
+    Кандидаты берутся из общих корзин LSH, а затем отбираются по цене и по
+    оценке сходства сигнатур. Запросов к БД три, независимо от числа объявлений."""
+
+    own_buckets = defaultdict(set)
+    for pk, bucket in SimilarityBucket.objects.filter(announcement_id__in=pks).values_list(
+        "announcement_id", "bucket"
+    ):
+        own_buckets[pk].add(bucket)
+
+    members = defaultdict(list)
+    for bucket, pk in SimilarityBucket.objects.filter(
+        bucket__in={bucket for buckets in own_buckets.values() for bucket in buckets}
+    ).values_list("bucket", "announcement_id"):
+        members[bucket].append(pk)
+
+    candidates = {pk for pks_in_bucket in members.values() for pk in pks_in_bucket}
+    details = {
+        pk: (price, signature)
+        for pk, price, signature in Announcement.objects.filter(pk__in=candidates).values_list(
+            "pk", "price", "signature__signature"
+        )
+    }
+
+    results = {}
+    for pk, buckets in own_buckets.items():
+        if pk not in details:
+            continue
+        price, signature = details[pk]
+        scored = []
+        for other in {other for bucket in buckets for other in members[bucket]}:
+            if other == pk or other not in details:
+                continue
+            other_price, other_signature = details[other]
+            if not _price_matches(price, other_price):
+                continue
+            score = similarity(bytes(signature), bytes(other_signature))
+            if score >= MIN_SCORE:
+                scored.append((score, other))
+        top = heapq.nlargest(settings.SIMILAR_ANNOUNCEMENTS_COUNT, scored)
+        results[pk] = [(other, score) for score, other in top]
+    return results
+
+
+def _upsert_similar(rows: list[SimilarAnnouncement]):
+    """Добавляет строки похожих объявлений; для уже существующих пар обновляет оценку.
+    Пару могут одновременно записать обновления обоих объявлений: одно сохраняет
+    свой список, а другое добавляет себя в список соседа."""
+
+    SimilarAnnouncement.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["announcement", "similar"],
+        update_fields=["score"],
+    )
+
+
+def store_similar(results: dict[uuid.UUID, list[tuple[uuid.UUID, float]]]):
+    """Заменяет списки похожих объявлений для ключей `results`."""
+
+    with transaction.atomic():
+        SimilarAnnouncement.objects.filter(announcement_id__in=list(results)).delete()
+        _upsert_similar(
+            [
+                SimilarAnnouncement(announcement_id=pk, similar_id=other, score=score)
+                for pk, items in results.items()
+                for other, score in items
+            ]
+        )
+
+
+def _merge_into_neighbours(results: dict[uuid.UUID, list[tuple[uuid.UUID, float]]]):
+    """Добавляет изменённые объявления в списки их соседей и обрезает эти списки.
+    Сходство симметрично, поэтому объявление A, похожее на B, — кандидат в список B."""
+
+    rows = [
+        SimilarAnnouncement(announcement_id=other, similar_id=pk, score=score)
+        for pk, items in results.items()
+        for other, score in items
+        if other not in results
+    ]
+    _upsert_similar(rows)
+
+    neighbours = {row.announcement_id for row in rows}
+    excess, kept = [], defaultdict(int)
+    for row_id, pk in (
+        SimilarAnnouncement.objects.filter(announcement_id__in=neighbours)
+        .order_by("announcement_id", "-score", "id")
+        .values_list("id", "announcement_id")
+    ):
+        kept[pk] += 1
+        if kept[pk] > settings.SIMILAR_ANNOUNCEMENTS_COUNT:
+            excess.append(row_id)
+    SimilarAnnouncement.objects.filter(id__in=excess).delete()
+
+
+@transaction.atomic
+def refresh_similar(pks: list[uuid.UUID]):
+    """Обновляет индекс и списки похожих после изменения объявлений `pks`.
+    Пересчитываются списки самих объявлений; в списках остальных объявлений
+    устаревшие оценки заменяются новыми."""
+
+    pks = list(pks)
+    index_announcements(pks)
+    results = compute_similar(pks)
+    SimilarAnnouncement.objects.filter(similar_id__in=pks).exclude(
+        announcement_id__in=pks
+    ).delete()
+    store_similar({pk: results.get(pk, []) for pk in pks})
+    _merge_into_neighbours(results)
+
+
+@transaction.atomic
+def remove_similar(pks: list[uuid.UUID]):
+    """Исключает объявления `pks` из индекса и из всех списков похожих.
+    Списки, из которых они удалены, дополняются при следующем изменении объявлений
+    или при перестроении индекса."""
+
+    pks = list(pks)
+    AnnouncementSignature.objects.filter(announcement_id__in=pks).delete()
+    SimilarityBucket.objects.filter(announcement_id__in=pks).delete()
+    SimilarAnnouncement.objects.filter(announcement_id__in=pks).delete()
+    SimilarAnnouncement.objects.filter(similar_id__in=pks).delete()
+
+
+def reindex_similar(pks: list[uuid.UUID]):
+    """Пересчитывает объявления `pks` в индексе похожих по их текущему состоянию:
+    удалённые объявления исключаются из индекса, остальные пересчитываются."""
+
+    live = set(Announcement.objects.filter(pk__in=pks).values_list("pk", flat=True))
+    remove_similar([pk for pk in pks if pk not in live])
+    if live:
+        refresh_similar(list(live))
+
+
+def queue_reindex(pks: list[uuid.UUID], using: str = "default"):
+    """Ставит объявления в очередь пересчёта похожих одним INSERT.
+    Если объявление уже в очереди, обновляется время постановки. Вызывается в
+    транзакции изменения: объявление попадает в очередь, только если изменение
+    зафиксировано."""
+
+    now = timezone.now()
+    SimilarityReindex.objects.using(using).bulk_create(
+        [SimilarityReindex(announcement_id=pk, queued_at=now) for pk in dict.fromkeys(pks)],
+        update_conflicts=True,
+        unique_fields=["announcement"],
+        update_fields=["queued_at"],
+    )
+
+
+class SimilarityReindexWorker:
+    """Пересчитывает объявления из очереди `SimilarityReindex` пачками.
+    Пачка занимается в короткой транзакции (`SELECT ... FOR UPDATE SKIP LOCKED`) на
+    SIMILAR_REINDEX_LEASE секунд, поэтому несколько процессов не пересчитывают одни
+    и те же объявления. Пересчёт выполняется вне этой транзакции, после чего строки
+    пачки удаляются из очереди, если объявления не менялись после выборки; иначе
+    они освобождаются и будут пересчитаны снова."""
+
+    def __init__(self, batch_size: int | None = None):
+        self.batch_size = batch_size or settings.SIMILAR_REINDEX_BATCH_SIZE
+
+    def _claim(self) -> dict[uuid.UUID, datetime]:
+        """Занимает пачку объявлений и возвращает их со временем постановки в очередь."""
+
+        now = timezone.now()
+        with transaction.atomic():
+            claimed = dict(
+                SimilarityReindex.objects.select_for_update(skip_locked=True)
+                .filter(Q(locked_until__isnull=True) | Q(locked_until__lte=now))
+                .order_by("queued_at")
+                .values_list("announcement_id", "queued_at")[: self.batch_size]
+            )
+            SimilarityReindex.objects.filter(announcement_id__in=list(claimed)).update(
+                locked_until=now + timedelta(seconds=settings.SIMILAR_REINDEX_LEASE)
+            )
+        return claimed
+
+    def run_once(self) -> int:
+        """Пересчитывает одну пачку объявлений и возвращает их количество."""
+
+        claimed = self._claim()
+        if not claimed:
+            return 0
+
+        try:
+            reindex_similar(list(claimed))
+        except BaseException:
+            SimilarityReindex.objects.filter(announcement_id__in=list(claimed)).update(
+                locked_until=None
+            )
+            raise
+
+        done = Q()
+        for pk, queued_at in claimed.items():
+            done |= Q(announcement_id=pk, queued_at=queued_at)
+        with transaction.atomic():
+            SimilarityReindex.objects.filter(done).delete()
+            SimilarityReindex.objects.filter(announcement_id__in=list(claimed)).update(
+                locked_until=None
+            )
+        return len(claimed)
+
+    def run(self, interval: float = 1, should_stop: Callable[[], bool] = lambda: False):
+        """Пересчитывает объявления, пока `should_stop` не вернёт True.
+        Если очередь пуста, ждёт `interval` секунд перед следующей проверкой."""
+
+        while not should_stop():
+            if self.run_once() < self.batch_size:
+                time.sleep(interval)
+
+
+def get_similar(pk: uuid.UUID) -> QuerySet[Announcement]:
+    """Возвращает похожие объявления, от самых похожих; читается по индексу
+    `(announcement, -score)` без вычислений во время запроса."""
+
+    return (
+        Announcement.objects.filter(similar_to__announcement_id=pk)
+        .annotate(score=F("similar_to__score"))
+        .order_by("-score", "id")
+    )
+
+
+def _build_chunk(pks: list[uuid.UUID]) -> int:
+    """Рассчитывает и заменяет списки похожих для части объявлений."""
+
+    results = compute_similar(pks)
+    store_similar({pk: results.get(pk, []) for pk in pks})
+    return len(pks)
+
+
+def _index_chunk(pks: list[uuid.UUID]) -> int:
+    """Строит сигнатуры и корзины для части объявлений."""
+
+    index_announcements(pks)
+    return len(pks)
+
+
+def _remove_stale():
+    """Удаляет из индекса объявления, которые удалены или помечены удалёнными."""
+
+    live = Announcement.objects.values("pk")
+    AnnouncementSignature.objects.exclude(announcement_id__in=live).delete()
+    SimilarityBucket.objects.exclude(announcement_id__in=live).delete()
+    SimilarAnnouncement.objects.exclude(announcement_id__in=live).delete()
+    SimilarAnnouncement.objects.exclude(similar_id__in=live).delete()
+
+
+def rebuild(
+    workers: int | None = None, chunk_size: int = REBUILD_CHUNK_SIZE
+) -> Iterator[tuple[str, int]]:
+    """Перестраивает индекс похожих объявлений в пуле процессов.
+    Сначала все объявления получают сигнатуры и корзины, затем по ним
+    рассчитываются списки похожих. Объявления обрабатываются в порядке категории и
+    цены, поэтому соседние объявления части — кандидаты друг для друга и запросы
+    части читают близкие строки. Генерирует пары (этап, число обработанных объявлений).
+    Индекс не очищается перед построением: строки каждой части заменяются в одной
+    транзакции, поэтому во время перестроения у каждого объявления есть полный
+    список похожих — прежний или новый. Строки удалённых объявлений удаляются в конце."""
+
+    pks = list(
+        Announcement.objects.order_by("category_id", "price", "id").values_list("pk", flat=True)
+    )
+    chunks = [pks[start : start + chunk_size] for start in range(0, len(pks), chunk_size)]
+
+    # Дочерние процессы открывают собственные соединения с БД.
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+        for stage, function in (("index", _index_chunk), ("similar", _build_chunk)):
+            done = 0
+            for count in pool.map(function, chunks):
+                done += count
+                yield stage, done
+    _remove_stale()
@@ -0,0 +1,72 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.announcements.models import Announcement
+from apps.announcements.services.facets import mark_summary_dirty
+from apps.announcements.services.feed import hot_feed
+from apps.announcements.services.similar import queue_reindex
+from apps.common.signals import post_restore, post_soft_delete
+
+
+@receiver(post_save, sender=Announcement)
+def update_hot_feed(sender, instance: Announcement, using: str, **kwargs):
+    """Обновляет ленту категории после сохранения, мягкого удаления или восстановления объявления."""
+
+    if instance.is_deleted:
+        transaction.on_commit(lambda: hot_feed.discard([instance.pk]), using=using)
+    else:
+        transaction.on_commit(
+            lambda: hot_feed.add(instance.category_id, instance.pk, instance.created_at),
+            using=using,
+        )
+
+
+@receiver(post_delete, sender=Announcement)
+def remove_from_hot_feed(sender, instance: Announcement, using: str, **kwargs):
+    """Удаляет объявление из лент после физического удаления."""
+
+    transaction.on_commit(lambda: hot_feed.discard([instance.pk]), using=using)
+
+
+@receiver(post_soft_delete, sender=Announcement)
+def discard_soft_deleted(sender, pks: list, using: str, **kwargs):
+    """Удаляет из лент объявления, помеченные удалёнными массовой операцией."""
+
+    transaction.on_commit(lambda: hot_feed.discard(pks), using=using)
+
+
+@receiver(post_restore, sender=Announcement)
+def refresh_restored(sender, pks: list, using: str, **kwargs):
+    """Возвращает в ленты объявления, восстановленные массовой операцией."""
+
+    transaction.on_commit(lambda: hot_feed.refresh(pks), using=using)
+
+
+@receiver(post_save, sender=Announcement)
+@receiver(post_delete, sender=Announcement)
+@receiver(post_soft_delete, sender=Announcement)
+@receiver(post_restore, sender=Announcement)
+def invalidate_facet_summary(sender, using: str, **kwargs):
+    """Помечает сводку фасетов устаревшей после любого изменения объявлений."""
+
+    transaction.on_commit(mark_summary_dirty, using=using)
+
+
+@receiver(post_save, sender=Announcement)
+def queue_similar_reindex(sender, instance: Announcement, created: bool, using: str, **kwargs):
+    """Ставит объявление в очередь пересчёта похожих, если изменились заголовок,
+    описание, цена, категория или пометка удаления. Другие изменения индекс не
+    затрагивают."""
+
+    if created or instance.similarity_changed():
+        queue_reindex([instance.pk], using)
+
+
+@receiver(post_soft_delete, sender=Announcement)
+@receiver(post_restore, sender=Announcement)
+def queue_bulk_similar_reindex(sender, pks: list, using: str, **kwargs):
+    """Ставит в очередь пересчёта похожих объявления, помеченные удалёнными или
+    восстановленные массовой операцией."""
+
+    queue_reindex(pks, using)
@@ -1,3 +1,703 @@
-from django.test import TestCase
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db.models import FloatField, Value
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from apps.accounts.models import User
+from apps.announcements.models import (
+    Announcement,
+    AnnouncementSignature,
+    Category,
+    PriceHistory,
+    SimilarityReindex,
+)
+from apps.announcements.serializers import (
+    AnnouncementSerializer,
+    CategorySerializer,
+    NearbyAnnouncementSerializer,
+    announcement_reader,
+    category_reader,
+    nearby_announcement_reader,
+)
+from apps.announcements.services import popularity
+from apps.announcements.services.bulk import (
+    bulk_delete_announcements,
+    bulk_restore_announcements,
+    bulk_update_announcements,
+)
+from apps.announcements.services.feed import HotFeed
+from apps.announcements.services.nearby import get_nearby
+from apps.announcements.services.prices import get_price_drops, get_price_series
+from apps.announcements.services.facets import (
+    VERSION_CACHE_KEY,
+    FacetFilters,
+    facet_counts,
+    get_summary,
+    mark_summary_dirty,
+)
+from apps.announcements.services.similar import (
+    SimilarityReindexWorker,
+    compute_similar,
+    get_similar,
+    index_announcements,
+    queue_reindex,
+    refresh_similar,
+    remove_similar,
+)
+from apps.announcements.views import AnnouncementSearchAPIView
+from apps.common.renderers import FastJSONRenderer
+from apps.common.signals import post_soft_delete
+from apps.sellers.models import Seller
+
+
+class AnnouncementTestCase(TestCase):
+    """Общие данные тестов: категории, продавец и его объявления."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(email="seller@example.com")
+        cls.seller = Seller.objects.create(
+            user=user,
+            name="Продавец",
+            phone_number="+79990000000",
+            latitude=55.75,
+            longitude=37.61,
+        )
+        cls.category = Category.objects.create(name="Электроника", image="category_images/a.png")
+        Category.objects.create(name="Книги", image="category_images/b.png")
+        cls.announcement = Announcement.objects.create(
+            title="Телефон",
+            description="Почти новый",
+            price=Decimal("10.5"),
+            condition="NEW",
+            image="announcement_images/phone.png",
+            category=cls.category,
+            seller=cls.seller,
+        )
+        Announcement.objects.create(
+            title="Ноутбук\u2028",
+            description="Без продавца",
+            price=Decimal("99999999.99"),
+            condition="USED",
+            image="announcement_images/laptop.png",
+            category=cls.category,
+        )
+
+
+class ReadSerializerTests(AnnouncementTestCase):
+    """Быстрая сериализация даёт тот же JSON, что и DRF-сериализатор."""
+
+    def assert_same_json(self, serializer_class, reader, queryset):
+        """Сравнивает ответы побайтно, с абсолютными URL файлов."""
+
+        context = {"request": APIRequestFactory().get("/")}
+        serializer = serializer_class(queryset, many=True, context=context)
+        expected = JSONRenderer().render(serializer.data)
+        actual = FastJSONRenderer().render(reader.serialize(queryset, context))
+        self.assertEqual(actual, expected)
+
+    def test_announcements(self):
+        """Объявления: Decimal, UUID, даты, пустые координаты и связанные ключи."""
+
+        queryset = Announcement.objects.order_by("-created_at")
+        self.assert_same_json(AnnouncementSerializer, announcement_reader, queryset)
+
+    def test_categories(self):
+        """Категории: slug и URL изображения."""
+
+        queryset = Category.objects.order_by("name")
+        self.assert_same_json(CategorySerializer, category_reader, queryset)
+
+    def test_annotated_fields(self):
+        """Поле из аннотации queryset (расстояние в поиске рядом)."""
+
+        queryset = Announcement.objects.annotate(
+            distance=Value(1.25, output_field=FloatField())
+        ).order_by("title")
+        self.assert_same_json(
+            NearbyAnnouncementSerializer, nearby_announcement_reader, queryset
+        )
+
+
+@override_settings(FACET_SUMMARY_MIN_AGE=0)
+class FacetSearchTests(AnnouncementTestCase):
+    """Количества по фасетам и сводка фасетов в кэше."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def create_announcement(self):
+        """Создаёт ещё одно новое объявление в категории электроники."""
+
+        Announcement.objects.create(
+            title="Планшет",
+            description="Новый",
+            price=Decimal("3000"),
+            condition="NEW",
+            image="announcement_images/tablet.png",
+            category=self.category,
+        )
+
+    def test_counts_apply_filters_of_other_facets(self):
+        """Количества фасета учитывают фильтры по остальным фасетам, но не по нему самому."""
+
+        counts = facet_counts(get_summary(), FacetFilters(condition="NEW"))
+
+        self.assertEqual(counts["count"], 1)
+        self.assertEqual(
+            [(item["slug"], item["count"]) for item in counts["facets"]["category"]],
+            [(self.category.slug, 1)],
+        )
+        self.assertEqual(
+            {item["value"]: item["count"] for item in counts["facets"]["condition"]},
+            {"NEW": 1, "USED": 1},
+        )
+        prices = {item["key"]: item["count"] for item in counts["facets"]["price"]}
+        self.assertEqual(prices["0-1000"], 1)
+        self.assertEqual(prices["100000+"], 0)
+
+    def test_search_with_warm_cache_reads_only_page(self):
+        """При тёплом кэше поиск выполняет один запрос к БД — за страницей."""
+
+        get_summary()
+        params = {"category": self.category.slug, "price": "100000+"}
+        request = APIRequestFactory().get("/", params)
+
+        with self.assertNumQueries(1):
+            response = AnnouncementSearchAPIView.as_view()(request)
+
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual([item["title"] for item in response.data["results"]], ["Ноутбук\u2028"])
+
+    def test_summary_is_rebuilt_after_change(self):
+        """Сводка перестраивается только после того, как её пометили устаревшей."""
+
+        get_summary()
+        self.create_announcement()
+        self.assertEqual(facet_counts(get_summary(), FacetFilters())["count"], 2)
+
+        mark_summary_dirty()
+
+        self.assertEqual(facet_counts(get_summary(), FacetFilters())["count"], 3)
+
+    def test_summary_is_rebuilt_when_version_is_evicted(self):
+        """Если версия вытеснена из кэша, сводка не считается актуальной."""
+
+        get_summary()
+        self.create_announcement()
+        cache.delete(VERSION_CACHE_KEY)
+
+        self.assertEqual(facet_counts(get_summary(), FacetFilters())["count"], 3)
+
+
+class SimilarityChangedTests(AnnouncementTestCase):
+    """Определение изменений, влияющих на похожие объявления."""
+
+    def test_unrelated_change_is_ignored(self):
+        """Изменение состояния не требует пересчёта похожих объявлений."""
+
+        announcement = Announcement.objects.get(pk=self.announcement.pk)
+        announcement.condition = "USED"
+
+        self.assertFalse(announcement.similarity_changed())
+
+    def test_price_change_is_detected(self):
+        """Изменение цены требует пересчёта, а та же цена строкой — нет."""
+
+        announcement = Announcement.objects.get(pk=self.announcement.pk)
+        announcement.price = "10.50"
+        self.assertFalse(announcement.similarity_changed())
+
+        announcement.price = Decimal("12")
+        self.assertTrue(announcement.similarity_changed())
+
+    def test_saved_values_become_baseline(self):
+        """После сохранения изменённые значения больше не считаются изменением."""
+
+        announcement = Announcement.objects.get(pk=self.announcement.pk)
+        announcement.title = "Смартфон"
+        announcement.save()
+
+        self.assertFalse(announcement.similarity_changed())
+
+
+class SimilarAnnouncementTests(AnnouncementTestCase):
+    """Индекс похожих объявлений и очередь его пересчёта."""
+
+    def setUp(self):
+        text = "Смартфон Galaxy S21, 128 ГБ, полный комплект, коробка и чек"
+        books = Category.objects.get(name="Книги")
+        self.black, self.white, self.expensive, self.other_category = (
+            self.create_announcement(f"{title} {text}", price, category)
+            for title, price, category in (
+                ("Чёрный", "30000", self.category),
+                ("Белый", "35000", self.category),
+                ("Синий", "90000", self.category),
+                ("Зелёный", "30000", books),
+            )
+        )
+        self.pks = [self.black.pk, self.white.pk, self.expensive.pk, self.other_category.pk]
+        SimilarityReindex.objects.all().delete()
+
+    def create_announcement(self, title: str, price: str, category: Category) -> Announcement:
+        """Создаёт объявление с заданными заголовком, ценой и категорией."""
+
+        return Announcement.objects.create(
+            title=title,
+            description="Состояние отличное, без царапин",
+            price=Decimal(price),
+            condition="USED",
+            image="announcement_images/phone.png",
+            category=category,
+        )
+
+    def similar_to(self, announcement: Announcement) -> list:
+        """Возвращает ключи похожих объявлений по порядку."""
+
+        return list(get_similar(announcement.pk).values_list("pk", flat=True))
+
+    def test_candidates_share_category_and_close_price(self):
+        """Похожими считаются объявления той же категории с ценой в пределах
+        SIMILAR_PRICE_RATIO раз."""
+
+        index_announcements(self.pks)
+
+        results = compute_similar([self.black.pk])
+
+        self.assertEqual([pk for pk, _score in results[self.black.pk]], [self.white.pk])
+        self.assertGreater(results[self.black.pk][0][1], 0.5)
+
+    def test_refresh_updates_both_lists(self):
+        """Пересчёт объявления обновляет его список и списки его соседей."""
+
+        index_announcements(self.pks)
+        refresh_similar([self.black.pk])
+
+        self.assertEqual(self.similar_to(self.black), [self.white.pk])
+        self.assertEqual(self.similar_to(self.white), [self.black.pk])
+        self.assertEqual(self.similar_to(self.other_category), [])
+
+    def test_remove_excludes_from_index_and_lists(self):
+        """Удалённое из индекса объявление пропадает из всех списков."""
+
+        refresh_similar(self.pks)
+
+        remove_similar([self.white.pk])
+
+        self.assertEqual(self.similar_to(self.black), [])
+        self.assertEqual(self.similar_to(self.white), [])
+        self.assertFalse(AnnouncementSignature.objects.filter(pk=self.white.pk).exists())
+
+    def test_relevant_changes_are_queued(self):
+        """В очередь попадают новые объявления и изменения полей похожести, но не
+        остальные изменения."""
+
+        self.black.condition = "NEW"
+        self.black.save()
+        self.assertFalse(SimilarityReindex.objects.exists())
+
+        self.black.price = Decimal("31000")
+        self.black.save()
+        Announcement.objects.filter(pk=self.white.pk).delete()
+        created = self.create_announcement("Новое", "100", self.category)
+
+        self.assertEqual(
+            set(SimilarityReindex.objects.values_list("announcement_id", flat=True)),
+            {self.black.pk, self.white.pk, created.pk},
+        )
+
+    def test_worker_reindexes_queued_announcements(self):
+        """Обработчик очереди пересчитывает изменённые объявления, исключает
+        удалённые и очищает очередь."""
+
+        refresh_similar(self.pks)
+        Announcement.objects.filter(pk=self.white.pk).delete()
+        self.expensive.price = Decimal("35000")
+        self.expensive.save()
+
+        self.assertEqual(SimilarityReindexWorker().run_once(), 2)
+
+        self.assertEqual(self.similar_to(self.black), [self.expensive.pk])
+        self.assertFalse(SimilarityReindex.objects.exists())
+
+    def test_announcement_changed_during_reindex_stays_queued(self):
+        """Объявление, изменённое во время пересчёта, остаётся в очереди."""
+
+        queue_reindex([self.black.pk])
+
+        def change(pks):
+            queue_reindex([self.black.pk])
+
+        with mock.patch("apps.announcements.services.similar.reindex_similar", change):
+            SimilarityReindexWorker().run_once()
+
+        self.assertTrue(
+            SimilarityReindex.objects.filter(pk=self.black.pk, locked_until=None).exists()
+        )
+
+
+class HotFeedTests(AnnouncementTestCase):
+    """Лента свежих объявлений категории и массовое мягкое удаление."""
+
+    def setUp(self):
+        # Ленты всех категорий строятся SQL PostgreSQL (LATERAL), поэтому в тестах
+        # каждая лента читается отдельно, по первому обращению к категории.
+        self.feed = HotFeed(size=3, ttl=60)
+        self.feed._loaded = True
+        started = timezone.now() - timedelta(days=1)
+        Announcement.objects.update(created_at=started - timedelta(days=1))
+        self.pks = []
+        for number in range(4):
+            announcement = Announcement.objects.create(
+                title=f"Объявление {number}",
+                description="Описание",
+                price=Decimal("100"),
+                condition="NEW",
+                image="announcement_images/item.png",
+                category=self.category,
+            )
+            Announcement.objects.filter(pk=announcement.pk).update(
+                created_at=started + timedelta(hours=number)
+            )
+            self.pks.append(announcement.pk)
+
+    def test_feed_is_newest_first_and_bounded(self):
+        """Лента содержит `size` последних объявлений категории, от новых к старым."""
+
+        self.assertEqual(
+            self.feed.get_ids(self.category.pk), [self.pks[3], self.pks[2], self.pks[1]]
+        )
+
+    def test_add_and_discard(self):
+        """Новое объявление вытесняет самое старое; после удаления из заполненной
+        ленты она перечитывается из БД."""
+
+        self.feed.get_ids(self.category.pk)
+        newest = uuid.uuid4()
+        self.feed.add(self.category.pk, newest, timezone.now() + timedelta(hours=1))
+        self.assertEqual(
+            self.feed.get_ids(self.category.pk), [newest, self.pks[3], self.pks[2]]
+        )
+
+        self.feed.discard([newest])
+
+        self.assertEqual(
+            self.feed.get_ids(self.category.pk), [self.pks[3], self.pks[2], self.pks[1]]
+        )
+
+    def test_mass_soft_delete_notifies_in_batches(self):
+        """Массовое мягкое удаление изменяет и передаёт сигналу объекты частями."""
+
+        batches = []
+
+        def receiver(sender, pks, **kwargs):
+            batches.append(sorted(pks))
+
+        post_soft_delete.connect(receiver, sender=Announcement)
+        self.addCleanup(post_soft_delete.disconnect, receiver, sender=Announcement)
+
+        with mock.patch("apps.common.managers.SIGNAL_BATCH_SIZE", 2):
+            count = Announcement.objects.filter(pk__in=self.pks).delete()
+
+        self.assertEqual(count, 4)
+        self.assertEqual(batches, [sorted(self.pks)[:2], sorted(self.pks)[2:]])
+        self.assertFalse(Announcement.objects.filter(pk__in=self.pks).exists())
+
+
+class PriceHistoryTests(AnnouncementTestCase):
+    """Журнал изменений цены и выборка объявлений со сниженной ценой."""
+
+    def set_price(self, announcement, price, hours_ago=0):
+        """Сохраняет новую цену и сдвигает время записи истории на `hours_ago` часов."""
+
+        announcement.price = Decimal(price)
+        announcement.save()
+        entry = PriceHistory.objects.filter(announcement=announcement).latest("id")
+        PriceHistory.objects.filter(pk=entry.pk).update(
+            changed_at=timezone.now() - timedelta(hours=hours_ago)
+        )
+
+    def test_history_is_written_only_on_price_change(self):
+        """Создание и изменение цены записываются, сохранение без изменения цены — нет."""
+
+        announcement = Announcement.objects.get(pk=self.announcement.pk)
+        announcement.title = "Смартфон"
+        announcement.save()
+        announcement.price = Decimal("9.50")
+        announcement.save()
+
+        series = [
+            (entry.previous_price, entry.price) for entry in get_price_series(announcement.pk)
+        ]
+        self.assertEqual(series, [(None, Decimal("10.50")), (Decimal("10.50"), Decimal("9.50"))])
+
+    def test_price_drops(self):
+        """В выборку попадают объявления, подешевевшие за период, с ценой на его начало."""
+
+        PriceHistory.objects.update(changed_at=timezone.now() - timedelta(days=7))
+        announcement = Announcement.objects.get(pk=self.announcement.pk)
+        self.set_price(announcement, "9", hours_ago=3)
+        self.set_price(announcement, "8", hours_ago=1)
+
+        drops = list(get_price_drops(24))
+
+        self.assertEqual([drop.pk for drop in drops], [announcement.pk])
+        self.assertEqual(drops[0].old_price, Decimal("10.50"))
+
+        response = self.client.get("/announcements/price-drops/", {"hours": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(item["id"], item["old_price"]) for item in response.json()],
+            [(str(announcement.pk), "9.00")],
+        )
+
+    def test_outdated_and_recovered_prices_are_not_drops(self):
+        """Снижение до начала периода и цена, вернувшаяся к прежней, не учитываются."""
+
+        PriceHistory.objects.update(changed_at=timezone.now() - timedelta(days=7))
+        announcement = Announcement.objects.get(pk=self.announcement.pk)
+        self.set_price(announcement, "9", hours_ago=48)
+        laptop = Announcement.objects.exclude(pk=announcement.pk).get()
+        self.set_price(laptop, "1000", hours_ago=2)
+        self.set_price(laptop, "99999999.99", hours_ago=1)
+
+        self.assertFalse(get_price_drops(24).exists())
+
+
+class BulkAnnouncementTests(AnnouncementTestCase):
+    """Массовое изменение, удаление и восстановление объявлений продавца."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.books = Category.objects.get(name="Книги")
+        cls.tablet = Announcement.objects.create(
+            title="Планшет",
+            description="С чехлом",
+            price=Decimal("20"),
+            condition="USED",
+            image="announcement_images/tablet.png",
+            category=cls.category,
+            seller=cls.seller,
+        )
+        cls.laptop = Announcement.objects.get(seller=None)
+
+    def test_update_statuses(self):
+        """Результат возвращается по каждому элементу в порядке запроса."""
+
+        missing = uuid.uuid4()
+        items = [
+            {"id": str(self.announcement.pk), "price": "9.99", "category": str(self.books.pk)},
+            {"id": str(self.tablet.pk), "condition": "USED"},
+            {"id": str(self.laptop.pk), "price": "1"},
+            {"id": str(missing), "price": "1"},
+            {"id": str(self.tablet.pk), "category": str(uuid.uuid4())},
+            {"id": str(self.tablet.pk)},
+            {"id": "не-uuid", "price": "-1"},
+        ]
+
+        results = bulk_update_announcements(self.seller.pk, items)
+
+        self.assertEqual(
+            [(result["id"], result["status"]) for result in results],
+            [
+                (self.announcement.pk, "updated"),
+                (self.tablet.pk, "unchanged"),
+                (self.laptop.pk, "not_found"),
+                (missing, "not_found"),
+                (self.tablet.pk, "invalid"),
+                (str(self.tablet.pk), "invalid"),
+                ("не-uuid", "invalid"),
+            ],
+        )
+        self.assertEqual(set(results[-1]["errors"]), {"id", "price"})
+
+        announcement = Announcement.objects.get(pk=self.announcement.pk)
+        self.assertEqual(announcement.price, Decimal("9.99"))
+        self.assertEqual(announcement.category_id, self.books.pk)
+        self.assertEqual(
+            list(get_price_series(announcement.pk).values_list("previous_price", "price")),
+            [(None, Decimal("10.50")), (Decimal("10.50"), Decimal("9.99"))],
+        )
+        self.assertTrue(SimilarityReindex.objects.filter(pk=announcement.pk).exists())
+        self.assertEqual(Announcement.objects.get(pk=self.laptop.pk).price, self.laptop.price)
+
+    def test_delete_and_restore_statuses(self):
+        """Повторы идентификаторов схлопываются, а повторная операция ничего не меняет."""
+
+        missing = uuid.uuid4()
+        ids = [self.announcement.pk, self.announcement.pk, self.laptop.pk, missing]
+
+        results = bulk_delete_announcements(self.seller.pk, ids)
+
+        self.assertEqual(
+            [(result["id"], result["status"]) for result in results],
+            [
+                (self.announcement.pk, "deleted"),
+                (self.laptop.pk, "not_found"),
+                (missing, "not_found"),
+            ],
+        )
+        self.assertFalse(Announcement.objects.filter(pk=self.announcement.pk).exists())
+        self.assertTrue(Announcement.objects.filter(pk=self.laptop.pk).exists())
+
+        results = bulk_delete_announcements(self.seller.pk, [self.announcement.pk])
+        self.assertEqual(results, [{"id": self.announcement.pk, "status": "unchanged"}])
+
+        results = bulk_restore_announcements(
+            self.seller.pk, [self.announcement.pk, self.tablet.pk]
+        )
+        self.assertEqual(
+            results,
+            [
+                {"id": self.announcement.pk, "status": "restored"},
+                {"id": self.tablet.pk, "status": "unchanged"},
+            ],
+        )
+        self.assertTrue(Announcement.objects.filter(pk=self.announcement.pk).exists())
+
+
+class NearbyTests(AnnouncementTestCase):
+    """Поиск объявлений в радиусе от точки."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.books = Category.objects.get(name="Книги")
+        # Объявление «Телефон» получило координаты продавца (55.75, 37.61).
+        cls.places = {
+            "north": cls.create(55.759, 37.61, cls.category),
+            "east": cls.create(55.75, 37.69, cls.books),
+            "far": cls.create(55.95, 37.61, cls.category),
+            "west_of_meridian": cls.create(0, 179.995, cls.category),
+            "east_of_meridian": cls.create(0, -179.995, cls.category),
+        }
+
+    @classmethod
+    def create(cls, latitude: float, longitude: float, category: Category) -> Announcement:
+        """Создаёт объявление без продавца с заданными координатами."""
+
+        return Announcement.objects.create(
+            title="Объявление",
+            description="Описание",
+            price=Decimal("100"),
+            condition="USED",
+            image="announcement_images/item.png",
+            category=category,
+            latitude=latitude,
+            longitude=longitude,
+        )
+
+    def test_radius_and_ordering(self):
+        """В выборку попадают объявления внутри радиуса, от ближних к дальним."""
+
+        nearby = list(get_nearby(55.75, 37.61, 10, FacetFilters()))
+
+        self.assertEqual(
+            [announcement.pk for announcement in nearby],
+            [self.announcement.pk, self.places["north"].pk, self.places["east"].pk],
+        )
+        self.assertAlmostEqual(nearby[0].distance, 0, places=3)
+        self.assertAlmostEqual(nearby[1].distance, 1.0, delta=0.01)
+        self.assertAlmostEqual(nearby[2].distance, 5.0, delta=0.05)
+
+        self.assertEqual(
+            [announcement.pk for announcement in get_nearby(55.75, 37.61, 2, FacetFilters())],
+            [self.announcement.pk, self.places["north"].pk],
+        )
+
+    def test_search_across_antimeridian(self):
+        """Поиск рядом со 180-м меридианом находит объявления по обе его стороны."""
+
+        nearby = get_nearby(0, 179.999, 5, FacetFilters())
+
+        self.assertEqual(
+            [announcement.pk for announcement in nearby],
+            [self.places["west_of_meridian"].pk, self.places["east_of_meridian"].pk],
+        )
+
+    def test_view_filters_and_pages(self):
+        """Эндпоинт применяет фильтр категории и постраничный вывод."""
+
+        url = "/announcements/nearby/"
+        params = {"lat": 55.75, "lon": 37.61, "radius": 30}
+
+        response = self.client.get(url, {**params, "limit": 2, "offset": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item["id"] for item in response.json()],
+            [str(self.places["north"].pk), str(self.places["east"].pk)],
+        )
+
+        response = self.client.get(url, {**params, "category": self.category.slug})
+        self.assertEqual(
+            [item["id"] for item in response.json()],
+            [str(self.announcement.pk), str(self.places["north"].pk), str(self.places["far"].pk)],
+        )
+        self.assertIn("distance", response.json()[0])
+
+
+class ViewCounterTests(TestCase):
+    """Буфер просмотров не растёт больше `max_pending`."""
+
+    def setUp(self):
+        # Фоновый поток записи в тестах не запускается: запись вызывается явно.
+        patcher = mock.patch.object(popularity.ViewCounter, "_start")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.counter = popularity.ViewCounter(flush_interval=60, max_pending=3)
+
+    def test_views_over_limit_are_dropped(self):
+        """Просмотры сверх `max_pending` отбрасываются и попадают в лог при записи."""
+
+        pk = uuid.uuid4()
+        for _view in range(5):
+            self.counter.record(pk)
+
+        self.assertEqual(self.counter.pending(), 3)
+        with (
+            mock.patch.object(popularity, "write_views") as write_views,
+            self.assertLogs(popularity.logger, "WARNING") as logs,
+        ):
+            self.assertEqual(self.counter.flush(), 3)
+        write_views.assert_called_once()
+        self.assertIn("отброшено просмотров: 2", logs.output[0])
+        self.assertEqual(self.counter.pending(), 0)
+
+    def test_failed_write_returns_views_that_fit(self):
+        """Неудачно записанные просмотры возвращаются в буфер, если помещаются в него."""
+
+        self.counter.record(uuid.uuid4(), views=2)
+        with mock.patch.object(popularity, "write_views", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.counter.flush()
+
+        self.assertEqual(self.counter.pending(), 2)
+
+    def test_failed_write_does_not_overflow_buffer(self):
+        """Если за время неудачной записи буфер заполнился, её просмотры отбрасываются."""
+
+        def fail_after_new_views(counts, viewed_at):
+            self.counter.record(uuid.uuid4(), views=2)
+            raise RuntimeError
+
+        self.counter.record(uuid.uuid4(), views=2)
+        with mock.patch.object(popularity, "write_views", side_effect=fail_after_new_views):
+            with self.assertRaises(RuntimeError):
+                self.counter.flush()
+
+        self.assertEqual(self.counter.pending(), 2)
+        with (
+            mock.patch.object(popularity, "write_views"),
+            self.assertLogs(popularity.logger, "WARNING") as logs,
+        ):
+            self.counter.flush()
+        self.assertIn("отброшено просмотров: 2", logs.output[0])
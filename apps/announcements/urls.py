@@ -0,0 +1,68 @@
+from django.urls import path
+
+from apps.announcements.views import (
+    AnnouncementDetailAPIView,
+    AnnouncementPriceHistoryAPIView,
+    AnnouncementSearchAPIView,
+    CategoryFeedAPIView,
+    CategoryListAPIView,
+    NearbyAnnouncementsAPIView,
+    PopularAnnouncementsAPIView,
+    PriceDropsAPIView,
+    SellerAnnouncementBulkDeleteAPIView,
+    SellerAnnouncementBulkRestoreAPIView,
+    SellerAnnouncementBulkUpdateAPIView,
+    SellerAnnouncementDetailAPIView,
+    SellerAnnouncementListAPIView,
+    SimilarAnnouncementsAPIView,
+)
+
+
+urlpatterns = [
+    path("", AnnouncementSearchAPIView.as_view(), name="announcement_search"),
+    path("categories/", CategoryListAPIView.as_view(), name="category_list"),
+    path(
+        "categories/<str:slug>/feed/",
+        CategoryFeedAPIView.as_view(),
+        name="category_feed",
+    ),
+    path(
+        "categories/<str:slug>/popular/",
+        PopularAnnouncementsAPIView.as_view(),
+        name="category_popular",
+    ),
+    path("nearby/", NearbyAnnouncementsAPIView.as_view(), name="announcement_nearby"),
+    path("price-drops/", PriceDropsAPIView.as_view(), name="price_drops"),
+    path("mine/", SellerAnnouncementListAPIView.as_view(), name="seller_announcements"),
+    path(
+        "mine/bulk/",
+        SellerAnnouncementBulkUpdateAPIView.as_view(),
+        name="seller_announcements_bulk_update",
+    ),
+    path(
+        "mine/bulk/delete/",
+        SellerAnnouncementBulkDeleteAPIView.as_view(),
+        name="seller_announcements_bulk_delete",
+    ),
+    path(
+        "mine/bulk/restore/",
+        SellerAnnouncementBulkRestoreAPIView.as_view(),
+        name="seller_announcements_bulk_restore",
+    ),
+    path(
+        "mine/<uuid:pk>/",
+        SellerAnnouncementDetailAPIView.as_view(),
+        name="seller_announcement_detail",
+    ),
+    path("<uuid:pk>/", AnnouncementDetailAPIView.as_view(), name="announcement_detail"),
+    path(
+        "<uuid:pk>/similar/",
+        SimilarAnnouncementsAPIView.as_view(),
+        name="announcement_similar",
+    ),
+    path(
+        "<uuid:pk>/prices/",
+        AnnouncementPriceHistoryAPIView.as_view(),
+        name="announcement_prices",
+    ),
+]
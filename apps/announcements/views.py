@@ -1,3 +1,391 @@
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404
+from rest_framework import permissions, serializers, status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from apps.announcements.models import CONDITION_TYPE_CHOICES, Announcement, Category
+from apps.announcements.serializers import (
+    AnnouncementIdsSerializer,
+    AnnouncementSerializer,
+    PriceHistorySerializer,
+    SellerAnnouncementSerializer,
+    announcement_reader,
+    category_reader,
+    nearby_announcement_reader,
+    price_drop_reader,
+)
+from apps.announcements.services.bulk import (
+    bulk_delete_announcements,
+    bulk_restore_announcements,
+    bulk_update_announcements,
+)
+from apps.announcements.services.facets import (
+    PRICE_BUCKETS,
+    FacetFilters,
+    category_id_by_slug,
+    facet_counts,
+    filter_announcements,
+    get_summary,
+)
+from apps.announcements.services.feed import hot_feed
+from apps.announcements.services.nearby import get_nearby
+from apps.announcements.services.popularity import get_popular, view_counter
+from apps.announcements.services.prices import get_price_drops, get_price_series
+from apps.announcements.services.similar import get_similar
+from apps.common.services.idempotency import idempotent
+from apps.sellers.permissions import IsSeller
+
+
+class AnnouncementSearchParamsSerializer(serializers.Serializer):
+    """Параметры фасетного поиска объявлений."""
+
+    category = serializers.CharField(required=False)
+    condition = serializers.ChoiceField(choices=CONDITION_TYPE_CHOICES, required=False)
+    price = serializers.ChoiceField(
+        choices=[key for key, _low, _high in PRICE_BUCKETS], required=False
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+    offset = serializers.IntegerField(min_value=0, default=0)
+
+
+class AnnouncementSearchAPIView(APIView):
+    """Эндпоинт фасетного поиска объявлений.
+    Фильтрует объявления по категории (slug), состоянию и ценовому диапазону и
+    возвращает страницу результатов вместе с количеством объявлений для каждого
+    значения фасетов. Количества берутся из закэшированной сводки, поэтому при
+    тёплом кэше запрос выполняет одно обращение к кэшу (сводка и её версия) и одно
+    обращение к БД — за страницей результатов."""
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request: Request) -> Response:
+        """Возвращает страницу объявлений и количества по фасетам."""
+
+        params = AnnouncementSearchParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        summary = get_summary()
+        category_id = None
+        if "category" in data:
+            category_id = category_id_by_slug(summary, data["category"])
+            if category_id is None:
+                # В сводке нет категорий без объявлений.
+                category_id = get_object_or_404(
+                    Category.objects.only("id"), slug=data["category"]
+                ).id
+
+        filters = FacetFilters(
+            category=category_id,
+            condition=data.get("condition"),
+            price=data.get("price"),
+        )
+        counts = facet_counts(summary, filters)
+        page = filter_announcements(filters)[data["offset"] : data["offset"] + data["limit"]]
+        results = announcement_reader.serialize(page, context={"request": request})
+        return Response({**counts, "results": results})
+
+
+class NearbyParamsSerializer(serializers.Serializer):
+    """Параметры поиска объявлений рядом."""
+
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lon = serializers.FloatField(min_value=-180, max_value=180)
+    radius = serializers.FloatField(min_value=0.1, max_value=500, default=10)
+    category = serializers.CharField(required=False)
+    condition = serializers.ChoiceField(choices=CONDITION_TYPE_CHOICES, required=False)
+    price = serializers.ChoiceField(
+        choices=[key for key, _low, _high in PRICE_BUCKETS], required=False
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+    offset = serializers.IntegerField(min_value=0, default=0)
+
+
+class NearbyAnnouncementsAPIView(APIView):
+    """Эндпоинт поиска объявлений в радиусе N км от точки, от ближних к дальним.
+    Поддерживает те же фильтры, что и фасетный поиск: категорию, состояние и
+    ценовой диапазон."""
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request: Request) -> Response:
+        """Возвращает страницу объявлений рядом с точкой с расстоянием до неё."""
+
+        params = NearbyParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        category_id = None
+        if "category" in data:
+            category_id = get_object_or_404(
+                Category.objects.only("id"), slug=data["category"]
+            ).id
+        filters = FacetFilters(
+            category=category_id,
+            condition=data.get("condition"),
+            price=data.get("price"),
+        )
+        announcements = get_nearby(data["lat"], data["lon"], data["radius"], filters)
+        page = announcements[data["offset"] : data["offset"] + data["limit"]]
+        return Response(nearby_announcement_reader.serialize(page, context={"request": request}))
+
+
+class CategoryListAPIView(APIView):
+    """Эндпоинт списка категорий объявлений для навигации по каталогу."""
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request: Request) -> Response:
+        """Возвращает все категории в алфавитном порядке."""
+
+        categories = Category.objects.order_by("name")
+        return Response(category_reader.serialize(categories, context={"request": request}))
+
+
+class CategoryFeedAPIView(APIView):
+    """Эндпоинт ленты свежих объявлений категории для главной страницы.
+    Порядок объявлений берётся из ленты в памяти процесса, поэтому из БД
+    объявления читаются по первичному ключу, без сортировки."""
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request: Request, slug: str) -> Response:
+        """Возвращает последние объявления категории, от новых к старым."""
+
+        category = get_object_or_404(Category.objects.only("id"), slug=slug)
+        ids = hot_feed.get_ids(category.id)
+        announcements = announcement_reader.serialize(
+            Announcement.objects.filter(pk__in=ids).order_by(), context={"request": request}
+        )
+        by_id = {item["id"]: item for item in announcements}
+        return Response([by_id[str(pk)] for pk in ids if str(pk) in by_id])
+
+
+class AnnouncementDetailAPIView(APIView):
+    """Эндпоинт карточки объявления.
+    Каждый запрос учитывается как просмотр; просмотры копятся в памяти процесса
+    и записываются в БД пачками, поэтому счётчик в ответе может отставать на
+    несколько секунд."""
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request: Request, pk) -> Response:
+        """Возвращает объявление и учитывает его просмотр."""
+
+        announcement = get_object_or_404(Announcement, pk=pk)
+        view_counter.record(announcement.pk)
+        serializer = AnnouncementSerializer(announcement, context={"request": request})
+        return Response(serializer.data)
+
+
+class PopularParamsSerializer(serializers.Serializer):
+    """Параметры выборки популярных объявлений."""
+
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class PopularAnnouncementsAPIView(APIView):
+    """Эндпоинт популярных объявлений категории.
+    Популярность учитывает просмотры с затуханием: вклад просмотра уменьшается
+    вдвое за POPULARITY_HALF_LIFE секунд."""
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request: Request, slug: str) -> Response:
+        """Возвращает самые популярные объявления категории."""
+
+        params = PopularParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        category = get_object_or_404(Category.objects.only("id"), slug=slug)
+        announcements = get_popular(category.id)[: params.validated_data["limit"]]
+        return Response(announcement_reader.serialize(announcements, context={"request": request}))
+
+
+class SimilarAnnouncementsAPIView(APIView):
+    """Эндпоинт блока «Похожие объявления» на странице объявления.
+    Похожие объявления рассчитываются заранее, при изменении объявлений, поэтому
+    запрос только читает готовый список."""
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request: Request, pk) -> Response:
+        """Возвращает объявления, похожие на данное, от самых похожих."""
+
+        params = PopularParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        get_object_or_404(Announcement.objects.only("id"), pk=pk)
+        announcements = get_similar(pk)[: params.validated_data["limit"]]
+        return Response(announcement_reader.serialize(announcements, context={"request": request}))
+
+
+class AnnouncementPriceHistoryAPIView(APIView):
+    """Эндпоинт истории цены объявления для графика и отметки «цена изменилась»."""
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request: Request, pk) -> Response:
+        """Возвращает изменения цены объявления, от старых к новым."""
+
+        get_object_or_404(Announcement.objects.only("id"), pk=pk)
+        serializer = PriceHistorySerializer(get_price_series(pk), many=True)
+        return Response(serializer.data)
+
+
+class PriceDropsParamsSerializer(serializers.Serializer):
+    """Параметры выборки объявлений со сниженной ценой."""
+
+    hours = serializers.IntegerField(min_value=1, max_value=24 * 30, default=24)
+    limit = serializers.IntegerField(min_value=1, max_value=500, default=100)
+    offset = serializers.IntegerField(min_value=0, default=0)
+
+
+class PriceDropsAPIView(APIView):
+    """Эндпоинт объявлений, цена которых снизилась за последние N часов.
+    Используется для уведомлений о снижении цены."""
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request: Request) -> Response:
+        """Возвращает объявления со сниженной ценой, от новых изменений к старым."""
+
+        params = PriceDropsParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        announcements = get_price_drops(data["hours"]).order_by("-updated_at", "pk")
+        page = announcements[data["offset"] : data["offset"] + data["limit"]]
+        return Response(price_drop_reader.serialize(page, context={"request": request}))
+
+
+class SellerAnnouncementsParamsSerializer(serializers.Serializer):
+    """Параметры страницы объявлений продавца."""
+
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+    offset = serializers.IntegerField(min_value=0, default=0)
+
+
+class SellerAnnouncementListAPIView(APIView):
+    """Эндпоинт объявлений текущего продавца: список и создание."""
+
+    permission_classes = [permissions.IsAuthenticated, IsSeller]
+
+    def get(self, request: Request) -> Response:
+        """Возвращает страницу объявлений продавца, от новых к старым."""
+
+        params = SellerAnnouncementsParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        announcements = Announcement.objects.filter(seller_id=request.seller.pk).order_by(
+            "-created_at", "-id"
+        )
+        page = announcements[data["offset"] : data["offset"] + data["limit"]]
+        serializer = SellerAnnouncementSerializer(page, many=True, context={"request": request})
+        return Response(serializer.data)
+
+    @idempotent
+    def post(self, request: Request) -> Response:
+        """Создаёт объявление от имени продавца."""
+
+        serializer = SellerAnnouncementSerializer(data=request.data, context={"request": request})
+        serializer.is_valid(raise_exception=True)
+        serializer.save(seller_id=request.seller.pk)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class SellerAnnouncementDetailAPIView(APIView):
+    """Эндпоинт объявления текущего продавца: просмотр, изменение и удаление.
+    Объявления других продавцов для него не существуют и дают 404."""
+
+    permission_classes = [permissions.IsAuthenticated, IsSeller]
+
+    def get_object(self, request: Request, pk) -> Announcement:
+        """Возвращает объявление продавца или выбрасывает Http404."""
+
+        return get_object_or_404(Announcement, pk=pk, seller_id=request.seller.pk)
+
+    def get(self, request: Request, pk) -> Response:
+        """Возвращает объявление продавца."""
+
+        serializer = SellerAnnouncementSerializer(
+            self.get_object(request, pk), context={"request": request}
+        )
+        return Response(serializer.data)
+
+    def patch(self, request: Request, pk) -> Response:
+        """Частично изменяет объявление продавца."""
+
+        serializer = SellerAnnouncementSerializer(
+            self.get_object(request, pk),
+            data=request.data,
+            partial=True,
+            context={"request": request},
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+    def delete(self, request: Request, pk) -> Response:
+        """Помечает объявление продавца удалённым."""
+
+        bulk_delete_announcements(request.seller.pk, [self.get_object(request, pk).pk])
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class AnnouncementBulkUpdateSerializer(serializers.Serializer):
+    """Тело запроса массового изменения: список изменений объявлений.
+    Элементы валидируются сервисом по отдельности, чтобы ошибка в одном элементе
+    не отменяла остальные."""
+
+    items = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=5000
+    )
+
+
+class SellerAnnouncementBulkUpdateAPIView(APIView):
+    """Эндпоинт массового изменения цены, состояния и категории объявлений продавца.
+    Возвращает результат по каждому элементу в порядке запроса."""
+
+    permission_classes = [permissions.IsAuthenticated, IsSeller]
+
+    @idempotent
+    def patch(self, request: Request) -> Response:
+        """Применяет изменения и возвращает статус каждого элемента."""
+
+        serializer = AnnouncementBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = bulk_update_announcements(request.seller.pk, serializer.validated_data["items"])
+        return Response({"results": results})
+
+
+class SellerAnnouncementBulkDeleteAPIView(APIView):
+    """Эндпоинт массового удаления объявлений продавца."""
+
+    permission_classes = [permissions.IsAuthenticated, IsSeller]
+
+    @idempotent
+    def post(self, request: Request) -> Response:
+        """Помечает объявления удалёнными и возвращает статус каждого."""
+
+        serializer = AnnouncementIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = bulk_delete_announcements(request.seller.pk, serializer.validated_data["ids"])
+        return Response({"results": results})
+
+
+class SellerAnnouncementBulkRestoreAPIView(APIView):
+    """Эндпоинт массового восстановления удалённых объявлений продавца."""
+
+    permission_classes = [permissions.IsAuthenticated, IsSeller]
+
+    @idempotent
+    def post(self, request: Request) -> Response:
+        """Восстанавливает объявления и возвращает статус каждого."""
+
+        serializer = AnnouncementIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = bulk_restore_announcements(request.seller.pk, serializer.validated_data["ids"])
+        return Response({"results": results})
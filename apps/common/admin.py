@@ -1,3 +1,106 @@
+import uuid
+
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.db.models import QuerySet
+from django.http import HttpRequest
+
+from apps.common.services.pagination import (
+    EstimatedCountPaginator,
+    decode_keyset_cursor,
+    encode_cursor,
+    estimate_count,
+    keyset_filter,
+)
+
+
+CURSOR_VAR = "cursor"
+
+
+class CursorChangeList(ChangeList):
+    """Список объектов в админке с постраничной навигацией по курсору.
+    Страница выбирается условием по ключу сортировки последней строки предыдущей
+    страницы, а не через OFFSET, поэтому открытие дальних страниц не замедляется.
+    Количество объектов оценивается без COUNT(*). Редактирование в списке
+    (`list_editable`) не поддерживается: строки страницы — список, а не queryset."""
+
+    def get_results(self, request: HttpRequest):
+        """Загружает страницу объектов после курсора из запроса."""
+
+        ordering = list(self.model_admin.cursor_ordering)
+        queryset = self.queryset.order_by(*ordering)
+        cursor = getattr(request, "admin_cursor", None)
+        if cursor:
+            try:
+                values = decode_keyset_cursor(cursor, self.model, ordering)
+                queryset = queryset.filter(keyset_filter(ordering, values))
+            except ValueError:
+                cursor = None
+
+        rows = list(queryset[: self.list_per_page + 1])
+        has_next = len(rows) > self.list_per_page
+        rows = rows[: self.list_per_page]
+
+        self.next_url = None
+        if has_next:
+            last = rows[-1]
+            values = [getattr(last, name.removeprefix("-")) for name in ordering]
+            self.next_url = self.get_query_string({CURSOR_VAR: encode_cursor(values)})
+        self.first_url = self.get_query_string() if cursor else None
+
+        self.result_count = estimate_count(self.queryset)
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.full_result_count = None
+        self.result_list = rows
+        self.can_show_all = False
+        self.multi_page = has_next or bool(cursor)
+        self.paginator = self.model_admin.get_paginator(
+            request, self.queryset, self.list_per_page
+        )
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Базовая админка для таблиц с миллионами строк.
+    Список открывается по курсору (`cursor_ordering` должен совпадать с индексом),
+    количество строк оценивается по статистике PostgreSQL, сортировка по колонкам
+    и подсчёт фасетов отключены. Поиск выполняется только по индексируемым
+    условиям: строка, похожая на UUID, ищется по первичному ключу, остальные —
+    по `search_fields`, где должны быть указаны lookups, использующие индекс
+    (`exact`, `startswith`)."""
+
+    cursor_ordering: tuple[str, ...] = ("-created_at", "-id")
+    change_list_template = "admin/cursor_change_list.html"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+    sortable_by = ()
+
+    def get_ordering(self, request: HttpRequest) -> tuple[str, ...]:
+        """Возвращает сортировку по ключу курсора (используется и автодополнением)."""
+
+        return self.cursor_ordering
+
+    def get_changelist(self, request: HttpRequest, **kwargs) -> type[ChangeList]:
+        """Возвращает класс списка с навигацией по курсору."""
+
+        return CursorChangeList
+
+    def changelist_view(self, request: HttpRequest, extra_context: dict | None = None):
+        """Извлекает курсор из параметров запроса, чтобы список не принял его за фильтр."""
+
+        if CURSOR_VAR in request.GET:
+            request.GET = request.GET.copy()
+            request.admin_cursor = request.GET.pop(CURSOR_VAR)[-1]
+        return super().changelist_view(request, extra_context)
+
+    def get_search_results(
+        self, request: HttpRequest, queryset: QuerySet, search_term: str
+    ) -> tuple[QuerySet, bool]:
+        """Ищет по первичному ключу, если строка поиска — UUID, иначе по `search_fields`."""
 
-# Register your models here.
+        try:
+            pk = uuid.UUID(search_term.strip())
+        except ValueError:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(pk=pk), False
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class CommonConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.common"
+
+    def ready(self):
+        """Регистрирует системные проверки приложения и включает запись событий outbox."""
+
+        from django.conf import settings
+
+        from apps.common import checks  # noqa: F401
+        from apps.common.services.outbox import track_models
+
+        track_models(settings.OUTBOX_MODELS)
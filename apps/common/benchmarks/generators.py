@@ -0,0 +1,174 @@
+import random
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import models, transaction
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.announcements.models import Announcement, Category
+from apps.sellers.models import Seller
+
+
+BENCHMARK_PREFIX = "bench-"
+BENCHMARK_PASSWORD = "bench-Password-2024"
+BATCH_SIZE = 1000
+
+WORDS = (
+    "телефон", "ноутбук", "велосипед", "диван", "куртка", "кроссовки", "часы",
+    "камера", "гитара", "стол", "кресло", "холодильник", "планшет", "наушники",
+    "коляска", "палатка", "самокат", "принтер", "монитор", "чайник",
+)
+ADJECTIVES = (
+    "новый", "почти новый", "б/у", "отличный", "редкий", "компактный",
+    "мощный", "лёгкий", "классический", "детский",
+)
+
+
+@contextmanager
+def preserve_values(model: type[models.Model], *field_names: str) -> Iterator[None]:
+    """Временно отключает вычисление значений полей в `pre_save`.
+    `bulk_create` вызывает `pre_save` каждого поля, поэтому AutoSlugField делает
+    запрос на проверку уникальности для каждой строки, а `auto_now_add`
+    перезаписывает дату создания. Генератор данных сам задаёт уникальные slug
+    и распределённые во времени даты, поэтому значения берутся из объектов как есть."""
+
+    fields = [model._meta.get_field(name) for name in field_names]
+    for field in fields:
+        field.pre_save = lambda instance, add, field=field: getattr(instance, field.attname)
+    try:
+        yield
+    finally:
+        for field in fields:
+            del field.pre_save
+
+
+class BenchmarkDataGenerator:
+    """Генератор реалистичных объёмов данных для нагрузочного тестирования.
+    Все объекты создаются через `bulk_create` пакетами по `BATCH_SIZE` строк.
+    Email пользователей и названия категорий начинаются с `BENCHMARK_PREFIX`,
+    что позволяет удалить сгенерированные данные командой `clear()`."""
+
+    def __init__(self, seed: int = 0, days: int = 90):
+        self.random = random.Random(seed)
+        self.days = days
+        self.now = timezone.now()
+        self.run_id = f"{seed}{self.random.randrange(16**6):06x}"
+
+    def random_created_at(self):
+        """Возвращает случайную дату создания в пределах последних `days` дней."""
+
+        return self.now - timedelta(seconds=self.random.randrange(self.days * 24 * 60 * 60))
+
+    def create_users(self, count: int, sellers_share: float = 0.2) -> list[User]:
+        """Создаёт пользователей с общим паролем `BENCHMARK_PASSWORD`.
+        Пароль хешируется один раз, а не для каждого пользователя."""
+
+        password = make_password(BENCHMARK_PASSWORD)
+        users = [
+            User(
+                email=f"{BENCHMARK_PREFIX}{self.run_id}-{i}@example.com",
+                first_name="Бенчмарк",
+                last_name=f"Пользователь {i}",
+                password=password,
+                account_type="SELLER" if self.random.random() < sellers_share else "BUYER",
+            )
+            for i in range(count)
+        ]
+        return User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+
+    def create_sellers(self, users: list[User]) -> list[Seller]:
+        """Создаёт профили продавцов для пользователей с типом учётной записи SELLER."""
+
+        sellers = [
+            Seller(
+                user=user,
+                company_name=f"Компания {self.run_id}-{i}" if i % 3 else "",
+                name=f"Продавец {i}",
+                slug=f"{BENCHMARK_PREFIX}{self.run_id}-seller-{i}",
+                phone_number=f"+7912{i % 10_000_000:07d}",
+                is_approved=self.random.random() < 0.7,
+            )
+            for i, user in enumerate(u for u in users if u.account_type == "SELLER")
+        ]
+        with preserve_values(Seller, "slug"):
+            return Seller.objects.bulk_create(sellers, batch_size=BATCH_SIZE)
+
+    def create_categories(self, count: int) -> list[Category]:
+        """Создаёт категории объявлений."""
+
+        categories = [
+            Category(
+                name=f"{BENCHMARK_PREFIX}{self.run_id} категория {i}",
+                slug=f"{BENCHMARK_PREFIX}{self.run_id}-category-{i}",
+                image="category_images/benchmark.jpg",
+            )
+            for i in range(count)
+        ]
+        with preserve_values(Category, "slug"):
+            return Category.objects.bulk_create(categories, batch_size=BATCH_SIZE)
+
+    def create_announcements(
+        self, count: int, categories: list[Category], sellers: list[Seller]
+    ) -> int:
+        """Создаёт объявления пакетами, не удерживая их все в памяти.
+        Категории распределены неравномерно (по закону Ципфа), как в реальном каталоге."""
+
+        weights = [1 / (rank + 1) for rank in range(len(categories))]
+        created = 0
+        with preserve_values(Announcement, "slug", "created_at"):
+            while created < count:
+                size = min(BATCH_SIZE, count - created)
+                batch = []
+                for i in range(created, created + size):
+                    title = (
+                        f"{self.random.choice(ADJECTIVES)} {self.random.choice(WORDS)}".capitalize()
+                    )
+                    batch.append(
+                        Announcement(
+                            title=title,
+                            slug=f"{BENCHMARK_PREFIX}{self.run_id}-announcement-{i}",
+                            description=f"{title}. " * self.random.randint(3, 30),
+                            price=Decimal(self.random.randint(100, 500_000)),
+                            category=self.random.choices(categories, weights)[0],
+                            seller=self.random.choice(sellers) if sellers else None,
+                            condition=self.random.choice(("NEW", "USED")),
+                            image="announcement_images/benchmark.jpg",
+                            created_at=self.random_created_at(),
+                        )
+                    )
+                with transaction.atomic():
+                    Announcement.objects.bulk_create(batch)
+                created += size
+        return created
+
+    def generate(
+        self, users: int, categories: int, announcements: int, sellers_share: float = 0.2
+    ) -> dict[str, int]:
+        """Создаёт полный набор данных и возвращает количество созданных строк."""
+
+        created_users = self.create_users(users, sellers_share)
+        created_sellers = self.create_sellers(created_users)
+        created_categories = self.create_categories(categories)
+        created_announcements = self.create_announcements(
+            announcements, created_categories, created_sellers
+        )
+        return {
+            "users": len(created_users),
+            "sellers": len(created_sellers),
+            "categories": len(created_categories),
+            "announcements": created_announcements,
+        }
+
+    @staticmethod
+    def clear() -> dict[str, int]:
+        """Удаляет все данные, созданные генератором и сценариями регистрации."""
+
+        _count, categories = Category.objects.filter(
+            name__startswith=BENCHMARK_PREFIX
+        ).delete()
+        _count, users = User.objects.filter(email__startswith=BENCHMARK_PREFIX).delete()
+        return {**categories, **users}
@@ -0,0 +1,118 @@
+import statistics
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.db import connections
+from django.test import Client
+
+from apps.common.benchmarks.scenarios import HttpClient, ScenarioContext
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+    """Обработчик запросов встроенного сервера без журнала каждого запроса."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def in_process_server() -> Iterator[str]:
+    """Запускает WSGI-сервер проекта в отдельном потоке на свободном порту.
+    Возвращает базовый URL сервера."""
+
+    server = ThreadedWSGIServer(("127.0.0.1", 0), QuietWSGIRequestHandler)
+    server.set_app(WSGIHandler())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def summarize(latencies: list[float], errors: int, duration: float) -> dict:
+    """Считает перцентили задержки (мс) и пропускную способность (запросов в секунду)."""
+
+    ms = sorted(latency * 1000 for latency in latencies)
+    if len(ms) > 1:
+        quantiles = statistics.quantiles(ms, n=100, method="inclusive")
+        p50, p95, p99 = quantiles[49], quantiles[94], quantiles[98]
+    else:
+        p50 = p95 = p99 = ms[0] if ms else 0.0
+    return {
+        "requests": len(ms),
+        "errors": errors,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(ms) / duration, 2) if duration else 0.0,
+        "latency_ms": {
+            "p50": round(p50, 3),
+            "p95": round(p95, 3),
+            "p99": round(p99, 3),
+            "mean": round(statistics.fmean(ms), 3) if ms else 0.0,
+            "max": round(ms[-1], 3) if ms else 0.0,
+        },
+    }
+
+
+class BenchmarkRunner:
+    """Выполняет сценарий заданное число раз в несколько потоков и собирает метрики.
+    Каждый поток использует собственный клиент: `django.test.Client` для вызова
+    приложения в процессе без сети либо `HttpClient` для запросов к серверу."""
+
+    def __init__(self, base_url: str | None = None, concurrency: int = 1, warmup: int = 5):
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.warmup = warmup
+
+    def make_client(self) -> Client | HttpClient:
+        """Создаёт клиент для текущего потока."""
+
+        if self.base_url:
+            return HttpClient(self.base_url)
+        return Client()
+
+    def run(
+        self,
+        scenario: Callable[[Client | HttpClient, ScenarioContext], int],
+        context: ScenarioContext,
+        requests: int,
+    ) -> dict:
+        """Выполняет `requests` вызовов сценария и возвращает сводку метрик."""
+
+        per_worker = [
+            requests // self.concurrency + (i < requests % self.concurrency)
+            for i in range(self.concurrency)
+        ]
+
+        def worker(count: int) -> tuple[list[float], int, float, float]:
+            client = self.make_client()
+            latencies, errors = [], 0
+            try:
+                for _ in range(self.warmup):
+                    scenario(client, context)
+                window_start = time.perf_counter()
+                for _ in range(count):
+                    started = time.perf_counter()
+                    status_code = scenario(client, context)
+                    latencies.append(time.perf_counter() - started)
+                    errors += status_code >= 400
+                window_end = time.perf_counter()
+            finally:
+                connections.close_all()
+            return latencies, errors, window_start, window_end
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            results = list(executor.map(worker, per_worker))
+
+        # Прогрев не учитывается: длительность — от начала замеров в первом
+        # потоке до их окончания в последнем.
+        duration = max(r[3] for r in results) - min(r[2] for r in results)
+        latencies = [latency for r in results for latency in r[0]]
+        errors = sum(r[1] for r in results)
+        return summarize(latencies, errors, duration)
@@ -0,0 +1,184 @@
+import itertools
+import json
+import threading
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from urllib import error, request
+
+from django.test import Client
+
+from apps.announcements.models import Announcement, Category
+from apps.common.benchmarks.generators import BENCHMARK_PASSWORD, BENCHMARK_PREFIX
+
+
+class HttpClient:
+    """Минимальный HTTP-клиент для запросов к запущенному серверу.
+    Повторяет интерфейс `django.test.Client`, используемый сценариями."""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+
+    def post(self, path: str, data: dict, content_type: str = "application/json"):
+        """Отправляет POST-запрос и возвращает объект с кодом ответа и JSON-телом."""
+
+        req = request.Request(
+            f"{self.base_url}{path}",
+            data=json.dumps(data).encode(),
+            headers={"Content-Type": content_type},
+            method="POST",
+        )
+        try:
+            with request.urlopen(req) as response:
+                return HttpClientResponse(response.status, response.read())
+        except error.HTTPError as exc:
+            return HttpClientResponse(exc.code, exc.read())
+
+    def get(self, path: str):
+        """Отправляет GET-запрос и возвращает объект с кодом ответа и JSON-телом."""
+
+        try:
+            with request.urlopen(f"{self.base_url}{path}") as response:
+                return HttpClientResponse(response.status, response.read())
+        except error.HTTPError as exc:
+            return HttpClientResponse(exc.code, exc.read())
+
+
+@dataclass
+class HttpClientResponse:
+    """Ответ `HttpClient`."""
+
+    status_code: int
+    content: bytes
+
+    def json(self) -> dict:
+        """Возвращает тело ответа, разобранное как JSON."""
+
+        return json.loads(self.content)
+
+
+@dataclass
+class ScenarioContext:
+    """Данные, подготовленные для сценария до начала замеров."""
+
+    emails: list[str] = field(default_factory=list)
+    category_ids: list[uuid.UUID] = field(default_factory=list)
+    category_slugs: list[str] = field(default_factory=list)
+    counter: itertools.count = field(default_factory=itertools.count)
+    local: threading.local = field(default_factory=threading.local)
+
+    def next_email(self) -> str:
+        """Возвращает email очередного существующего пользователя (по кругу)."""
+
+        return self.emails[next(self.counter) % len(self.emails)]
+
+    def next_category(self) -> uuid.UUID:
+        """Возвращает очередную категорию (по кругу)."""
+
+        return self.category_ids[next(self.counter) % len(self.category_ids)]
+
+    def next_category_slug(self) -> str:
+        """Возвращает slug очередной категории (по кругу)."""
+
+        return self.category_slugs[next(self.counter) % len(self.category_slugs)]
+
+
+def prepare_context() -> ScenarioContext:
+    """Загружает идентификаторы сгенерированных пользователей и категорий."""
+
+    from apps.accounts.models import User
+
+    categories = list(
+        Category.objects.filter(name__startswith=BENCHMARK_PREFIX).values_list("id", "slug")
+    )
+    return ScenarioContext(
+        emails=list(
+            User.objects.filter(
+                email__startswith=BENCHMARK_PREFIX, first_name="Бенчмарк"
+            ).values_list("email", flat=True)[:1000]
+        ),
+        category_ids=[pk for pk, _slug in categories],
+        category_slugs=[slug for _pk, slug in categories],
+    )
+
+
+def registration(client: Client, context: ScenarioContext) -> int:
+    """Регистрация нового пользователя: POST /auth/."""
+
+    email = f"{BENCHMARK_PREFIX}reg-{uuid.uuid4().hex}@example.com"
+    response = client.post(
+        "/auth/",
+        {"email": email, "password": BENCHMARK_PASSWORD, "confirm_password": BENCHMARK_PASSWORD},
+        content_type="application/json",
+    )
+    return response.status_code
+
+
+def login(client: Client, context: ScenarioContext) -> int:
+    """Получение пары JWT-токенов: POST /auth/token/."""
+
+    response = client.post(
+        "/auth/token/",
+        {"email": context.next_email(), "password": BENCHMARK_PASSWORD},
+        content_type="application/json",
+    )
+    return response.status_code
+
+
+def refresh(client: Client, context: ScenarioContext) -> int:
+    """Обновление access-токена: POST /auth/token/refresh/.
+    Refresh-токены ротируются, поэтому каждый поток хранит свой последний токен."""
+
+    token = getattr(context.local, "refresh", None)
+    if token is None:
+        response = client.post(
+            "/auth/token/",
+            {"email": context.next_email(), "password": BENCHMARK_PASSWORD},
+            content_type="application/json",
+        )
+        token = response.json()["refresh"]
+
+    response = client.post(
+        "/auth/token/refresh/", {"refresh": token}, content_type="application/json"
+    )
+    if response.status_code == 200:
+        context.local.refresh = response.json().get("refresh", token)
+    return response.status_code
+
+
+def catalog(client: Client, context: ScenarioContext) -> int:
+    """Чтение каталога: 20 последних объявлений категории с продавцом и категорией.
+    Выполняется запросом к БД в процессе, так как HTTP-эндпоинта каталога ещё нет."""
+
+    list(
+        Announcement.objects.filter(category_id=context.next_category())
+        .select_related("seller", "category")
+        .order_by("-created_at")[:20]
+    )
+    return 200
+
+
+def feed(client: Client, context: ScenarioContext) -> int:
+    """Лента свежих объявлений категории: GET /announcements/categories/<slug>/feed/."""
+
+    response = client.get(f"/announcements/categories/{context.next_category_slug()}/feed/")
+    return response.status_code
+
+
+def search(client: Client, context: ScenarioContext) -> int:
+    """Страница каталога из 100 объявлений: GET /announcements/?category=<slug>&limit=100."""
+
+    response = client.get(
+        f"/announcements/?category={context.next_category_slug()}&limit=100"
+    )
+    return response.status_code
+
+
+SCENARIOS: dict[str, Callable[[Client, ScenarioContext], int]] = {
+    "registration": registration,
+    "login": login,
+    "refresh": refresh,
+    "catalog": catalog,
+    "feed": feed,
+    "search": search,
+}
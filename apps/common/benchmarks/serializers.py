@@ -0,0 +1,100 @@
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from django.db.models import QuerySet
+from django.test import RequestFactory
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from apps.announcements.models import Announcement, Category
+from apps.announcements.serializers import (
+    AnnouncementSerializer,
+    CategorySerializer,
+    announcement_reader,
+    category_reader,
+)
+from apps.common.benchmarks.runner import summarize
+from apps.common.renderers import FastJSONRenderer
+from apps.common.services.read_serializers import ReadSerializer
+from apps.sellers.serializers import SellerModerationSerializer, seller_moderation_reader
+from apps.sellers.services.moderation import moderation_queue
+
+
+@dataclass(frozen=True)
+class SerializerCase:
+    """Список объектов, сериализуемый DRF-сериализатором и быстрым сериализатором."""
+
+    serializer_class: type[serializers.ModelSerializer]
+    reader: ReadSerializer
+    get_queryset: Callable[[int], QuerySet]
+
+
+CASES = {
+    "announcements": SerializerCase(
+        AnnouncementSerializer,
+        announcement_reader,
+        lambda size: Announcement.objects.order_by("-created_at")[:size],
+    ),
+    "categories": SerializerCase(
+        CategorySerializer,
+        category_reader,
+        lambda size: Category.objects.order_by("name")[:size],
+    ),
+    "sellers": SerializerCase(
+        SellerModerationSerializer,
+        seller_moderation_reader,
+        lambda size: moderation_queue()[:size],
+    ),
+}
+
+
+def render_drf(case: SerializerCase, size: int, context: dict) -> bytes:
+    """Выполняет запрос и сериализацию так, как это делает DRF-эндпоинт."""
+
+    serializer = case.serializer_class(case.get_queryset(size), many=True, context=context)
+    return JSONRenderer().render(serializer.data)
+
+
+def render_fast(case: SerializerCase, size: int, context: dict) -> bytes:
+    """Выполняет запрос и сериализацию быстрым сериализатором."""
+
+    return FastJSONRenderer().render(case.reader.serialize(case.get_queryset(size), context))
+
+
+def measure(function: Callable[[], bytes], repeat: int, warmup: int) -> dict:
+    """Вызывает `function` `repeat` раз после прогрева и возвращает сводку задержек."""
+
+    for _ in range(warmup):
+        function()
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        call_started = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, 0, time.perf_counter() - started)
+
+
+def compare(name: str, size: int = 100, repeat: int = 200, warmup: int = 5) -> dict:
+    """Сравнивает DRF-сериализатор и быстрый сериализатор на списке из `size` объектов.
+    Время включает запрос к БД, сериализацию и кодирование в JSON. Перед замерами
+    проверяется, что оба способа дают одинаковый JSON."""
+
+    case = CASES[name]
+    context = {"request": Request(RequestFactory().get("/"))}
+    drf_output = render_drf(case, size, context)
+    fast_output = render_fast(case, size, context)
+
+    drf = measure(lambda: render_drf(case, size, context), repeat, warmup)
+    fast = measure(lambda: render_fast(case, size, context), repeat, warmup)
+    return {
+        "objects": len(case.reader.serialize(case.get_queryset(size), context)),
+        "identical": drf_output == fast_output,
+        "drf": drf,
+        "fast": fast,
+        "speedup": round(drf["latency_ms"]["mean"] / fast["latency_ms"]["mean"], 2)
+        if fast["latency_ms"]["mean"]
+        else None,
+    }
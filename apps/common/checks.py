@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+
+@register(deploy=True)
+def compiled_schema_check(app_configs, **kwargs) -> list[Error]:
+    """Проверяет, что предварительно сгенерированная OpenAPI-схема соответствует коду.
+    Выполняется только с `check --deploy` и только если включена отдача готовой схемы."""
+
+    if not settings.OPENAPI_SCHEMA_PRECOMPILED:
+        return []
+
+    from apps.common.services.schema import get_schema_path, is_schema_stale
+
+    if is_schema_stale():
+        return [
+            Error(
+                f"OpenAPI-схема {get_schema_path()} устарела или отсутствует.",
+                hint="Выполните `python manage.py build_schema`.",
+                id="common.E001",
+            )
+        ]
+    return []
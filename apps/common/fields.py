@@ -0,0 +1,127 @@
+from django.conf import settings
+from django.core import checks
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+def validate_international_phonenumber(value):
+    """Проверяет, что значение является корректным международным номером телефона.
+    Библиотека phonenumbers и её метаданные загружаются при первом вызове."""
+
+    from phonenumber_field.validators import (
+        validate_international_phonenumber as validate,
+    )
+
+    validate(value)
+
+
+class PhoneNumberDescriptor:
+    """Дескриптор атрибута модели, возвращающий номер телефона как объект PhoneNumber.
+    Строка, полученная из БД, разбирается только при первом обращении к атрибуту,
+    после чего результат разбора сохраняется в экземпляре модели."""
+
+    def __init__(self, field: "PhoneNumberField"):
+        self.field = field
+
+    def __get__(self, instance, owner):
+        """Возвращает значение поля, разбирая сохранённую строку при первом обращении."""
+
+        if instance is None:
+            return self
+
+        if self.field.name not in instance.__dict__:
+            instance.refresh_from_db(fields=[self.field.name])
+        value = instance.__dict__[self.field.name]
+        if isinstance(value, str) and value:
+            value = instance.__dict__[self.field.name] = self.field.to_python(value)
+        return value
+
+    def __set__(self, instance, value):
+        """Сохраняет значение; строки разбираются отложенно при чтении атрибута."""
+
+        if not isinstance(value, str):
+            value = self.field.to_python(value)
+        instance.__dict__[self.field.name] = value
+
+
+class PhoneNumberField(models.CharField):
+    """Поле для хранения номера телефона с отложенной загрузкой phonenumbers.
+    Повторяет поведение `phonenumber_field.modelfields.PhoneNumberField`, но не
+    импортирует библиотеку phonenumbers при импорте моделей и не разбирает номера
+    при загрузке строк из БД: номер хранится в нормализованном виде (E.164) и
+    разбирается при первом обращении к атрибуту. Для миграций поле представляется
+    как исходное поле django-phonenumber-field, поэтому схема БД не меняется."""
+
+    descriptor_class = PhoneNumberDescriptor
+    default_validators = [validate_international_phonenumber]
+
+    description = _("Phone number")
+
+    def __init__(self, *args, region: str | None = None, **kwargs):
+        kwargs.setdefault("max_length", 128)
+        super().__init__(*args, **kwargs)
+        self._region = region
+
+    @property
+    def region(self) -> str | None:
+        """Регион для разбора номеров без международного префикса."""
+
+        return self._region or getattr(settings, "PHONENUMBER_DEFAULT_REGION", None)
+
+    def check(self, **kwargs) -> list[checks.CheckMessage]:
+        """Дополнительно проверяет корректность кода региона."""
+
+        from phonenumber_field.phonenumber import validate_region
+
+        errors = super().check(**kwargs)
+        try:
+            validate_region(self.region)
+        except ValueError as e:
+            errors.append(checks.Error(str(e), obj=self))
+        return errors
+
+    def to_python(self, value):
+        """Преобразует значение в объект PhoneNumber."""
+
+        from phonenumber_field.phonenumber import to_python
+
+        return to_python(value, region=self.region)
+
+    def get_prep_value(self, value):
+        """Нормализует корректный номер в формат E.164 перед записью в БД.
+        Единый формат хранения позволяет искать номера по индексу точным сравнением."""
+
+        parsed_value = super().get_prep_value(value)
+        if not parsed_value:
+            return parsed_value
+
+        if parsed_value.is_valid():
+            return parsed_value.as_e164
+        return parsed_value.raw_input
+
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        """Устанавливает дескриптор поля на класс модели."""
+
+        super().contribute_to_class(cls, name, *args, **kwargs)
+        setattr(cls, self.name, self.descriptor_class(self))
+
+    def deconstruct(self):
+        """Представляет поле в миграциях как поле django-phonenumber-field."""
+
+        name, _path, args, kwargs = super().deconstruct()
+        kwargs["region"] = self._region
+        return name, "phonenumber_field.modelfields.PhoneNumberField", args, kwargs
+
+    def formfield(self, form_class=None, choices_form_class=None, **kwargs):
+        """Возвращает поле формы из django-phonenumber-field."""
+
+        from phonenumber_field import formfields
+
+        defaults = {
+            "form_class": formfields.PhoneNumberField if form_class is None else form_class,
+            "region": self.region,
+            "error_messages": self.error_messages,
+            "choices_form_class": choices_form_class,
+        }
+        defaults.update(kwargs)
+        return super().formfield(**defaults)
@@ -0,0 +1,52 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from apps.common.benchmarks.serializers import CASES, compare
+
+
+class Command(BaseCommand):
+    """Сравнивает скорость DRF-сериализаторов и быстрых сериализаторов каталога.
+    Для каждого списка выводятся задержки обоих способов, ускорение и признак
+    совпадения JSON. Данные создаются командой `seed_benchmark_data`."""
+
+    help = "Сравнивает DRF-сериализаторы и быстрые сериализаторы списков."
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы командной строки."""
+
+        parser.add_argument(
+            "cases",
+            nargs="*",
+            help=f"Списки для сравнения: {', '.join(CASES)} (по умолчанию все).",
+        )
+        parser.add_argument("--size", type=int, default=100, help="Объектов в списке.")
+        parser.add_argument("--repeat", type=int, default=200)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--output", default=None, help="Файл для JSON-отчёта.")
+
+    def handle(self, *args, **options):
+        """Выполняет сравнение и печатает отчёт."""
+
+        unknown = set(options["cases"]) - set(CASES)
+        if unknown:
+            raise CommandError(f"Неизвестные списки: {', '.join(sorted(unknown))}.")
+
+        results = {}
+        # Абсолютные URL изображений строятся для тестового хоста.
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            for name in options["cases"] or CASES:
+                self.stderr.write(f"Список {name}...")
+                results[name] = compare(
+                    name, options["size"], options["repeat"], options["warmup"]
+                )
+                if not results[name]["identical"]:
+                    self.stderr.write(self.style.ERROR(f"{name}: ответы различаются."))
+
+        output = json.dumps(results, ensure_ascii=False, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output)
+        self.stdout.write(output)
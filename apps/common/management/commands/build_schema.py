@@ -0,0 +1,51 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.services.schema import (
+    generate_schema,
+    get_schema_path,
+    read_schema,
+    write_schema,
+)
+
+
+class Command(BaseCommand):
+    """Генерирует OpenAPI-схему проекта и сохраняет её на диск.
+    С флагом `--check` ничего не записывает, а завершается с ошибкой,
+    если сохранённая схема не совпадает со схемой, построенной по текущему коду."""
+
+    help = "Генерирует OpenAPI-схему и сохраняет её на диск."
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы командной строки."""
+
+        parser.add_argument(
+            "--file",
+            type=Path,
+            default=None,
+            help="Путь к файлу схемы (по умолчанию OPENAPI_SCHEMA_FILE).",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Проверить, что сохранённая схема актуальна, не перезаписывая её.",
+        )
+
+    def handle(self, *args, **options):
+        """Генерирует схему и записывает её либо сверяет с сохранённой."""
+
+        path = options["file"] or get_schema_path()
+        content = generate_schema()
+
+        if options["check"]:
+            if read_schema(path) != content:
+                raise CommandError(
+                    f"OpenAPI-схема {path} устарела. "
+                    "Выполните `python manage.py build_schema`."
+                )
+            self.stdout.write(self.style.SUCCESS(f"OpenAPI-схема {path} актуальна."))
+            return
+
+        write_schema(content, path)
+        self.stdout.write(self.style.SUCCESS(f"OpenAPI-схема сохранена в {path}."))
@@ -0,0 +1,56 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import is_naive, make_aware
+
+from apps.common.services.export import EXPORT_FORMATS, EXPORTS, export
+
+
+class Command(BaseCommand):
+    """Выгружает объявления или продавцов в CSV, JSON Lines или Parquet.
+    Данные читаются из БД частями и сразу пишутся в файл, поэтому команда
+    работает с таблицами любого размера при постоянном потреблении памяти."""
+
+    help = "Потоковая выгрузка объявлений и продавцов."
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы командной строки."""
+
+        parser.add_argument("name", choices=sorted(EXPORTS), help="Что выгружать.")
+        parser.add_argument(
+            "--format",
+            dest="file_format",
+            choices=sorted(EXPORT_FORMATS),
+            default="csv",
+            help="Формат выгрузки.",
+        )
+        parser.add_argument(
+            "--since",
+            default=None,
+            help="Выгрузить только объекты, изменённые начиная с этого времени (ISO 8601).",
+        )
+        parser.add_argument(
+            "--output", "-o", default=None, help="Файл для записи (по умолчанию stdout)."
+        )
+
+    def handle(self, *args, **options):
+        """Пишет выгрузку в файл или в stdout."""
+
+        since = None
+        if options["since"]:
+            since = parse_datetime(options["since"])
+            if since is None:
+                raise CommandError("Некорректное значение --since, ожидается ISO 8601.")
+            if is_naive(since):
+                since = make_aware(since)
+
+        chunks = export(options["name"], options["file_format"], since)
+        if options["output"]:
+            with open(options["output"], "wb") as file:
+                for chunk in chunks:
+                    file.write(chunk)
+        else:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
@@ -0,0 +1,202 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Скрипт выполняется в отдельном процессе с `-X importtime`, чтобы измерить
+# холодный старт, а не состояние текущего процесса с уже загруженными модулями.
+STARTUP_SCRIPT = """
+import io
+import json
+import sys
+import time
+
+started = time.perf_counter()
+
+import django
+from django.conf import settings
+
+settings.INSTALLED_APPS
+settings_loaded = time.perf_counter()
+
+django.setup(set_prefix=False)
+apps_ready = time.perf_counter()
+
+from django.core.handlers.wsgi import WSGIHandler
+
+handler = WSGIHandler()
+middleware_loaded = time.perf_counter()
+
+path, method, host = sys.argv[1:4]
+body = b"{}" if method == "POST" else b""
+environ = {
+    "REQUEST_METHOD": method,
+    "PATH_INFO": path,
+    "SCRIPT_NAME": "",
+    "QUERY_STRING": "",
+    "SERVER_NAME": host,
+    "SERVER_PORT": "80",
+    "SERVER_PROTOCOL": "HTTP/1.1",
+    "HTTP_HOST": host,
+    "CONTENT_TYPE": "application/json",
+    "CONTENT_LENGTH": str(len(body)),
+    "wsgi.input": io.BytesIO(body),
+    "wsgi.errors": sys.stderr,
+    "wsgi.url_scheme": "http",
+    "wsgi.multithread": False,
+    "wsgi.multiprocess": True,
+    "wsgi.run_once": False,
+}
+statuses = []
+response = handler(environ, lambda status, headers, exc_info=None: statuses.append(status))
+b"".join(response)
+first_response = time.perf_counter()
+
+print(json.dumps({
+    "status": statuses[0] if statuses else None,
+    "settings": settings_loaded - started,
+    "apps_ready": apps_ready - settings_loaded,
+    "middleware": middleware_loaded - apps_ready,
+    "first_request": first_response - middleware_loaded,
+    "total": first_response - started,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+def parse_importtime(output: str) -> list[tuple[str, int, int]]:
+    """Разбирает вывод `-X importtime` в список (модуль, собственное время, суммарное время).
+    Время указывается в микросекундах."""
+
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_part, cumulative_part, name = line.removeprefix("import time:").split("|")
+        rows.append((name.strip(), int(self_part), int(cumulative_part)))
+    return rows
+
+
+class Command(BaseCommand):
+    """Профилирует холодный старт процесса Django.
+    Запускает отдельный интерпретатор и измеряет время импорта модулей,
+    загрузки настроек, готовности приложений (`django.setup()`), загрузки
+    middleware и обработки первого запроса."""
+
+    help = "Измеряет время импорта модулей и время до первого запроса."
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы командной строки."""
+
+        parser.add_argument(
+            "--path", default="/auth/token/", help="URL первого запроса."
+        )
+        parser.add_argument(
+            "--method",
+            default="POST",
+            choices=["GET", "POST"],
+            help="HTTP-метод первого запроса.",
+        )
+        parser.add_argument("--host", default="localhost", help="Значение заголовка Host.")
+        parser.add_argument(
+            "--limit", type=int, default=20, help="Сколько самых медленных модулей показать."
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Вывести отчёт в формате JSON."
+        )
+
+    def handle(self, *args, **options):
+        """Запускает профилируемый процесс и печатает отчёт."""
+
+        started = time.perf_counter()
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                STARTUP_SCRIPT,
+                options["path"],
+                options["method"],
+                options["host"],
+            ],
+            capture_output=True,
+            text=True,
+            env=os.environ.copy(),
+        )
+        wall_time = time.perf_counter() - started
+        if result.returncode != 0:
+            raise CommandError(f"Профилируемый процесс завершился с ошибкой:\n{result.stderr}")
+
+        phases = json.loads(result.stdout.strip().splitlines()[-1])
+        imports = parse_importtime(result.stderr)
+        report = self.build_report(phases, imports, wall_time, options["limit"])
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            self.print_report(report)
+
+    def build_report(
+        self, phases: dict, imports: list[tuple[str, int, int]], wall_time: float, limit: int
+    ) -> dict:
+        """Собирает отчёт: фазы старта, самые медленные модули и пакеты."""
+
+        packages = defaultdict(int)
+        for name, self_us, _cumulative_us in imports:
+            packages[name.split(".")[0]] += self_us
+
+        slowest_modules = sorted(imports, key=lambda row: row[2], reverse=True)[:limit]
+        slowest_packages = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+        loaded = set(phases.pop("modules"))
+
+        return {
+            "status": phases.pop("status"),
+            "wall_time_ms": round(wall_time * 1000, 1),
+            "phases_ms": {name: round(value * 1000, 1) for name, value in phases.items()},
+            "packages_ms": {
+                name: round(self_us / 1000, 1) for name, self_us in slowest_packages[:limit]
+            },
+            "modules_ms": [
+                {
+                    "module": name,
+                    "self": round(self_us / 1000, 1),
+                    "cumulative": round(cumulative_us / 1000, 1),
+                }
+                for name, self_us, cumulative_us in slowest_modules
+            ],
+            "heavy_modules_loaded": {
+                name: name in loaded
+                for name in ("PIL.Image", "phonenumbers", "drf_spectacular.views")
+            },
+        }
+
+    def print_report(self, report: dict):
+        """Печатает отчёт в виде таблиц."""
+
+        self.stdout.write(
+            f"Первый ответ: {report['status']}, "
+            f"полное время процесса: {report['wall_time_ms']} мс"
+        )
+        self.stdout.write("\nФазы старта, мс:")
+        for name, value in report["phases_ms"].items():
+            self.stdout.write(f"  {name:<16}{value:>10}")
+
+        self.stdout.write("\nПакеты по собственному времени импорта, мс:")
+        for name, value in report["packages_ms"].items():
+            self.stdout.write(f"  {name:<40}{value:>10}")
+
+        self.stdout.write("\nМодули по суммарному времени импорта, мс:")
+        for row in report["modules_ms"]:
+            self.stdout.write(
+                f"  {row['module']:<60}{row['self']:>10}{row['cumulative']:>12}"
+            )
+
+        self.stdout.write("\nТяжёлые модули, загруженные к первому ответу:")
+        for name, loaded in report["heavy_modules_loaded"].items():
+            self.stdout.write(f"  {name:<40}{'да' if loaded else 'нет'}")
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.common.services.idempotency import prune
+
+
+class Command(BaseCommand):
+    """Удаляет ключи идемпотентности, срок хранения которых истёк
+    (IDEMPOTENCY_KEY_TTL). Устаревшие ключи и так не используются, команда только
+    освобождает место; её достаточно запускать по расписанию раз в час или в сутки."""
+
+    help = "Удаляет устаревшие ключи идемпотентности."
+
+    def handle(self, *args, **options):
+        """Удаляет устаревшие ключи и выводит их количество."""
+
+        deleted = prune()
+        self.stdout.write(f"Удалено ключей: {deleted}")
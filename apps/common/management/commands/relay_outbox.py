@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.services.outbox import (
+    FileSink,
+    OutboxRelay,
+    OutboxSink,
+    SubscriberSink,
+    WebhookSink,
+    prune,
+)
+
+
+class Command(BaseCommand):
+    """Доставляет события outbox получателю: в файл JSON Lines, на webhook или
+    подписчикам в текущем процессе. Позиция доставки сохраняется под именем
+    потребителя, поэтому после перезапуска доставка продолжается с того же места."""
+
+    help = "Доставляет события outbox получателю."
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы командной строки."""
+
+        parser.add_argument(
+            "sink", choices=["file", "webhook", "subscribers"], help="Тип получателя."
+        )
+        parser.add_argument(
+            "--name", default=None, help="Имя потребителя (по умолчанию — тип получателя)."
+        )
+        parser.add_argument("--path", default=None, help="Файл для получателя file.")
+        parser.add_argument(
+            "--url",
+            default=None,
+            help="URL для получателя webhook (по умолчанию OUTBOX_WEBHOOK_URL).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Размер пачки (по умолчанию OUTBOX_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1,
+            help="Пауза между проверками, если новых событий нет.",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Доставить накопленные события и завершиться."
+        )
+        parser.add_argument(
+            "--prune-days",
+            type=int,
+            default=None,
+            help="Удалить события старше N дней, доставленные всем потребителям, и завершиться.",
+        )
+
+    def get_sink(self, options) -> OutboxSink:
+        """Создаёт получателя по аргументам командной строки."""
+
+        if options["sink"] == "file":
+            if not options["path"]:
+                raise CommandError("Для получателя file нужно указать --path.")
+            return FileSink(options["path"])
+        if options["sink"] == "webhook":
+            url = options["url"] or settings.OUTBOX_WEBHOOK_URL
+            if not url:
+                raise CommandError("Для получателя webhook нужно указать --url.")
+            return WebhookSink(url, secret=settings.OUTBOX_WEBHOOK_SECRET)
+        return SubscriberSink()
+
+    def handle(self, *args, **options):
+        """Доставляет события один раз или непрерывно."""
+
+        if options["prune_days"] is not None:
+            deleted = prune(timedelta(days=options["prune_days"]))
+            self.stdout.write(f"Удалено событий: {deleted}")
+            return
+
+        relay = OutboxRelay(
+            options["name"] or options["sink"],
+            self.get_sink(options),
+            batch_size=options["batch_size"],
+        )
+        if not options["once"]:
+            relay.run(interval=options["interval"])
+            return
+
+        total = 0
+        while delivered := relay.run_once():
+            total += delivered
+        self.stdout.write(self.style.SUCCESS(f"Доставлено событий: {total}"))
@@ -0,0 +1,106 @@
+import json
+import platform
+import subprocess
+from contextlib import nullcontext
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from apps.common.benchmarks.runner import BenchmarkRunner, in_process_server
+from apps.common.benchmarks.scenarios import SCENARIOS, prepare_context
+
+
+class Command(BaseCommand):
+    """Запускает сценарии нагрузочного тестирования и печатает метрики в JSON.
+    Для каждого сценария выводятся p50/p95/p99 задержки и пропускная способность,
+    что позволяет сравнивать релизы между собой. Данные для сценариев создаются
+    командой `seed_benchmark_data`."""
+
+    help = "Измеряет задержку и пропускную способность основных сценариев API."
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы командной строки."""
+
+        parser.add_argument(
+            "scenarios",
+            nargs="*",
+            help=f"Сценарии для запуска: {', '.join(SCENARIOS)} (по умолчанию все).",
+        )
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=1)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument(
+            "--transport",
+            choices=["client", "http"],
+            default="client",
+            help="client — вызов приложения в процессе, http — через встроенный сервер.",
+        )
+        parser.add_argument(
+            "--base-url",
+            default=None,
+            help="URL уже запущенного сервера (для --transport http).",
+        )
+        parser.add_argument("--output", default=None, help="Файл для JSON-отчёта.")
+
+    def handle(self, *args, **options):
+        """Выполняет сценарии и сохраняет отчёт."""
+
+        unknown = set(options["scenarios"]) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Неизвестные сценарии: {', '.join(sorted(unknown))}.")
+
+        context = prepare_context()
+        if not context.emails or not context.category_ids:
+            raise CommandError(
+                "Нет данных для сценариев. Выполните `python manage.py seed_benchmark_data`."
+            )
+
+        if options["transport"] == "http" and not options["base_url"]:
+            server = in_process_server()
+        else:
+            server = nullcontext(options["base_url"])
+
+        hosts = [*settings.ALLOWED_HOSTS, "testserver", "127.0.0.1", "localhost"]
+        results = {}
+        with override_settings(ALLOWED_HOSTS=hosts), server as base_url:
+            runner = BenchmarkRunner(
+                base_url=base_url if options["transport"] == "http" else None,
+                concurrency=options["concurrency"],
+                warmup=options["warmup"],
+            )
+            for name in options["scenarios"] or SCENARIOS:
+                self.stderr.write(f"Сценарий {name}...")
+                results[name] = runner.run(SCENARIOS[name], context, options["requests"])
+
+        report = {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "revision": self.get_revision(),
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "transport": options["transport"],
+            "concurrency": options["concurrency"],
+            "scenarios": results,
+        }
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output)
+        self.stdout.write(output)
+
+    @staticmethod
+    def get_revision() -> str | None:
+        """Возвращает текущую ревизию git, если она доступна."""
+
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True,
+                text=True,
+                cwd=settings.BASE_DIR,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
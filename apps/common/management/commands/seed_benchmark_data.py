@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from apps.common.benchmarks.generators import BenchmarkDataGenerator
+
+
+class Command(BaseCommand):
+    """Заполняет БД данными для нагрузочного тестирования.
+    Создаёт пользователей, продавцов, категории и объявления через `bulk_create`.
+    С флагом `--clear` удаляет ранее сгенерированные данные."""
+
+    help = "Создаёт данные для нагрузочного тестирования."
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы командной строки."""
+
+        parser.add_argument("--users", type=int, default=10_000)
+        parser.add_argument("--categories", type=int, default=50)
+        parser.add_argument("--announcements", type=int, default=100_000)
+        parser.add_argument(
+            "--sellers-share",
+            type=float,
+            default=0.2,
+            help="Доля пользователей-продавцов.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Зерно генератора.")
+        parser.add_argument(
+            "--clear", action="store_true", help="Удалить сгенерированные данные."
+        )
+
+    def handle(self, *args, **options):
+        """Создаёт или удаляет данные и печатает количество строк."""
+
+        if options["clear"]:
+            deleted = BenchmarkDataGenerator.clear()
+            for label, count in deleted.items():
+                self.stdout.write(f"Удалено {label}: {count}")
+            return
+
+        generator = BenchmarkDataGenerator(seed=options["seed"])
+        created = generator.generate(
+            users=options["users"],
+            categories=options["categories"],
+            announcements=options["announcements"],
+            sellers_share=options["sellers_share"],
+        )
+        for label, count in created.items():
+            self.stdout.write(f"Создано {label}: {count}")
@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.common.services.mail import EmailOutboxWorker, prune
+
+
+class Command(BaseCommand):
+    """Отправляет письма из очереди через почтовый сервер из настроек EMAIL_*.
+    Для локальной проверки можно запустить SMTP-заглушку и указать её адрес в
+    EMAIL_HOST и EMAIL_PORT."""
+
+    help = "Отправляет письма из очереди."
+
+    def add_arguments(self, parser):
+        """Добавляет аргументы командной строки."""
+
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Размер пачки (по умолчанию EMAIL_OUTBOX_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=None,
+            help=(
+                "Не больше писем в секунду "
+                "(по умолчанию EMAIL_OUTBOX_RATE_LIMIT, 0 — без ограничения)."
+            ),
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1,
+            help="Пауза между проверками, если писем к отправке нет.",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Отправить накопленные письма и завершиться."
+        )
+        parser.add_argument(
+            "--prune-days",
+            type=int,
+            default=None,
+            help="Удалить отправленные письма старше N дней и завершиться.",
+        )
+
+    def handle(self, *args, **options):
+        """Отправляет письма один раз или непрерывно."""
+
+        if options["prune_days"] is not None:
+            deleted = prune(timedelta(days=options["prune_days"]))
+            self.stdout.write(f"Удалено писем: {deleted}")
+            return
+
+        worker = EmailOutboxWorker(batch_size=options["batch_size"], rate=options["rate"])
+        if not options["once"]:
+            worker.run(interval=options["interval"])
+            return
+
+        total = 0
+        try:
+            while processed := worker.run_once():
+                total += processed
+        finally:
+            worker.close()
+        self.stdout.write(self.style.SUCCESS(f"Обработано писем: {total}"))
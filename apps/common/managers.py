@@ -1,6 +1,14 @@
-from django.db import models
+from django.db import models, transaction
+from django.dispatch import Signal
 from django.utils import timezone
 
+from apps.common.signals import post_restore, post_soft_delete
+
+
+# Сколько объектов изменяет одна транзакция массового мягкого удаления или
+# восстановления, если у сигнала есть получатели.
+SIGNAL_BATCH_SIZE = 1000
+
 
 class GetOrNoneQuerySet(models.QuerySet):
     """Расширение стандартного QuerySet Django с добавлением метода get_or_none.
@@ -31,7 +39,7 @@ class GetOrNoneManager(models.Manager):
     def get_or_none(self, **kwargs) -> models.Model | None:
         """Возвращает объект, соответствующий заданным параметрам, или None, если объект не найден."""
 
-        return self.get_queryset().get_or_none()
+        return self.get_queryset().get_or_none(**kwargs)
 
 
 class IsDeletedQuerySet(GetOrNoneQuerySet):
@@ -39,7 +47,39 @@ class IsDeletedQuerySet(GetOrNoneQuerySet):
     Данный класс добавляет возможность мягкого удаления (пометка как удалённого)
     вместо физического удаления записей из базы данных. При мягком удалении
     устанавливается флаг `is_deleted` и время `deleted_at`, тогда как при
-    жёстком удалении записи удаляются стандартным способом через родительский класс."""
+    жёстком удалении записи удаляются стандартным способом через родительский класс.
+    Массовые мягкое удаление и восстановление отправляют сигналы `post_soft_delete`
+    и `post_restore` со списками затронутых ключей (по части на сигнал), если у них
+    есть получатели."""
+
+    def _update_with_signal(self, signal: Signal, **kwargs) -> int:
+        """Выполняет UPDATE и уведомляет получателей сигнала о затронутых объектах.
+        Ключи объектов запрашиваются только при наличии получателей. Тогда объекты
+        изменяются частями по SIGNAL_BATCH_SIZE в порядке первичного ключа: каждая
+        часть блокируется, изменяется и передаётся сигналу в отдельной транзакции,
+        поэтому ни память процесса, ни время блокировок не растут с размером выборки."""
+
+        if not signal.has_listeners(self.model):
+            return self.update(**kwargs)
+
+        count, last_pk = 0, None
+        queryset = self.order_by("pk")
+        while True:
+            batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            with transaction.atomic(using=self.db):
+                pks = list(
+                    batch.select_for_update().values_list("pk", flat=True)[:SIGNAL_BATCH_SIZE]
+                )
+                if not pks:
+                    break
+                count += (
+                    self.model._base_manager.using(self.db).filter(pk__in=pks).update(**kwargs)
+                )
+                signal.send(sender=self.model, pks=pks, using=self.db)
+            if len(pks) < SIGNAL_BATCH_SIZE:
+                break
+            last_pk = pks[-1]
+        return count
 
     def delete(self, hard_delete=False) -> tuple[int, dict[str, int]]:
         """Выполняет удаление объектов в queryset."""
@@ -47,14 +87,16 @@ class IsDeletedQuerySet(GetOrNoneQuerySet):
         if hard_delete:
             return super().delete()
         else:
-            return self.update(is_deleted=True, deleted_at=timezone.now())
+            return self._update_with_signal(
+                post_soft_delete, is_deleted=True, deleted_at=timezone.now()
+            )
 
     def restore(self) -> int:
         """Восстанавливает все удалённые объекты в QuerySet, снимая флаг is_deleted
         и обнуляя deleted_at. Операция выполняется на уровне БД (массовое обновление).
         Возвращает количество затронутых объектов."""
 
-        return self.update(is_deleted=False, deleted_at=None)
+        return self._update_with_signal(post_restore, is_deleted=False, deleted_at=None)
 
 
 class IsDeletedManager(GetOrNoneManager):
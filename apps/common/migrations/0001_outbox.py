@@ -0,0 +1,44 @@
+# Generated by Django 6.0 on 2026-10-19 04:47
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxCursor',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Потребитель')),
+                ('position', models.BigIntegerField(default=0, verbose_name='Последнее событие')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата обновления')),
+            ],
+            options={
+                'verbose_name': 'Позиция потребителя outbox',
+                'verbose_name_plural': 'Позиции потребителей outbox',
+            },
+        ),
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('model', models.CharField(max_length=100, verbose_name='Модель')),
+                ('object_id', models.CharField(max_length=64, verbose_name='Идентификатор объекта')),
+                ('action', models.CharField(choices=[('created', 'Создан'), ('updated', 'Изменён'), ('deleted', 'Удалён'), ('soft_deleted', 'Помечен как удалённый'), ('restored', 'Восстановлен')], max_length=12, verbose_name='Действие')),
+                ('payload', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Данные объекта')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата события')),
+            ],
+            options={
+                'verbose_name': 'Событие outbox',
+                'verbose_name_plural': 'События outbox',
+                'ordering': ['id'],
+            },
+        ),
+    ]
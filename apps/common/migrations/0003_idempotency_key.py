@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-19 05:09
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0002_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False, verbose_name='Идентификатор')),
+                ('request_hash', models.CharField(max_length=64, verbose_name='Хеш запроса')),
+                ('status_code', models.PositiveSmallIntegerField(null=True, verbose_name='Код ответа')),
+                ('response', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, null=True, verbose_name='Ответ')),
+                ('expires_at', models.DateTimeField(db_index=True, verbose_name='Действует до')),
+            ],
+            options={
+                'verbose_name': 'Ключ идемпотентности',
+                'verbose_name_plural': 'Ключи идемпотентности',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 05:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0003_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idempotencykey',
+            name='headers',
+            field=models.JSONField(default=dict, verbose_name='Заголовки ответа'),
+        ),
+    ]
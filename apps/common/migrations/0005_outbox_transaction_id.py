@@ -0,0 +1,40 @@
+# Generated by Django 6.0 on 2026-10-19 05:38
+
+import apps.common.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0004_idempotency_key_headers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxcursor',
+            name='locked_until',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Занята до'),
+        ),
+        migrations.AddField(
+            model_name='outboxcursor',
+            name='transaction_id',
+            field=models.BigIntegerField(default=0, verbose_name='Транзакция'),
+        ),
+        # Уже записанные события получают транзакцию 0: они доставляются в прежнем
+        # порядке, до событий новых транзакций.
+        migrations.AddField(
+            model_name='outboxevent',
+            name='transaction_id',
+            field=models.BigIntegerField(db_default=0, editable=False, verbose_name='Транзакция'),
+        ),
+        migrations.AlterField(
+            model_name='outboxevent',
+            name='transaction_id',
+            field=models.BigIntegerField(db_default=apps.common.models.CurrentTransactionId(), editable=False, verbose_name='Транзакция'),
+        ),
+        migrations.AddIndex(
+            model_name='outboxevent',
+            index=models.Index(fields=['transaction_id', 'id'], name='outbox_event_delivery_idx'),
+        ),
+    ]
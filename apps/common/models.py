@@ -1,5 +1,6 @@
 import uuid
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, router, transaction
 from django.utils import timezone
 
 from apps.common.managers import GetOrNoneManager, IsDeletedManager
@@ -19,6 +20,22 @@ class BaseModel(models.Model):
 
     objects = GetOrNoneManager()
 
+    # Устанавливается для моделей, изменения которых записываются в outbox
+    # (см. apps.common.services.outbox.track).
+    outbox_tracked = False
+
+    def save(self, *args, **kwargs):
+        """Сохраняет объект. Для моделей, отслеживаемых outbox, сохранение и запись
+        события выполняются в одной транзакции: обработчик post_save вызывается
+        внутри неё."""
+
+        if not self.outbox_tracked:
+            return super().save(*args, **kwargs)
+
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+
     class Meta:
         """Мета-класс для настройки модели."""
 
@@ -65,3 +82,165 @@ class IsDeletedModel(BaseModel):
             self.is_deleted = False
             self.deleted_at = None
             self.save(update_fields=["is_deleted", "deleted_at"])
+
+
+OUTBOX_ACTION_CHOICES = (
+    ("created", "Создан"),
+    ("updated", "Изменён"),
+    ("deleted", "Удалён"),
+    ("soft_deleted", "Помечен как удалённый"),
+    ("restored", "Восстановлен"),
+)
+
+
+class CurrentTransactionId(models.Func):
+    """Идентификатор текущей транзакции PostgreSQL (`pg_current_xact_id()`).
+    В других СУБД идентификатора транзакции нет, и выражение возвращает 0."""
+
+    template = "pg_current_xact_id()::text::bigint"
+    output_field = models.BigIntegerField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        """Возвращает SQL выражения для СУБД соединения."""
+
+        if connection.vendor != "postgresql":
+            return "0", []
+        return super().as_sql(compiler, connection, **extra_context)
+
+
+class OutboxEvent(models.Model):
+    """Событие об изменении объекта для внешних потребителей (поиск, кэши, аналитика).
+    Записывается в той же транзакции, что и само изменение, поэтому событие
+    появляется тогда и только тогда, когда изменение зафиксировано. Вместе с
+    событием база сохраняет идентификатор записавшей его транзакции: потребители
+    читают события по возрастанию `(transaction_id, id)` и только из уже
+    завершённых транзакций, поэтому событие долгой транзакции не может оказаться
+    позади их позиции."""
+
+    id = models.BigAutoField(primary_key=True)
+    model = models.CharField(max_length=100, verbose_name="Модель")
+    object_id = models.CharField(max_length=64, verbose_name="Идентификатор объекта")
+    action = models.CharField(
+        max_length=12, choices=OUTBOX_ACTION_CHOICES, verbose_name="Действие"
+    )
+    payload = models.JSONField(
+        default=dict, encoder=DjangoJSONEncoder, verbose_name="Данные объекта"
+    )
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="Дата события")
+    transaction_id = models.BigIntegerField(
+        db_default=CurrentTransactionId(), editable=False, verbose_name="Транзакция"
+    )
+
+    def __str__(self) -> str:
+        """Возвращает строковое представление события."""
+
+        return f"#{self.id} {self.model}:{self.object_id} {self.action}"
+
+    class Meta:
+        """Мета-класс для настройки модели."""
+
+        verbose_name = "Событие outbox"
+        verbose_name_plural = "События outbox"
+        ordering = ["id"]
+        indexes = [
+            # Порядок доставки потребителям.
+            models.Index(fields=["transaction_id", "id"], name="outbox_event_delivery_idx"),
+        ]
+
+
+class OutboxCursor(models.Model):
+    """Позиция потребителя outbox: транзакция и ключ последнего доставленного события.
+    Пока процесс доставляет пачку, позиция занята им до `locked_until`."""
+
+    name = models.CharField(max_length=100, primary_key=True, verbose_name="Потребитель")
+    transaction_id = models.BigIntegerField(default=0, verbose_name="Транзакция")
+    position = models.BigIntegerField(default=0, verbose_name="Последнее событие")
+    locked_until = models.DateTimeField(null=True, blank=True, verbose_name="Занята до")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Дата обновления")
+
+    def __str__(self) -> str:
+        """Возвращает строковое представление позиции."""
+
+        return f"{self.name}: {self.position}"
+
+    class Meta:
+        """Мета-класс для настройки модели."""
+
+        verbose_name = "Позиция потребителя outbox"
+        verbose_name_plural = "Позиции потребителей outbox"
+
+
+EMAIL_STATUS_CHOICES = (
+    ("pending", "Ожидает отправки"),
+    ("sent", "Отправлено"),
+    ("failed", "Не отправлено"),
+)
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку.
+    Запрос только добавляет строку в таблицу (в той же транзакции, что и событие,
+    о котором письмо), а отправляет письма отдельный процесс (`send_emails`):
+    пачками, через одно SMTP-соединение, с повторными попытками при ошибках."""
+
+    id = models.BigAutoField(primary_key=True)
+    to = models.EmailField(verbose_name="Получатель")
+    subject = models.CharField(max_length=255, verbose_name="Тема")
+    body = models.TextField(verbose_name="Текст")
+    status = models.CharField(
+        max_length=7, choices=EMAIL_STATUS_CHOICES, default="pending", verbose_name="Статус"
+    )
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Число попыток")
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now, verbose_name="Время следующей попытки"
+    )
+    last_error = models.TextField(blank=True, verbose_name="Последняя ошибка")
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="Дата создания")
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name="Дата отправки")
+
+    def __str__(self) -> str:
+        """Возвращает строковое представление письма."""
+
+        return f"#{self.id} {self.to}: {self.subject}"
+
+    class Meta:
+        """Мета-класс для настройки модели."""
+
+        verbose_name = "Исходящее письмо"
+        verbose_name_plural = "Исходящие письма"
+        ordering = ["id"]
+        indexes = [
+            # Очередь отправки: только ожидающие письма, по времени следующей попытки.
+            models.Index(
+                fields=["next_attempt_at", "id"],
+                condition=models.Q(status="pending"),
+                name="outgoing_email_pending_idx",
+            ),
+        ]
+
+
+class IdempotencyKey(models.Model):
+    """Результат запроса, выполненного с заголовком `Idempotency-Key`.
+    Идентификатор — хеш ключа клиента вместе с пользователем (или IP-адресом),
+    методом и путём запроса, поэтому ключи разных клиентов и эндпоинтов не
+    пересекаются. Повтор запроса с тем же ключом получает сохранённый ответ, пока
+    запись не устарела (`expires_at`). Пока запрос выполняется, код ответа пуст,
+    а `expires_at` ограничивает время, на которое запрос занимает ключ."""
+
+    id = models.UUIDField(primary_key=True, editable=False, verbose_name="Идентификатор")
+    request_hash = models.CharField(max_length=64, verbose_name="Хеш запроса")
+    status_code = models.PositiveSmallIntegerField(null=True, verbose_name="Код ответа")
+    response = models.JSONField(null=True, encoder=DjangoJSONEncoder, verbose_name="Ответ")
+    headers = models.JSONField(default=dict, verbose_name="Заголовки ответа")
+    expires_at = models.DateTimeField(db_index=True, verbose_name="Действует до")
+
+    def __str__(self) -> str:
+        """Возвращает строковое представление ключа."""
+
+        return f"{self.id}: {self.status_code}"
+
+    class Meta:
+        """Мета-класс для настройки модели."""
+
+        verbose_name = "Ключ идемпотентности"
+        verbose_name_plural = "Ключи идемпотентности"
@@ -0,0 +1,35 @@
+from rest_framework.renderers import JSONRenderer
+
+
+# orjson — зависимость проекта, но без него рендерер работает как JSONRenderer.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON-рендерер на основе orjson, если пакет установлен.
+    orjson кодирует списки словарей в несколько раз быстрее модуля json. Значения,
+    которые orjson кодирует иначе, чем DRF (время, Decimal и прочие типы), передаются
+    кодировщику DRF, поэтому ответ совпадает с ответом `JSONRenderer`. Для ответов
+    с отступами (например, в Browsable API) и без orjson используется `JSONRenderer`."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        """Кодирует `data` в JSON."""
+
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        encoder = self.encoder_class()
+        ret = orjson.dumps(
+            data,
+            default=encoder.default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+        # Как и JSONRenderer, экранирует U+2028 и U+2029 для совместимости с JavaScript.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
@@ -0,0 +1,244 @@
+import csv
+import io
+import uuid
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models
+from django.db.models import QuerySet
+
+from apps.announcements.models import Announcement
+from apps.sellers.models import Seller
+
+
+# Сколько строк читать из серверного курсора за раз. Объём памяти процесса
+# определяется этим числом, а не размером таблицы.
+CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """Описание выгрузки: модель, выбираемые объекты и выгружаемые поля."""
+
+    model: type[models.Model]
+    get_queryset: Callable[[], QuerySet]
+    fields: tuple[str, ...]
+
+
+EXPORTS = {
+    "announcements": ExportSpec(
+        model=Announcement,
+        get_queryset=lambda: Announcement.objects.all(),
+        fields=(
+            "id",
+            "title",
+            "slug",
+            "description",
+            "price",
+            "condition",
+            "image",
+            "category_id",
+            "seller_id",
+            "views_count",
+            "created_at",
+            "updated_at",
+        ),
+    ),
+    "sellers": ExportSpec(
+        model=Seller,
+        get_queryset=lambda: Seller.objects.filter(user__is_deleted=False),
+        fields=(
+            "id",
+            "company_name",
+            "name",
+            "slug",
+            "website_url",
+            "phone_number",
+            "description",
+            "is_approved",
+            "created_at",
+            "updated_at",
+        ),
+    ),
+}
+
+
+def get_export_queryset(spec: ExportSpec, since: datetime | None = None) -> QuerySet:
+    """Возвращает выгружаемые объекты, изменённые начиная с `since`, по порядку изменения.
+    Для инкрементальной выгрузки потребитель передаёт наибольшее `updated_at` из
+    предыдущей выгрузки; строки с этим значением будут выгружены повторно, но
+    ни одна строка не будет пропущена."""
+
+    queryset = spec.get_queryset()
+    if since is not None:
+        queryset = queryset.filter(updated_at__gte=since)
+    return queryset.order_by("updated_at", "id").values_list(*spec.fields)
+
+
+def iter_rows(spec: ExportSpec, since: datetime | None = None) -> Iterator[tuple]:
+    """Читает строки выгрузки серверным курсором, по CHUNK_SIZE строк за раз."""
+
+    return get_export_queryset(spec, since).iterator(chunk_size=CHUNK_SIZE)
+
+
+def _to_text(value) -> str | int | float | bool | None:
+    """Приводит значение поля к виду, пригодному для CSV и Parquet."""
+
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+class _Echo:
+    """Псевдофайл, возвращающий записанную строку: позволяет отдавать CSV по строкам."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def export_csv(spec: ExportSpec, since: datetime | None = None) -> Iterator[bytes]:
+    """Выгружает объекты в CSV.
+    В PostgreSQL данные отдаёт сам сервер командой `COPY ... TO STDOUT`, без
+    создания объектов Python для каждой строки; на других БД строки читаются
+    серверным курсором и форматируются модулем csv."""
+
+    queryset = get_export_queryset(spec, since)
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        yield from _copy_csv(queryset, connection)
+        return
+
+    writer = csv.writer(_Echo())
+    yield writer.writerow(spec.fields).encode()
+    for row in queryset.iterator(chunk_size=CHUNK_SIZE):
+        yield writer.writerow([_to_text(value) for value in row]).encode()
+
+
+def _copy_csv(queryset: QuerySet, connection) -> Iterator[bytes]:
+    """Выполняет `COPY (SELECT ...) TO STDOUT WITH CSV HEADER` и отдаёт данные блоками."""
+
+    sql, params = queryset.query.sql_with_params()
+    statement = f"COPY ({sql}) TO STDOUT WITH (FORMAT csv, HEADER)"
+    connection.ensure_connection()
+    with connection.connection.cursor() as cursor:
+        with cursor.copy(statement, params) as copy:
+            for block in copy:
+                yield bytes(block)
+
+
+def export_jsonl(spec: ExportSpec, since: datetime | None = None) -> Iterator[bytes]:
+    """Выгружает объекты в JSON Lines: по одному объекту JSON на строку."""
+
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    lines = []
+    for row in iter_rows(spec, since):
+        lines.append(encoder.encode(dict(zip(spec.fields, row))))
+        if len(lines) >= CHUNK_SIZE:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Файл только для записи, из которого записанные данные забираются по частям."""
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        """Возвращает данные, записанные с прошлого вызова."""
+
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+def _arrow_schema(spec: ExportSpec):
+    """Строит схему Parquet по типам полей модели."""
+
+    import pyarrow as pa
+
+    columns = []
+    for name in spec.fields:
+        field = spec.model._meta.get_field(name.removesuffix("_id"))
+        if isinstance(field, models.DecimalField):
+            arrow_type = pa.decimal128(field.max_digits, field.decimal_places)
+        elif isinstance(field, models.BooleanField):
+            arrow_type = pa.bool_()
+        elif isinstance(field, models.DateTimeField):
+            arrow_type = pa.timestamp("us", tz="UTC")
+        elif isinstance(field, models.IntegerField):
+            arrow_type = pa.int64()
+        elif isinstance(field, models.FloatField):
+            arrow_type = pa.float64()
+        else:
+            arrow_type = pa.string()
+        columns.append(pa.field(name, arrow_type))
+    return pa.schema(columns)
+
+
+def export_parquet(spec: ExportSpec, since: datetime | None = None) -> Iterator[bytes]:
+    """Выгружает объекты в Parquet, записывая каждые CHUNK_SIZE строк отдельной группой строк.
+    Требует установленного пакета pyarrow; он импортируется только здесь."""
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(spec)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+
+    def write_batch(rows: list[tuple]):
+        columns = [
+            pa.array([_to_text(value) for value in column], type=field.type)
+            for column, field in zip(zip(*rows), schema)
+        ]
+        writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+
+    rows = []
+    for row in iter_rows(spec, since):
+        rows.append(row)
+        if len(rows) >= CHUNK_SIZE:
+            write_batch(rows)
+            rows = []
+            yield sink.drain()
+    if rows:
+        write_batch(rows)
+    writer.close()
+    yield sink.drain()
+
+
+EXPORTERS = {
+    "csv": export_csv,
+    "jsonl": export_jsonl,
+    "parquet": export_parquet,
+}
+
+
+def export(name: str, file_format: str, since: datetime | None = None) -> Iterator[bytes]:
+    """Возвращает генератор частей выгрузки `name` в формате `file_format`.
+    Выбрасывает KeyError, если выгрузка или формат неизвестны."""
+
+    spec = EXPORTS[name]
+    exporter = EXPORTERS[file_format]
+    return exporter(spec, since)
@@ -0,0 +1,143 @@
+import math
+
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import Combinable
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Число бит геохеша на каждую координату. 26 бит дают ячейку около 0,6 × 0,3 м,
+# а весь геохеш (52 бита) помещается в bigint.
+GEOHASH_BITS = 26
+
+# Наибольшее число ячеек геохеша, которыми покрывается область поиска. Чем больше
+# ячеек, тем точнее покрытие, но тем больше диапазонов в условии запроса.
+MAX_COVER_CELLS = 16
+
+LATITUDE_RANGE = (-90.0, 90.0)
+LONGITUDE_RANGE = (-180.0, 180.0)
+
+
+def _cell_index(value: float, bounds: tuple[float, float], level: int) -> int:
+    """Возвращает номер ячейки уровня `level`, в которую попадает координата."""
+
+    low, high = bounds
+    index = int((value - low) / (high - low) * (1 << level))
+    return min(max(index, 0), (1 << level) - 1)
+
+
+def _interleave(lon_index: int, lat_index: int, level: int) -> int:
+    """Чередует биты номеров ячеек по долготе и широте, начиная с долготы."""
+
+    code = 0
+    for bit in reversed(range(level)):
+        code = (code << 2) | ((lon_index >> bit) & 1) << 1 | ((lat_index >> bit) & 1)
+    return code
+
+
+def encode_geohash(latitude: float, longitude: float) -> int:
+    """Возвращает геохеш точки в виде целого числа.
+    Порядок бит тот же, что у строкового геохеша, поэтому точки одной ячейки любого
+    уровня образуют непрерывный диапазон чисел и ищутся по обычному btree-индексу."""
+
+    return _interleave(
+        _cell_index(longitude, LONGITUDE_RANGE, GEOHASH_BITS),
+        _cell_index(latitude, LATITUDE_RANGE, GEOHASH_BITS),
+        GEOHASH_BITS,
+    )
+
+
+def bounding_box(
+    latitude: float, longitude: float, radius_km: float
+) -> tuple[float, float, list[tuple[float, float]]]:
+    """Возвращает прямоугольник, описанный вокруг круга радиусом `radius_km`:
+    границы по широте и список диапазонов долготы. Диапазонов два, если круг
+    пересекает 180-й меридиан; если круг захватывает полюс, долгота не ограничена."""
+
+    angle = radius_km / EARTH_RADIUS_KM
+    min_lat = max(latitude - math.degrees(angle), LATITUDE_RANGE[0])
+    max_lat = min(latitude + math.degrees(angle), LATITUDE_RANGE[1])
+    if min_lat == LATITUDE_RANGE[0] or max_lat == LATITUDE_RANGE[1]:
+        return min_lat, max_lat, [LONGITUDE_RANGE]
+
+    ratio = math.sin(angle) / math.cos(math.radians(latitude))
+    if ratio >= 1:
+        return min_lat, max_lat, [LONGITUDE_RANGE]
+    delta = math.degrees(math.asin(ratio))
+    min_lon, max_lon = longitude - delta, longitude + delta
+    if min_lon < LONGITUDE_RANGE[0]:
+        lon_ranges = [(min_lon + 360, LONGITUDE_RANGE[1]), (LONGITUDE_RANGE[0], max_lon)]
+    elif max_lon > LONGITUDE_RANGE[1]:
+        lon_ranges = [(min_lon, LONGITUDE_RANGE[1]), (LONGITUDE_RANGE[0], max_lon - 360)]
+    else:
+        lon_ranges = [(min_lon, max_lon)]
+    return min_lat, max_lat, lon_ranges
+
+
+def covering_ranges(
+    min_lat: float, max_lat: float, lon_ranges: list[tuple[float, float]]
+) -> list[tuple[int, int]]:
+    """Возвращает диапазоны геохешей `[start, stop)`, покрывающие прямоугольник.
+    Выбирается самый мелкий уровень ячеек, на котором прямоугольник покрывается
+    не более чем MAX_COVER_CELLS ячейками; соседние ячейки объединяются в один диапазон."""
+
+    for level in range(GEOHASH_BITS, -1, -1):
+        lat_cells = range(
+            _cell_index(min_lat, LATITUDE_RANGE, level),
+            _cell_index(max_lat, LATITUDE_RANGE, level) + 1,
+        )
+        lon_cells = [
+            index
+            for low, high in lon_ranges
+            for index in range(
+                _cell_index(low, LONGITUDE_RANGE, level),
+                _cell_index(high, LONGITUDE_RANGE, level) + 1,
+            )
+        ]
+        if len(lat_cells) * len(lon_cells) <= MAX_COVER_CELLS:
+            break
+
+    shift = 2 * (GEOHASH_BITS - level)
+    codes = sorted(
+        {_interleave(lon, lat, level) for lon in lon_cells for lat in lat_cells}
+    )
+    ranges: list[tuple[int, int]] = []
+    for code in codes:
+        start, stop = code << shift, (code + 1) << shift
+        if ranges and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], stop)
+        else:
+            ranges.append((start, stop))
+    return ranges
+
+
+def within_radius_filter(latitude: float, longitude: float, radius_km: float) -> Q:
+    """Возвращает условие отбора точек, которые могут лежать в пределах `radius_km`.
+    Условие написано для полей `geohash`, `latitude` и `longitude`: диапазоны
+    геохешей читаются по индексу, а описанный прямоугольник отсекает лишние точки
+    ячеек. Точное расстояние проверяется отдельно, через `distance_expression`."""
+
+    min_lat, max_lat, lon_ranges = bounding_box(latitude, longitude, radius_km)
+    cells = Q()
+    for start, stop in covering_ranges(min_lat, max_lat, lon_ranges):
+        cells |= Q(geohash__gte=start, geohash__lt=stop)
+    longitudes = Q()
+    for low, high in lon_ranges:
+        longitudes |= Q(longitude__range=(low, high))
+    return cells & Q(latitude__range=(min_lat, max_lat)) & longitudes
+
+
+def distance_expression(latitude: float, longitude: float) -> Combinable:
+    """Возвращает выражение SQL для расстояния в километрах от точки
+    `(latitude, longitude)` до координат строки, по формуле гаверсинусов."""
+
+    lat = math.radians(latitude)
+    sin_dlat = Sin((Radians("latitude") - Value(lat)) / 2)
+    sin_dlon = Sin((Radians("longitude") - Value(math.radians(longitude))) / 2)
+    haversine = Power(sin_dlat, 2) + Value(math.cos(lat)) * Cos(Radians("latitude")) * Power(
+        sin_dlon, 2
+    )
+    # Из-за погрешности вычислений значение может немного превысить 1.
+    haversine = Least(Value(1.0), haversine, output_field=FloatField())
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(haversine))
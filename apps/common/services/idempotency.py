@@ -0,0 +1,169 @@
+import functools
+import hashlib
+import json
+import uuid
+from collections.abc import Callable
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
+
+from apps.common.models import IdempotencyKey
+
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+def get_scope(request: Request) -> str:
+    """Возвращает владельца ключа: пользователя или, для анонимных запросов,
+    IP-адрес клиента (с учётом прокси, как при ограничении частоты запросов DRF)."""
+
+    if request.user.is_authenticated:
+        return f"user:{request.user.pk}"
+    return f"ip:{BaseThrottle().get_ident(request)}"
+
+
+def get_key_id(request: Request, key: str) -> uuid.UUID:
+    """Возвращает идентификатор записи для ключа клиента: хеш ключа, его
+    владельца, метода и пути запроса."""
+
+    parts = (get_scope(request), request.method, request.path, key)
+    return uuid.UUID(bytes=hashlib.sha256("\0".join(parts).encode()).digest()[:16])
+
+
+def _describe(value) -> list | str:
+    """Приводит значение тела запроса, не сериализуемое в JSON, к строке.
+    Файлы описываются именем и размером, без чтения содержимого."""
+
+    if isinstance(value, UploadedFile):
+        return [value.name, value.size]
+    return str(value)
+
+
+def get_request_hash(request: Request) -> str:
+    """Возвращает хеш тела запроса: по нему повтор отличается от другого запроса
+    с тем же ключом."""
+
+    data = request.data
+    if hasattr(data, "lists"):
+        data = dict(data.lists())
+    payload = json.dumps(data, sort_keys=True, default=_describe)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _claim(key_id: uuid.UUID, request_hash: str) -> Response | None:
+    """Занимает ключ для выполнения запроса или возвращает ответ без выполнения:
+    сохранённый ответ для повтора, 422 для другого запроса с тем же ключом или
+    409, если запрос с этим ключом ещё выполняется. Занятый ключ получает статус
+    «выполняется» на IDEMPOTENCY_KEY_LEASE секунд; ключ, срок которого истёк
+    (устаревший ответ или запрос, который так и не завершился), занимается заново.
+    Транзакция короткая: запись блокируется только на время проверки."""
+
+    now = timezone.now()
+    lease = {
+        "request_hash": request_hash,
+        "status_code": None,
+        "response": None,
+        "headers": {},
+        "expires_at": now + timedelta(seconds=settings.IDEMPOTENCY_KEY_LEASE),
+    }
+    with transaction.atomic():
+        record, created = IdempotencyKey.objects.select_for_update().get_or_create(
+            pk=key_id, defaults=lease
+        )
+        if created:
+            return None
+        if record.expires_at <= now:
+            for name, value in lease.items():
+                setattr(record, name, value)
+            record.save()
+            return None
+
+    if record.request_hash != request_hash:
+        return Response(
+            {"detail": "Ключ уже использован для другого запроса."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    if record.status_code is None:
+        return Response(
+            {"detail": "Запрос с этим ключом ещё выполняется."},
+            status=status.HTTP_409_CONFLICT,
+            headers={"Retry-After": "1"},
+        )
+    return Response(
+        record.response,
+        status=record.status_code,
+        headers={**record.headers, REPLAYED_HEADER: "true"},
+    )
+
+
+def _store(key_id: uuid.UUID, response: Response):
+    """Сохраняет ответ на IDEMPOTENCY_KEY_TTL секунд. Заголовки сохраняются все,
+    кроме Content-Type: его выбирает рендерер при каждом ответе."""
+
+    headers = {
+        name: value for name, value in response.items() if name.lower() != "content-type"
+    }
+    IdempotencyKey.objects.filter(pk=key_id).update(
+        status_code=response.status_code,
+        response=response.data,
+        headers=headers,
+        expires_at=timezone.now() + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+    )
+
+
+def idempotent(handler: Callable) -> Callable:
+    """Декоратор метода APIView, выполняющий запрос с заголовком `Idempotency-Key`
+    не больше одного раза. Ответ (кроме ответов 5xx) сохраняется вместе с
+    заголовками на IDEMPOTENCY_KEY_TTL секунд, и повтор запроса с тем же ключом
+    получает его без повторного выполнения запроса, с заголовком
+    `Idempotent-Replayed`. Повтор с тем же ключом, но другим телом запроса
+    отклоняется с кодом 422, а одновременный повтор, пока первый запрос
+    выполняется, — с кодом 409.
+    Ключ занимается, а ответ сохраняется в отдельных коротких транзакциях, поэтому
+    сам запрос управляет своими транзакциями как обычно. Если запрос завершился
+    ошибкой или ответом 5xx, ключ освобождается и запрос можно повторить.
+    Запросы без заголовка выполняются как обычно."""
+
+    @functools.wraps(handler)
+    def wrapper(view, request: Request, *args, **kwargs) -> Response:
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return handler(view, request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise serializers.ValidationError(
+                {IDEMPOTENCY_HEADER: [f"Ключ должен содержать от 1 до {MAX_KEY_LENGTH} символов."]}
+            )
+
+        key_id = get_key_id(request, key)
+        response = _claim(key_id, get_request_hash(request))
+        if response is not None:
+            return response
+
+        try:
+            response = handler(view, request, *args, **kwargs)
+        except BaseException:
+            IdempotencyKey.objects.filter(pk=key_id).delete()
+            raise
+        if response.status_code >= 500:
+            IdempotencyKey.objects.filter(pk=key_id).delete()
+        else:
+            _store(key_id, response)
+        return response
+
+    return wrapper
+
+
+def prune() -> int:
+    """Удаляет устаревшие ключи."""
+
+    deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
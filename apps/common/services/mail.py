@@ -0,0 +1,193 @@
+import contextlib
+import logging
+import smtplib
+import time
+from collections.abc import Callable, Iterable
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
+from django.utils import timezone
+
+from apps.common.models import OutgoingEmail
+
+
+logger = logging.getLogger(__name__)
+
+# Ошибки отправки, после которых письмо можно отправить повторно.
+SEND_ERRORS = (smtplib.SMTPException, OSError)
+
+
+def enqueue_email(to: str, subject: str, body: str) -> OutgoingEmail:
+    """Ставит письмо в очередь отправки одним INSERT.
+    Письмо отправит процесс `send_emails`; если вызов выполняется в транзакции,
+    письмо будет отправлено, только если транзакция зафиксирована."""
+
+    return OutgoingEmail.objects.create(to=to, subject=subject, body=body)
+
+
+def enqueue_emails(emails: Iterable[tuple[str, str, str]]) -> list[OutgoingEmail]:
+    """Ставит в очередь письма (получатель, тема, текст) одним INSERT."""
+
+    return OutgoingEmail.objects.bulk_create(
+        OutgoingEmail(to=to, subject=subject, body=body) for to, subject, body in emails
+    )
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Возвращает задержку перед следующей попыткой после `attempts` неудачных:
+    EMAIL_OUTBOX_RETRY_DELAY, удваиваемая с каждой попыткой, но не больше
+    EMAIL_OUTBOX_MAX_RETRY_DELAY."""
+
+    delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_MAX_RETRY_DELAY))
+
+
+def is_permanent_error(error: Exception) -> bool:
+    """Проверяет, что повторная отправка не поможет: сервер окончательно (кодом 5xx)
+    отверг получателя или само письмо. Остальные ошибки, в том числе ошибки
+    соединения и авторизации, считаются временными."""
+
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _message in error.recipients.values())
+    return isinstance(error, smtplib.SMTPDataError) and error.smtp_code >= 500
+
+
+class RateLimiter:
+    """Ограничивает частоту действий: не больше `rate` в секунду (0 — без ограничения)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0
+        self.next_at = 0.0
+
+    def wait(self):
+        """Ждёт, пока не наступит время следующего действия."""
+
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self.next_at > now:
+            time.sleep(self.next_at - now)
+            now = self.next_at
+        self.next_at = now + self.interval
+
+
+class EmailOutboxWorker:
+    """Отправляет письма из очереди пачками через одно SMTP-соединение.
+    Соединение открывается один раз и используется для всех писем, пока в очереди
+    есть письма; при ошибке оно переоткрывается, а когда очередь пуста — закрывается.
+    Пачка занимается в короткой транзакции (`SELECT ... FOR UPDATE SKIP LOCKED`):
+    время следующей попытки её писем сдвигается на EMAIL_OUTBOX_LEASE секунд,
+    поэтому другие процессы их не выбирают. Письма отправляются вне транзакции, а
+    результаты записываются одним UPDATE. Отправка выполняется «хотя бы один раз»:
+    если процесс завершится аварийно посреди пачки, после истечения срока её
+    письма будут отправлены повторно.
+    Неудачная отправка повторяется с растущей задержкой (`retry_delay`), пока
+    не исчерпано EMAIL_OUTBOX_MAX_ATTEMPTS попыток."""
+
+    def __init__(
+        self,
+        batch_size: int | None = None,
+        rate: float | None = None,
+        connection: BaseEmailBackend | None = None,
+    ):
+        self.batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+        self.limiter = RateLimiter(settings.EMAIL_OUTBOX_RATE_LIMIT if rate is None else rate)
+        self.connection = connection or get_connection()
+
+    def _claim_emails(self) -> list[OutgoingEmail]:
+        """Занимает и возвращает пачку писем, время отправки которых наступило.
+        Выборка читается по частичному индексу `(next_attempt_at, id) WHERE
+        status = 'pending'`; письма, заблокированные другими процессами, пропускаются.
+        Возвращённые письма хранят прежнее время следующей попытки: с ним
+        неотправленные письма возвращаются в очередь."""
+
+        now = timezone.now()
+        with transaction.atomic():
+            emails = list(
+                OutgoingEmail.objects.select_for_update(skip_locked=True)
+                .filter(status="pending", next_attempt_at__lte=now)
+                .order_by("next_attempt_at", "id")[: self.batch_size]
+            )
+            OutgoingEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+                next_attempt_at=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+            )
+        return emails
+
+    def _send(self, email: OutgoingEmail):
+        """Отправляет одно письмо через открытое соединение."""
+
+        message = EmailMessage(
+            email.subject, email.body, settings.DEFAULT_FROM_EMAIL, [email.to]
+        )
+        self.connection.send_messages([message])
+
+    def close(self):
+        """Закрывает соединение с почтовым сервером; следующее письмо откроет новое."""
+
+        with contextlib.suppress(*SEND_ERRORS):
+            self.connection.close()
+
+    def _fail(self, email: OutgoingEmail, error: Exception):
+        """Записывает неудачную попытку и назначает следующую или отказывается от письма."""
+
+        email.attempts += 1
+        email.last_error = f"{type(error).__name__}: {error}"
+        if is_permanent_error(error) or email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            email.status = "failed"
+        else:
+            email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+
+    def run_once(self) -> int:
+        """Отправляет одну пачку писем и возвращает количество обработанных.
+        Если соединение с сервером не открывается, обработка пачки прерывается,
+        а необработанные письма возвращаются в очередь без учёта попытки."""
+
+        emails = self._claim_emails()
+        processed = 0
+        for email in emails:
+            self.limiter.wait()
+            try:
+                self.connection.open()
+            except SEND_ERRORS:
+                logger.warning("Не удалось подключиться к почтовому серверу", exc_info=True)
+                self.close()
+                break
+
+            try:
+                self._send(email)
+            except SEND_ERRORS as error:
+                self._fail(email, error)
+                self.close()
+            else:
+                email.attempts += 1
+                email.status = "sent"
+                email.sent_at = timezone.now()
+                email.last_error = ""
+            processed += 1
+
+        OutgoingEmail.objects.bulk_update(
+            emails, fields=["status", "attempts", "next_attempt_at", "last_error", "sent_at"]
+        )
+        return processed
+
+    def run(self, interval: float = 1, should_stop: Callable[[], bool] = lambda: False):
+        """Отправляет письма, пока `should_stop` не вернёт True.
+        Если писем к отправке не осталось, закрывает соединение и ждёт `interval`
+        секунд перед следующей проверкой."""
+
+        while not should_stop():
+            if self.run_once() < self.batch_size:
+                self.close()
+                time.sleep(interval)
+
+
+def prune(older_than: timedelta) -> int:
+    """Удаляет отправленные письма старше `older_than`."""
+
+    deleted, _ = OutgoingEmail.objects.filter(
+        status="sent", sent_at__lt=timezone.now() - older_than
+    ).delete()
+    return deleted
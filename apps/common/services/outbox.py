@@ -0,0 +1,363 @@
+import hashlib
+import hmac
+import json
+import logging
+import os
+import time
+import urllib.request
+import uuid
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Protocol
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, models
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from apps.common.models import OutboxCursor, OutboxEvent
+from apps.common.signals import post_restore, post_soft_delete
+
+
+logger = logging.getLogger(__name__)
+
+# Поля, которые не попадают в события: данные для потребителей не должны содержать секретов.
+EXCLUDED_FIELDS = {"password"}
+
+# Значения этих типов сохраняются в JSON как есть (DjangoJSONEncoder),
+# остальные (файлы, номера телефонов) — в строковом представлении поля.
+JSON_TYPES = (str, int, float, bool, Decimal, datetime, date, timedelta, uuid.UUID)
+
+Message = dict
+
+
+def serialize_instance(instance: models.Model) -> dict:
+    """Возвращает значения полей объекта для события.
+    Отложенные поля пропускаются, чтобы запись события не вызывала запросов к БД."""
+
+    deferred = instance.get_deferred_fields()
+    payload = {}
+    for field in instance._meta.concrete_fields:
+        if field.name in EXCLUDED_FIELDS or field.attname in deferred:
+            continue
+        value = field.value_from_object(instance)
+        if value is not None and not isinstance(value, JSON_TYPES):
+            value = field.value_to_string(instance)
+        payload[field.attname] = value
+    return payload
+
+
+def record(instance: models.Model, action: str, using: str):
+    """Записывает событие об изменении объекта."""
+
+    OutboxEvent.objects.using(using).create(
+        model=instance._meta.label_lower,
+        object_id=str(instance.pk),
+        action=action,
+        payload=serialize_instance(instance),
+    )
+
+
+def record_instances(instances: list[models.Model], action: str, using: str):
+    """Записывает события об изменении нескольких объектов одним INSERT.
+    Используется операциями `bulk_update`, которые не вызывают post_save."""
+
+    now = timezone.now()
+    OutboxEvent.objects.using(using).bulk_create(
+        OutboxEvent(
+            model=instance._meta.label_lower,
+            object_id=str(instance.pk),
+            action=action,
+            payload=serialize_instance(instance),
+            created_at=now,
+        )
+        for instance in instances
+    )
+
+
+def record_bulk(model: type[models.Model], pks: list, action: str, payload: dict, using: str):
+    """Записывает события о массовом изменении объектов одним INSERT."""
+
+    now = timezone.now()
+    OutboxEvent.objects.using(using).bulk_create(
+        OutboxEvent(
+            model=model._meta.label_lower,
+            object_id=str(pk),
+            action=action,
+            payload=payload,
+            created_at=now,
+        )
+        for pk in pks
+    )
+
+
+def on_save(sender, instance: models.Model, created: bool, update_fields, using: str, **kwargs):
+    """Записывает событие о создании, изменении, мягком удалении или восстановлении объекта."""
+
+    if created:
+        action = "created"
+    elif update_fields is not None and set(update_fields) == {"is_deleted", "deleted_at"}:
+        action = "soft_deleted" if instance.is_deleted else "restored"
+    else:
+        action = "updated"
+    record(instance, action, using)
+
+
+def on_delete(sender, instance: models.Model, using: str, **kwargs):
+    """Записывает событие о физическом удалении объекта."""
+
+    record(instance, "deleted", using)
+
+
+def on_soft_delete(sender, pks: list, using: str, **kwargs):
+    """Записывает события о массовом мягком удалении (IsDeletedQuerySet.delete)."""
+
+    record_bulk(sender, pks, "soft_deleted", {"is_deleted": True}, using)
+
+
+def on_restore(sender, pks: list, using: str, **kwargs):
+    """Записывает события о массовом восстановлении (IsDeletedQuerySet.restore)."""
+
+    record_bulk(sender, pks, "restored", {"is_deleted": False}, using)
+
+
+def track(model: type[models.Model]):
+    """Включает запись событий outbox для модели.
+    События о сохранении и удалении записываются обработчиками сигналов, которые
+    вызываются внутри транзакции изменения: удаление всегда выполняется в
+    транзакции, а сохранение оборачивается в неё в `BaseModel.save`. Массовые
+    `update()` событий не создают, кроме мягкого удаления и восстановления."""
+
+    model.outbox_tracked = True
+    uid = f"outbox:{model._meta.label_lower}"
+    post_save.connect(on_save, sender=model, dispatch_uid=uid)
+    post_delete.connect(on_delete, sender=model, dispatch_uid=uid)
+    post_soft_delete.connect(on_soft_delete, sender=model, dispatch_uid=uid)
+    post_restore.connect(on_restore, sender=model, dispatch_uid=uid)
+
+
+def track_models(labels: Iterable[str]):
+    """Включает запись событий outbox для моделей, заданных строками `app_label.Model`."""
+
+    for label in labels:
+        track(apps.get_model(label))
+
+
+class OutboxSink(Protocol):
+    """Получатель событий outbox.
+    Метод `send` должен либо доставить всю пачку, либо выбросить исключение."""
+
+    def send(self, messages: list[Message]): ...
+
+
+class FileSink:
+    """Дописывает события в локальный файл в формате JSON Lines."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def send(self, messages: list[Message]):
+        """Дописывает пачку событий и сбрасывает её на диск."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as file:
+            for message in messages:
+                file.write(json.dumps(message, cls=DjangoJSONEncoder, ensure_ascii=False))
+                file.write("\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+
+class WebhookSink:
+    """Отправляет пачку событий POST-запросом в формате JSON.
+    Если задан секрет, тело запроса подписывается HMAC-SHA256 в заголовке
+    `X-Outbox-Signature`."""
+
+    def __init__(self, url: str, secret: str | None = None, timeout: float = 10):
+        self.url = url
+        self.secret = secret
+        self.timeout = timeout
+
+    def send(self, messages: list[Message]):
+        """Отправляет пачку событий; ответ с кодом не из 2xx считается ошибкой."""
+
+        body = json.dumps({"events": messages}, cls=DjangoJSONEncoder).encode()
+        headers = {"Content-Type": "application/json"}
+        if self.secret:
+            signature = hmac.new(self.secret.encode(), body, hashlib.sha256).hexdigest()
+            headers["X-Outbox-Signature"] = f"sha256={signature}"
+
+        request = urllib.request.Request(self.url, data=body, headers=headers, method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            if not 200 <= response.status < 300:
+                raise RuntimeError(f"Webhook ответил кодом {response.status}")
+
+
+_subscribers: list[Callable[[list[Message]], None]] = []
+
+
+def subscribe(callback: Callable[[list[Message]], None]):
+    """Подписывает функцию на события, доставляемые получателем SubscriberSink."""
+
+    if callback not in _subscribers:
+        _subscribers.append(callback)
+
+
+def unsubscribe(callback: Callable[[list[Message]], None]):
+    """Отменяет подписку функции на события."""
+
+    if callback in _subscribers:
+        _subscribers.remove(callback)
+
+
+class SubscriberSink:
+    """Передаёт события подписчикам в текущем процессе (см. `subscribe`)."""
+
+    def send(self, messages: list[Message]):
+        """Вызывает всех подписчиков с пачкой событий."""
+
+        for callback in list(_subscribers):
+            callback(messages)
+
+
+def to_message(event: OutboxEvent) -> Message:
+    """Преобразует событие в сообщение для получателя."""
+
+    return {
+        "id": event.id,
+        "model": event.model,
+        "object_id": event.object_id,
+        "action": event.action,
+        "payload": event.payload,
+        "created_at": event.created_at,
+    }
+
+
+class SnapshotXmin(models.Func):
+    """Наименьший идентификатор транзакции, ещё выполняющейся на момент снимка
+    данных текущего запроса PostgreSQL: все транзакции с меньшими идентификаторами
+    уже зафиксированы или откачены."""
+
+    template = "pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+    output_field = models.BigIntegerField()
+
+
+class OutboxRelay:
+    """Доставляет события outbox получателю по порядку, пачками.
+    Позиция потребителя хранится в `OutboxCursor` и сдвигается после успешной
+    отправки пачки, поэтому доставка выполняется «хотя бы один раз»: при сбое
+    между отправкой и сохранением позиции пачка будет отправлена повторно.
+    Перед доставкой процесс занимает позицию на OUTBOX_RELAY_LEASE секунд одним
+    UPDATE, поэтому несколько процессов с одним именем потребителя не доставляют
+    события параллельно. Пачка отправляется вне транзакции и без блокировок, а
+    позиция сдвигается отдельным UPDATE, только если она всё ещё занята этим процессом."""
+
+    def __init__(self, name: str, sink: OutboxSink, batch_size: int | None = None):
+        self.name = name
+        self.sink = sink
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+
+    def _claim(self) -> tuple[OutboxCursor, datetime] | None:
+        """Занимает позицию потребителя и возвращает её вместе со сроком занятия.
+        Возвращает None, если позицию занял другой процесс."""
+
+        now = timezone.now()
+        locked_until = now + timedelta(seconds=settings.OUTBOX_RELAY_LEASE)
+        OutboxCursor.objects.get_or_create(name=self.name)
+        claimed = (
+            OutboxCursor.objects.filter(name=self.name)
+            .filter(models.Q(locked_until__isnull=True) | models.Q(locked_until__lte=now))
+            .update(locked_until=locked_until)
+        )
+        if not claimed:
+            return None
+        return OutboxCursor.objects.get(name=self.name), locked_until
+
+    def _release(self, locked_until: datetime, **fields) -> bool:
+        """Освобождает позицию, если она всё ещё занята этим процессом, и записывает
+        в неё `fields`. Возвращает False, если срок занятия истёк и позицию занял
+        другой процесс."""
+
+        return bool(
+            OutboxCursor.objects.filter(name=self.name, locked_until=locked_until).update(
+                locked_until=None, **fields
+            )
+        )
+
+    def _ready_events(self, cursor: OutboxCursor) -> list[OutboxEvent]:
+        """Возвращает следующую пачку событий после позиции `cursor`.
+        События упорядочены по транзакции, а внутри неё — по ключу. Ключи выдаются
+        последовательностью до фиксации, поэтому событие долгой транзакции может
+        появиться с меньшим ключом, чем уже доставленные. В PostgreSQL выбираются
+        только события транзакций младше границы снимка (`pg_snapshot_xmin`): они
+        уже завершены, а все ещё не видимые события получат больший идентификатор
+        транзакции, чем у позиции. Поэтому события не теряются, в том числе у
+        нового потребителя."""
+
+        events = OutboxEvent.objects.filter(
+            models.Q(transaction_id__gt=cursor.transaction_id)
+            | models.Q(transaction_id=cursor.transaction_id, id__gt=cursor.position)
+        )
+        if connection.vendor == "postgresql":
+            events = events.filter(transaction_id__lt=SnapshotXmin())
+        return list(events.order_by("transaction_id", "id")[: self.batch_size])
+
+    def run_once(self) -> int:
+        """Доставляет одну пачку событий и возвращает количество доставленных."""
+
+        claimed = self._claim()
+        if claimed is None:
+            return 0
+        cursor, locked_until = claimed
+
+        try:
+            events = self._ready_events(cursor)
+            if events:
+                self.sink.send([to_message(event) for event in events])
+        except BaseException:
+            self._release(locked_until)
+            raise
+        if not events:
+            self._release(locked_until)
+            return 0
+
+        moved = self._release(
+            locked_until,
+            transaction_id=events[-1].transaction_id,
+            position=events[-1].id,
+            updated_at=timezone.now(),
+        )
+        if not moved:
+            logger.warning(
+                "Позиция потребителя outbox %s занята другим процессом; пачка будет "
+                "доставлена повторно",
+                self.name,
+            )
+        return len(events)
+
+    def run(self, interval: float = 1, should_stop: Callable[[], bool] = lambda: False):
+        """Доставляет события, пока `should_stop` не вернёт True.
+        Если новых событий нет, ждёт `interval` секунд перед следующей проверкой."""
+
+        while not should_stop():
+            if self.run_once() < self.batch_size:
+                time.sleep(interval)
+
+
+def prune(older_than: timedelta) -> int:
+    """Удаляет события старше `older_than`, уже доставленные всем потребителям."""
+
+    positions = list(OutboxCursor.objects.values_list("transaction_id", "position"))
+    if not positions:
+        return 0
+    transaction_id, position = min(positions)
+    deleted, _ = OutboxEvent.objects.filter(
+        models.Q(transaction_id__lt=transaction_id)
+        | models.Q(transaction_id=transaction_id, id__lte=position),
+        created_at__lt=timezone.now() - older_than,
+    ).delete()
+    return deleted
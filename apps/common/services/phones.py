@@ -0,0 +1,69 @@
+import uuid
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from django.conf import settings
+from django.db.models import CharField, Value
+
+from apps.accounts.models import User
+from apps.profiles.models import ShippingAddress
+from apps.sellers.models import Seller
+
+
+@dataclass
+class PhoneLookupResult:
+    """Результат поиска объектов по номеру телефона."""
+
+    phone_number: str
+    users: list[uuid.UUID] = field(default_factory=list)
+    sellers: list[uuid.UUID] = field(default_factory=list)
+    shipping_addresses: list[uuid.UUID] = field(default_factory=list)
+
+
+@lru_cache(maxsize=4096)
+def normalize_phone_number(value: str, region: str | None = None) -> str | None:
+    """Приводит номер телефона к формату E.164.
+    Возвращает None, если номер некорректен. Результаты разбора кэшируются."""
+
+    from phonenumber_field.phonenumber import to_python
+
+    region = region or getattr(settings, "PHONENUMBER_DEFAULT_REGION", None)
+    phone_number = to_python(value, region=region)
+    if not phone_number or not phone_number.is_valid():
+        return None
+    return phone_number.as_e164
+
+
+def lookup_by_phone(value: str, region: str | None = None) -> PhoneLookupResult | None:
+    """Находит пользователей, продавцов и адреса доставки с указанным номером телефона.
+    Все три таблицы опрашиваются одним запросом `UNION ALL`, каждая ветка которого
+    использует индекс по нормализованному номеру. Возвращает None для некорректного номера."""
+
+    phone_number = normalize_phone_number(value, region)
+    if phone_number is None:
+        return None
+
+    kind = CharField()
+    users = (
+        User.objects.filter(phone_number=phone_number)
+        .annotate(kind=Value("users", output_field=kind))
+        .values_list("kind", "id")
+        .order_by()
+    )
+    sellers = (
+        Seller.objects.filter(phone_number=phone_number)
+        .annotate(kind=Value("sellers", output_field=kind))
+        .values_list("kind", "id")
+        .order_by()
+    )
+    addresses = (
+        ShippingAddress.objects.filter(phone=phone_number)
+        .annotate(kind=Value("shipping_addresses", output_field=kind))
+        .values_list("kind", "id")
+        .order_by()
+    )
+
+    result = PhoneLookupResult(phone_number=phone_number)
+    for kind_name, pk in users.union(sellers, addresses, all=True):
+        getattr(result, kind_name).append(pk)
+    return result
@@ -0,0 +1,140 @@
+import decimal
+from collections.abc import Callable
+from functools import cached_property
+
+from django.db.models import QuerySet
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+
+class ReadSerializer:
+    """Быстрая сериализация списков только для чтения по описанию DRF-сериализатора.
+    Поля, источники и преобразования значений берутся из `serializer_class` один раз,
+    строки читаются из БД через `values_list()` без создания объектов моделей, а
+    каждое значение проходит через заранее выбранную функцию преобразования.
+    Результат совпадает с `serializer_class(queryset, many=True).data`.
+    Поддерживаются поля, источник которых — поле модели, связанного объекта или
+    аннотация queryset."""
+
+    def __init__(self, serializer_class: type[serializers.ModelSerializer]):
+        self.serializer_class = serializer_class
+
+    @cached_property
+    def plan(self) -> list[tuple[str, str, Callable | None, bool]]:
+        """Возвращает для каждого поля: имя в ответе, выражение для `values_list()`,
+        функцию преобразования (None — значение выводится как есть) и признак
+        того, что функции нужен запрос (для абсолютных URL файлов)."""
+
+        serializer = self.serializer_class()
+        plan = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if field.source == "*" or isinstance(field, serializers.SerializerMethodField):
+                raise ValueError(f"Поле {name} не поддерживается быстрой сериализацией.")
+            lookup = "__".join(field.source_attrs)
+            plan.append((name, lookup, *self._get_converter(field)))
+        return plan
+
+    def _get_converter(self, field: serializers.Field) -> tuple[Callable | None, bool]:
+        """Выбирает функцию преобразования значения поля."""
+
+        if isinstance(field, serializers.FileField):
+            return self._file_converter(field), True
+        if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+            # DRF выводит первичный ключ связанного объекта как есть.
+            return None, False
+        if isinstance(field, serializers.DecimalField):
+            return self._decimal_converter(field), False
+        if isinstance(field, serializers.UUIDField) and field.uuid_format == "hex_verbose":
+            return str, False
+        if type(field) in (serializers.CharField, serializers.SlugField, serializers.EmailField):
+            return str, False
+        if type(field) is serializers.IntegerField:
+            return int, False
+        if type(field) is serializers.FloatField:
+            return float, False
+        return field.to_representation, False
+
+    def _decimal_converter(self, field: serializers.DecimalField) -> Callable:
+        """Возвращает преобразование Decimal в строку, как в `DecimalField`, но без
+        копирования контекста decimal для каждого значения."""
+
+        if (
+            field.decimal_places is None
+            or field.localize
+            or getattr(field, "normalize_output", False)
+            or not getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+        ):
+            return field.to_representation
+
+        quantum = decimal.Decimal(".1") ** field.decimal_places
+        context = decimal.getcontext().copy()
+        if field.max_digits is not None:
+            context.prec = field.max_digits
+        rounding = field.rounding
+
+        def convert(value) -> str:
+            if not isinstance(value, decimal.Decimal):
+                value = decimal.Decimal(str(value).strip())
+            return f"{value.quantize(quantum, rounding=rounding, context=context):f}"
+
+        return convert
+
+    def _file_converter(self, field: serializers.FileField) -> Callable:
+        """Возвращает преобразование имени файла в URL, как в `FileField`.
+        `values_list()` возвращает имя файла, поэтому URL строится хранилищем поля
+        модели напрямую."""
+
+        model = self.serializer_class.Meta.model
+        for attr in field.source_attrs[:-1]:
+            model = model._meta.get_field(attr).related_model
+        storage = model._meta.get_field(field.source_attrs[-1]).storage
+        use_url = getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL)
+
+        def convert(value: str, request: Request | None):
+            if not use_url:
+                return value
+            url = storage.url(value)
+            if request is not None:
+                return request.build_absolute_uri(url)
+            return url
+
+        return convert
+
+    def fetch(self, queryset: QuerySet) -> QuerySet:
+        """Возвращает queryset кортежей значений полей сериализатора."""
+
+        return queryset.values_list(*[lookup for _name, lookup, _convert, _request in self.plan])
+
+    def serialize(self, queryset: QuerySet, context: dict | None = None) -> list[dict]:
+        """Сериализует объекты queryset в список словарей."""
+
+        request = (context or {}).get("request")
+        fields = [
+            (name, _bind_request(convert, request) if needs_request else convert)
+            for name, _lookup, convert, needs_request in self.plan
+        ]
+        data = []
+        for row in self.fetch(queryset):
+            item = {}
+            for (name, convert), value in zip(fields, row):
+                if value is None or convert is None:
+                    item[name] = value
+                else:
+                    item[name] = convert(value)
+            data.append(item)
+        return data
+
+
+def _bind_request(convert: Callable, request: Request | None) -> Callable:
+    """Подставляет запрос в функцию преобразования файла.
+    Пустое имя файла выводится как None, как в `FileField`."""
+
+    def bound(value: str):
+        if not value:
+            return None
+        return convert(value, request)
+
+    return bound
@@ -0,0 +1,82 @@
+import hashlib
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+
+
+@dataclass(frozen=True)
+class CompiledSchema:
+    """Предварительно сгенерированная OpenAPI-схема, готовая к отдаче клиенту."""
+
+    content: bytes
+    etag: str
+
+
+def get_schema_path() -> Path:
+    """Возвращает путь к файлу, в котором хранится сгенерированная схема."""
+
+    return Path(settings.OPENAPI_SCHEMA_FILE)
+
+
+def generate_schema() -> bytes:
+    """Генерирует OpenAPI-схему проекта и возвращает её в формате JSON.
+    Инструменты drf-spectacular импортируются только здесь, чтобы не загружать
+    их при старте процесса."""
+
+    from drf_spectacular.renderers import OpenApiJsonRenderer
+    from drf_spectacular.settings import spectacular_settings
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=spectacular_settings.SERVE_PUBLIC)
+    return OpenApiJsonRenderer().render(schema, renderer_context={})
+
+
+def _atomic_write(path: Path, content: bytes):
+    """Записывает файл через временный файл, чтобы читатели не увидели его наполовину."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(content)
+    tmp_path.replace(path)
+
+
+def read_schema(path: Path | None = None) -> bytes | None:
+    """Читает сохранённую схему с диска. Возвращает None, если файла нет."""
+
+    path = path or get_schema_path()
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def write_schema(content: bytes, path: Path | None = None) -> Path:
+    """Сохраняет схему на диск и сбрасывает закэшированную в памяти копию."""
+
+    path = path or get_schema_path()
+    _atomic_write(path, content)
+    get_compiled_schema.cache_clear()
+    return path
+
+
+def is_schema_stale(path: Path | None = None) -> bool:
+    """Проверяет, отличается ли сохранённая схема от схемы, построенной по текущему коду."""
+
+    return read_schema(path) != generate_schema()
+
+
+@lru_cache(maxsize=1)
+def get_compiled_schema() -> CompiledSchema:
+    """Возвращает схему из памяти процесса.
+    При первом обращении схема читается с диска, а если файла ещё нет —
+    генерируется один раз и сохраняется, чтобы остальные процессы его переиспользовали."""
+
+    content = read_schema()
+    if content is None:
+        content = generate_schema()
+        _atomic_write(get_schema_path(), content)
+    etag = f'"{hashlib.sha256(content).hexdigest()}"'
+    return CompiledSchema(content=content, etag=etag)
@@ -1,7 +1,6 @@
 from django.core.validators import FileExtensionValidator
 from django.core.exceptions import ValidationError
 from django.core.files import File
-from PIL import Image
 
 
 def validate_image_size(value: File):
@@ -13,7 +12,10 @@ def validate_image_size(value: File):
 
 
 def validate_image_with_pillow(value: File):
-    """Проверяет, что переданный файл является изображением."""
+    """Проверяет, что переданный файл является изображением.
+    Pillow импортируется только при проверке, а не при загрузке моделей."""
+
+    from PIL import Image
 
     try:
         img = Image.open(value)
@@ -0,0 +1,7 @@
+from django.dispatch import Signal
+
+
+# Отправляются массовыми операциями IsDeletedQuerySet, которые выполняются одним
+# UPDATE и не вызывают post_save. Аргументы: sender (модель), pks (список ключей).
+post_soft_delete = Signal()
+post_restore = Signal()
@@ -1,3 +1,575 @@
-from django.test import TestCase
+import csv
+import importlib.util
+import io
+import json
+import smtplib
+import unittest
+import uuid
+from datetime import timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import permissions, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.views import APIView
+
+from apps.accounts.models import User
+from apps.announcements.models import Announcement, Category
+from apps.common.models import IdempotencyKey, OutboxCursor, OutboxEvent, OutgoingEmail
+from apps.common.renderers import FastJSONRenderer
+from apps.common.services.export import EXPORTS, export
+from apps.common.services.idempotency import REPLAYED_HEADER, idempotent
+from apps.common.services.mail import EmailOutboxWorker, enqueue_emails, retry_delay
+from apps.common.services.outbox import OutboxRelay, prune
+from apps.common.services.phones import lookup_by_phone, normalize_phone_number
+from apps.profiles.models import ShippingAddress
+from apps.sellers.models import Seller
+
+
+class StubEmailBackend(BaseEmailBackend):
+    """Почтовый бэкенд для тестов: отправляет письма в список или выбрасывает
+    ошибку, заданную для получателя."""
+
+    def __init__(self, errors: dict[str, Exception] | None = None, open_error=None, **kwargs):
+        super().__init__(**kwargs)
+        self.errors = errors or {}
+        self.open_error = open_error
+        self.sent = []
+
+    def open(self):
+        """Открывает соединение или выбрасывает заданную ошибку."""
+
+        if self.open_error is not None:
+            raise self.open_error
+
+    def send_messages(self, email_messages) -> int:
+        """Отправляет письма или выбрасывает ошибку, заданную для получателя."""
+
+        for message in email_messages:
+            for recipient in message.to:
+                if recipient in self.errors:
+                    raise self.errors[recipient]
+            self.sent.append(message)
+        return len(email_messages)
+
+
+@override_settings(
+    EMAIL_OUTBOX_RATE_LIMIT=0,
+    EMAIL_OUTBOX_MAX_ATTEMPTS=3,
+    EMAIL_OUTBOX_RETRY_DELAY=60,
+    EMAIL_OUTBOX_MAX_RETRY_DELAY=600,
+)
+class EmailOutboxWorkerTests(TestCase):
+    """Отправка писем из очереди, повторные попытки и отказ от письма."""
+
+    def test_sends_due_emails_through_one_connection(self):
+        """Письма пачки отправляются и отмечаются отправленными."""
+
+        enqueue_emails([("a@example.com", "Тема", "Текст"), ("b@example.com", "Тема", "Текст")])
+
+        processed = EmailOutboxWorker().run_once()
+
+        self.assertEqual(processed, 2)
+        self.assertEqual(
+            [message.to for message in mail.outbox], [["a@example.com"], ["b@example.com"]]
+        )
+        for email in OutgoingEmail.objects.all():
+            self.assertEqual(email.status, "sent")
+            self.assertEqual(email.attempts, 1)
+            self.assertIsNotNone(email.sent_at)
+
+    def test_temporary_error_is_retried_with_backoff(self):
+        """Временная ошибка откладывает письмо с удваивающейся задержкой."""
+
+        error = smtplib.SMTPRecipientsRefused({"a@example.com": (450, b"Mailbox busy")})
+        backend = StubEmailBackend(errors={"a@example.com": error})
+        email = enqueue_emails([("a@example.com", "Тема", "Текст")])[0]
+        worker = EmailOutboxWorker(connection=backend)
+
+        started = timezone.now()
+        worker.run_once()
+        email.refresh_from_db()
+        self.assertEqual(email.status, "pending")
+        self.assertEqual(email.attempts, 1)
+        self.assertIn("SMTPRecipientsRefused", email.last_error)
+        self.assertGreaterEqual(email.next_attempt_at, started + timedelta(seconds=60))
+
+        OutgoingEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+        worker.run_once()
+        email.refresh_from_db()
+        self.assertEqual(email.attempts, 2)
+        self.assertGreaterEqual(email.next_attempt_at, started + timedelta(seconds=120))
+
+    def test_gives_up_after_max_attempts(self):
+        """После EMAIL_OUTBOX_MAX_ATTEMPTS временных ошибок письмо не отправляется."""
+
+        error = smtplib.SMTPDataError(451, b"Try again later")
+        worker = EmailOutboxWorker(connection=StubEmailBackend(errors={"a@example.com": error}))
+        email = enqueue_emails([("a@example.com", "Тема", "Текст")])[0]
+
+        for _attempt in range(3):
+            OutgoingEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+            worker.run_once()
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, "failed")
+        self.assertEqual(email.attempts, 3)
+
+    def test_permanent_error_fails_immediately(self):
+        """Отказ сервера с кодом 5xx не повторяется, остальные письма отправляются."""
+
+        backend = StubEmailBackend(
+            errors={
+                "bad@example.com": smtplib.SMTPRecipientsRefused(
+                    {"bad@example.com": (550, b"No such user")}
+                ),
+                "spam@example.com": smtplib.SMTPDataError(554, b"Rejected"),
+            }
+        )
+        enqueue_emails(
+            [
+                ("bad@example.com", "Тема", "Текст"),
+                ("spam@example.com", "Тема", "Текст"),
+                ("ok@example.com", "Тема", "Текст"),
+            ]
+        )
+
+        EmailOutboxWorker(connection=backend).run_once()
+
+        statuses = dict(OutgoingEmail.objects.values_list("to", "status"))
+        self.assertEqual(
+            statuses,
+            {"bad@example.com": "failed", "spam@example.com": "failed", "ok@example.com": "sent"},
+        )
+        self.assertEqual([message.to for message in backend.sent], [["ok@example.com"]])
+
+    def test_connection_error_returns_batch_to_queue(self):
+        """Если соединение не открывается, письма остаются в очереди без учёта попытки."""
+
+        backend = StubEmailBackend(open_error=ConnectionRefusedError())
+        email = enqueue_emails([("a@example.com", "Тема", "Текст")])[0]
+
+        with self.assertLogs("apps.common.services.mail", "WARNING"):
+            processed = EmailOutboxWorker(connection=backend).run_once()
+
+        self.assertEqual(processed, 0)
+        email.refresh_from_db()
+        self.assertEqual(email.status, "pending")
+        self.assertEqual(email.attempts, 0)
+        self.assertLessEqual(email.next_attempt_at, timezone.now())
+
+    def test_claimed_batch_is_skipped_by_other_workers(self):
+        """Пачка, занятая одним процессом, не выбирается другим до истечения срока."""
+
+        enqueue_emails([("a@example.com", "Тема", "Текст")])
+
+        claimed = EmailOutboxWorker()._claim_emails()
+
+        self.assertEqual(len(claimed), 1)
+        self.assertEqual(EmailOutboxWorker()._claim_emails(), [])
+
+    def test_retry_delay_is_capped(self):
+        """Задержка удваивается с каждой попыткой, но не превышает максимума."""
+
+        self.assertEqual(retry_delay(1), timedelta(seconds=60))
+        self.assertEqual(retry_delay(3), timedelta(seconds=240))
+        self.assertEqual(retry_delay(10), timedelta(seconds=600))
+
+
+class IdempotentView(APIView):
+    """Представление для проверки декоратора `idempotent`: считает вызовы и
+    отвечает кодом из тела запроса."""
+
+    permission_classes = [permissions.AllowAny]
+    calls = 0
+    inner_response = None
+
+    @idempotent
+    def post(self, request):
+        """Создаёт «объект» и возвращает его номер."""
+
+        type(self).calls += 1
+        if request.data.get("reenter"):
+            type(self).inner_response = idempotent_view(
+                factory.post(
+                    "/items/", request.data, format="json", HTTP_IDEMPOTENCY_KEY="key"
+                )
+            )
+        code = request.data.get("status", status.HTTP_201_CREATED)
+        return Response(
+            {"number": self.calls}, status=code, headers={"Location": f"/items/{self.calls}/"}
+        )
+
+
+factory = APIRequestFactory()
+idempotent_view = IdempotentView.as_view()
+
+
+class IdempotencyTests(TestCase):
+    """Повтор запросов с заголовком Idempotency-Key."""
+
+    def setUp(self):
+        IdempotentView.calls = 0
+        IdempotentView.inner_response = None
+
+    def post(self, data: dict, key: str | None = "key") -> Response:
+        """Выполняет POST-запрос к тестовому представлению."""
+
+        headers = {"HTTP_IDEMPOTENCY_KEY": key} if key is not None else {}
+        return idempotent_view(factory.post("/items/", data, format="json", **headers))
+
+    def test_replay_returns_stored_response_and_headers(self):
+        """Повтор получает сохранённые тело, код и заголовки без выполнения запроса."""
+
+        first = self.post({"name": "a"})
+        replay = self.post({"name": "a"})
+
+        self.assertEqual(IdempotentView.calls, 1)
+        self.assertEqual(replay.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(replay.data, first.data)
+        self.assertEqual(replay["Location"], "/items/1/")
+        self.assertEqual(replay[REPLAYED_HEADER], "true")
+        self.assertFalse(first.has_header(REPLAYED_HEADER))
+
+    def test_same_key_with_different_body_is_rejected(self):
+        """Другой запрос с тем же ключом отклоняется с кодом 422."""
+
+        self.post({"name": "a"})
+        response = self.post({"name": "b"})
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(IdempotentView.calls, 1)
+
+    def test_server_error_is_not_stored(self):
+        """После ответа 5xx ключ освобождается и запрос выполняется повторно."""
+
+        response = self.post({"status": 503})
+
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.post({"status": 503})
+        self.assertEqual(IdempotentView.calls, 2)
+
+    def test_concurrent_request_with_same_key_gets_conflict(self):
+        """Повтор, пока первый запрос выполняется, получает 409."""
+
+        response = self.post({"reenter": True})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(IdempotentView.inner_response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(IdempotentView.calls, 1)
+
+    def test_expired_key_is_claimed_again(self):
+        """Запрос с устаревшим ключом выполняется заново."""
+
+        self.post({"name": "a"})
+        IdempotencyKey.objects.update(expires_at=timezone.now())
+        response = self.post({"name": "a"})
+
+        self.assertEqual(IdempotentView.calls, 2)
+        self.assertFalse(response.has_header(REPLAYED_HEADER))
+
+    def test_requests_without_key_are_not_deduplicated(self):
+        """Запросы без заголовка выполняются каждый раз и не сохраняются."""
+
+        self.post({"name": "a"}, key=None)
+        self.post({"name": "a"}, key=None)
+
+        self.assertEqual(IdempotentView.calls, 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_invalid_key_is_rejected(self):
+        """Слишком длинный ключ отклоняется с кодом 400."""
+
+        response = self.post({"name": "a"}, key="k" * 256)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(IdempotentView.calls, 0)
+
+
+class ListSink:
+    """Получатель outbox для тестов: запоминает доставленные пачки и выполняет
+    `on_send` во время отправки."""
+
+    def __init__(self, on_send=None):
+        self.batches = []
+        self.on_send = on_send
+
+    def send(self, messages: list[dict]):
+        """Запоминает пачку сообщений."""
+
+        if self.on_send is not None:
+            self.on_send()
+        self.batches.append([message["id"] for message in messages])
+
+
+class OutboxRelayTests(TestCase):
+    """Доставка событий outbox по порядку транзакций и занятие позиции потребителя."""
+
+    def create_events(self, events: list[tuple[int, int]]):
+        """Создаёт события с заданными ключами и идентификаторами транзакций."""
+
+        OutboxEvent.objects.bulk_create(
+            OutboxEvent(
+                id=pk, model="tests.model", object_id=str(pk), action="created",
+                transaction_id=transaction_id,
+            )
+            for pk, transaction_id in events
+        )
+
+    def test_delivers_in_batches_and_moves_cursor(self):
+        """События доставляются пачками, а позиция сдвигается и освобождается после каждой."""
+
+        self.create_events([(1, 10), (2, 10), (3, 10)])
+        sink = ListSink()
+        relay = OutboxRelay("search", sink, batch_size=2)
+
+        self.assertEqual(relay.run_once(), 2)
+        self.assertEqual(relay.run_once(), 1)
+        self.assertEqual(relay.run_once(), 0)
+        self.assertEqual(sink.batches, [[1, 2], [3]])
+        cursor = OutboxCursor.objects.get(name="search")
+        self.assertEqual((cursor.transaction_id, cursor.position), (10, 3))
+        self.assertIsNone(cursor.locked_until)
+
+    def test_events_of_later_committed_transaction_are_not_lost(self):
+        """Событие транзакции, зафиксированной позже, доставляется, хотя его ключ
+        меньше позиции потребителя; новый потребитель получает все события."""
+
+        self.create_events([(2, 10), (3, 11)])
+        sink = ListSink()
+        OutboxRelay("search", sink).run_once()
+
+        self.create_events([(1, 12)])
+        OutboxRelay("search", sink).run_once()
+
+        self.assertEqual(sink.batches, [[2, 3], [1]])
+        analytics = ListSink()
+        OutboxRelay("analytics", analytics).run_once()
+        self.assertEqual(analytics.batches, [[2, 3, 1]])
+
+    def test_failed_send_keeps_position_and_releases_cursor(self):
+        """Ошибка отправки не сдвигает позицию, и пачку можно сразу доставить снова."""
+
+        def fail():
+            raise ConnectionError
+
+        self.create_events([(1, 10)])
+
+        with self.assertRaises(ConnectionError):
+            OutboxRelay("search", ListSink(on_send=fail)).run_once()
+
+        cursor = OutboxCursor.objects.get(name="search")
+        self.assertEqual(cursor.position, 0)
+        self.assertIsNone(cursor.locked_until)
+        self.assertEqual(OutboxRelay("search", ListSink()).run_once(), 1)
+
+    def test_cursor_claimed_by_other_process_is_skipped(self):
+        """Пока позиция занята другим процессом, события не доставляются."""
+
+        self.create_events([(1, 10)])
+        OutboxCursor.objects.create(
+            name="search", locked_until=timezone.now() + timedelta(minutes=1)
+        )
+        sink = ListSink()
+
+        self.assertEqual(OutboxRelay("search", sink).run_once(), 0)
+        self.assertEqual(sink.batches, [])
+
+        OutboxCursor.objects.update(locked_until=timezone.now())
+        self.assertEqual(OutboxRelay("search", sink).run_once(), 1)
+
+    def test_lost_claim_does_not_move_cursor(self):
+        """Если за время отправки позицию занял другой процесс, она не сдвигается."""
+
+        def take_over():
+            OutboxCursor.objects.update(locked_until=timezone.now() + timedelta(minutes=1))
+
+        self.create_events([(1, 10)])
+
+        with self.assertLogs("apps.common.services.outbox", "WARNING"):
+            OutboxRelay("search", ListSink(on_send=take_over)).run_once()
+
+        self.assertEqual(OutboxCursor.objects.get(name="search").position, 0)
+
+    def test_prune_keeps_events_not_delivered_to_every_consumer(self):
+        """Удаляются только старые события, доставленные всем потребителям."""
+
+        self.create_events([(1, 10), (2, 10), (3, 11)])
+        OutboxEvent.objects.update(created_at=timezone.now() - timedelta(days=2))
+        OutboxCursor.objects.create(name="search", transaction_id=11, position=3)
+        OutboxCursor.objects.create(name="analytics", transaction_id=10, position=1)
+
+        self.assertEqual(prune(timedelta(days=1)), 1)
+        self.assertEqual(list(OutboxEvent.objects.values_list("id", flat=True)), [2, 3])
+
+
+class PhoneLookupTests(TestCase):
+    """Нормализация номеров телефона и поиск по номеру."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email="buyer@example.com", phone_number="+7 999 123-45-67")
+        cls.seller = Seller.objects.create(user=cls.user, phone_number="+79991234567")
+        cls.address = ShippingAddress.objects.create(
+            user=cls.user,
+            full_name="Иван Петров",
+            email="buyer@example.com",
+            phone="+7 (999) 123 45 67",
+            address="ул. Ленина, 1",
+            city="Москва",
+            country="Россия",
+            zipcode="101000",
+        )
+        other = User.objects.create(email="other@example.com", phone_number="+79990000000")
+        Seller.objects.create(user=other, phone_number="+79990000000")
+
+    def test_numbers_are_stored_in_e164(self):
+        """Номера сохраняются в формате E.164 независимо от записи при вводе."""
+
+        self.assertEqual(
+            User.objects.filter(pk=self.user.pk).values_list("phone_number", flat=True).get(),
+            "+79991234567",
+        )
+        self.assertEqual(
+            ShippingAddress.objects.values_list("phone", flat=True).get(), "+79991234567"
+        )
+
+    def test_normalize_phone_number(self):
+        """Номер в национальном формате приводится к E.164 по региону, некорректный — к None."""
+
+        self.assertEqual(normalize_phone_number("8 (999) 123-45-67", "RU"), "+79991234567")
+        self.assertIsNone(normalize_phone_number("12345", "RU"))
+
+    def test_lookup_finds_all_tables_in_one_query(self):
+        """Пользователи, продавцы и адреса с номером находятся одним запросом."""
+
+        with self.assertNumQueries(1):
+            result = lookup_by_phone("8 999 123 45 67", "RU")
+
+        self.assertEqual(result.phone_number, "+79991234567")
+        self.assertEqual(result.users, [self.user.pk])
+        self.assertEqual(result.sellers, [self.seller.pk])
+        self.assertEqual(result.shipping_addresses, [self.address.pk])
+
+    def test_invalid_number_is_not_looked_up(self):
+        """Для некорректного номера поиск не выполняется."""
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(lookup_by_phone("не номер"))
+
+
+class ExportTests(TestCase):
+    """Выгрузка объявлений в разных форматах и инкрементальная выгрузка."""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name="Электроника", image="category_images/a.png")
+        cls.started = timezone.now() - timedelta(days=1)
+        cls.pks = []
+        for number in range(3):
+            announcement = Announcement.objects.create(
+                title=f"Объявление {number}",
+                description="Описание",
+                price=Decimal(f"{number}.50"),
+                condition="NEW",
+                image="announcement_images/item.png",
+                category=category,
+            )
+            # Объявления изменены в обратном порядке создания.
+            Announcement.objects.filter(pk=announcement.pk).update(
+                updated_at=cls.started - timedelta(hours=number)
+            )
+            cls.pks.append(str(announcement.pk))
+        cls.admin = User.objects.create(email="admin@example.com", is_staff=True)
+
+    def read(self, file_format: str, since=None) -> bytes:
+        """Собирает выгрузку объявлений в одну строку байтов."""
+
+        return b"".join(export("announcements", file_format, since))
+
+    def test_csv(self):
+        """CSV содержит заголовок и строки в порядке изменения."""
+
+        rows = list(csv.reader(io.StringIO(self.read("csv").decode())))
+
+        self.assertEqual(tuple(rows[0]), EXPORTS["announcements"].fields)
+        self.assertEqual([row[0] for row in rows[1:]], self.pks[::-1])
+        self.assertEqual([row[4] for row in rows[1:]], ["2.50", "1.50", "0.50"])
+
+    def test_jsonl_since(self):
+        """С `since` выгружаются объекты, изменённые начиная с этого времени включительно."""
+
+        since = self.started - timedelta(hours=1)
+        lines = self.read("jsonl", since).decode().splitlines()
+
+        objects = [json.loads(line) for line in lines]
+        self.assertEqual([item["id"] for item in objects], [self.pks[1], self.pks[0]])
+        self.assertEqual(objects[0]["title"], "Объявление 1")
+        self.assertEqual(objects[0]["price"], "1.50")
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "Требуется пакет pyarrow.")
+    def test_parquet(self):
+        """Parquet читается обратно с типами полей модели."""
+
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(io.BytesIO(self.read("parquet")))
+
+        self.assertEqual(table.column_names, list(EXPORTS["announcements"].fields))
+        self.assertEqual(table.column("id").to_pylist(), self.pks[::-1])
+        self.assertEqual(
+            table.column("price").to_pylist(),
+            [Decimal("2.50"), Decimal("1.50"), Decimal("0.50")],
+        )
+
+    def test_view(self):
+        """Выгрузка доступна только персоналу и отдаётся потоком как вложение."""
+
+        client = APIClient()
+        url = "/support/export/announcements.jsonl"
+        self.assertEqual(client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        client.force_authenticate(self.admin)
+        response = client.get(url, {"since": self.started.isoformat()})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["Content-Disposition"], 'attachment; filename="announcements.jsonl"'
+        )
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], [self.pks[0]])
+        self.assertEqual(
+            client.get("/support/export/announcements.xml").status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+        self.assertEqual(
+            client.get(url, {"since": "вчера"}).status_code, status.HTTP_400_BAD_REQUEST
+        )
+
+
+class FastJSONRendererTests(TestCase):
+    """Совпадение ответа FastJSONRenderer с ответом JSONRenderer."""
+
+    def test_output_matches_json_renderer(self):
+        """Время, Decimal, UUID, нестроковые ключи и U+2028 кодируются как в DRF."""
+
+        data = {
+            "items": [
+                {
+                    "price": Decimal("10.50"),
+                    "created_at": timezone.now(),
+                    "date": timezone.now().date(),
+                    "id": uuid.uuid4(),
+                    "text": "строка\u2028с разделителем",
+                }
+            ],
+            1: None,
+        }
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from apps.common.views import ExportAPIView, PhoneLookupAPIView
+
+
+urlpatterns = [
+    path("phone-lookup/", PhoneLookupAPIView.as_view(), name="phone_lookup"),
+    path("export/<slug:name>.<slug:file_format>", ExportAPIView.as_view(), name="export"),
+]
@@ -1,3 +1,120 @@
-from django.shortcuts import render
+from collections.abc import Callable
 
-# Create your views here.
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils.http import parse_etags
+from django.utils.module_loading import import_string
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import permissions, serializers, status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.common.services.export import EXPORT_FORMATS, EXPORTS, export
+from apps.common.services.phones import lookup_by_phone
+from apps.common.services.schema import get_compiled_schema
+
+
+class CompiledSchemaView(View):
+    """Отдаёт предварительно сгенерированную OpenAPI-схему из памяти процесса.
+    В отличие от `SpectacularAPIView`, не обходит сериализаторы и представления
+    на каждый запрос. Схема отдаётся в формате JSON с заголовком ETag, поэтому
+    повторные запросы клиентов с `If-None-Match` получают ответ 304 без тела."""
+
+    content_type = "application/vnd.oai.openapi+json"
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        """Возвращает схему или 304, если у клиента уже актуальная версия."""
+
+        schema = get_compiled_schema()
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if schema.etag in if_none_match or "*" in if_none_match:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(schema.content, content_type=self.content_type)
+        response["ETag"] = schema.etag
+        response["Cache-Control"] = "no-cache"
+        return response
+
+
+def lazy_view(view_path: str, **initkwargs) -> Callable[..., HttpResponse]:
+    """Возвращает представление, которое импортирует класс `view_path` при первом запросе.
+    Используется для тяжёлых модулей (например, drf-spectacular), которые нужны
+    только на отдельных маршрутах и не должны загружаться при старте процесса."""
+
+    view = None
+
+    @csrf_exempt
+    def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        nonlocal view
+        if view is None:
+            view = import_string(view_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    return wrapper
+
+
+class PhoneLookupAPIView(APIView):
+    """Эндпоинт для поиска пользователей, продавцов и адресов доставки по номеру телефона.
+    Доступен только сотрудникам (инструменты поддержки, проверки на мошенничество).
+    Номер передаётся в параметре `phone`, регион для номеров без кода страны —
+    в параметре `region`."""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request: Request) -> Response:
+        """Возвращает идентификаторы объектов, связанных с номером телефона."""
+
+        result = lookup_by_phone(
+            request.query_params.get("phone", ""),
+            region=request.query_params.get("region"),
+        )
+        if result is None:
+            return Response(
+                {"phone": "Некорректный номер телефона."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(
+            {
+                "phone_number": result.phone_number,
+                "users": result.users,
+                "sellers": result.sellers,
+                "shipping_addresses": result.shipping_addresses,
+            }
+        )
+
+
+class ExportParamsSerializer(serializers.Serializer):
+    """Параметры выгрузки данных."""
+
+    since = serializers.DateTimeField(required=False)
+
+
+class ExportAPIView(APIView):
+    """Эндпоинт потоковой выгрузки объявлений и продавцов для аналитики и партнёров.
+    Данные читаются из БД частями и отдаются клиенту по мере чтения, поэтому
+    потребление памяти не зависит от размера таблицы. Параметр `since` задаёт
+    инкрементальную выгрузку объектов, изменённых начиная с указанного времени."""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request: Request, name: str, file_format: str) -> StreamingHttpResponse:
+        """Возвращает выгрузку `name` в формате `file_format` (csv, jsonl, parquet)."""
+
+        if name not in EXPORTS or file_format not in EXPORT_FORMATS:
+            raise Http404
+        params = ExportParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        response = StreamingHttpResponse(
+            export(name, file_format, params.validated_data.get("since")),
+            content_type=EXPORT_FORMATS[file_format],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{name}.{file_format}"'
+        return response
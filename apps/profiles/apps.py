@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ProfilesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.profiles"
+
+    def ready(self):
+        """Подключает обработчики сигналов приложения."""
+
+        from apps.profiles import signals  # noqa: F401
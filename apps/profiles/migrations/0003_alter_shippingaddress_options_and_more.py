@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-19 04:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_shippingaddress_profiles_address_phone_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='shippingaddress',
+            options={'ordering': ['-is_default', '-created_at'], 'verbose_name': 'Адрес доставки', 'verbose_name_plural': 'Адреса доставки'},
+        ),
+        migrations.AddField(
+            model_name='shippingaddress',
+            name='is_default',
+            field=models.BooleanField(default=False, verbose_name='Адрес по умолчанию'),
+        ),
+        migrations.AddConstraint(
+            model_name='shippingaddress',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_default', True)), fields=('user',), name='profiles_address_one_default'),
+        ),
+    ]
@@ -1,7 +1,7 @@
-from phonenumber_field.modelfields import PhoneNumberField
 from django.db import models
 from django.conf import settings
 
+from apps.common.fields import PhoneNumberField
 from apps.common.models import BaseModel
 
 
@@ -10,7 +10,8 @@ class ShippingAddress(BaseModel):
     Хранит информацию об адресе, необходимую для доставки заказов:
     полное имя получателя, контактные данные и почтовый адрес.
     Связана с пользователем через внешний ключ. Один пользователь
-    может иметь несколько адресов доставки."""
+    может иметь несколько адресов доставки, из которых не более одного
+    отмечено как адрес по умолчанию (гарантируется частичным уникальным индексом)."""
 
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -25,6 +26,7 @@ class ShippingAddress(BaseModel):
     city = models.CharField(max_length=200, verbose_name="Город")
     country = models.CharField(max_length=200, verbose_name="Страна")
     zipcode = models.CharField(max_length=6, verbose_name="Почтовый индекс")
+    is_default = models.BooleanField(default=False, verbose_name="Адрес по умолчанию")
 
     def __str__(self) -> str:
         """Возвращает строковое представление объекта адреса доставки."""
@@ -36,3 +38,14 @@ class ShippingAddress(BaseModel):
 
         verbose_name = "Адрес доставки"
         verbose_name_plural = "Адреса доставки"
+        ordering = ["-is_default", "-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user"],
+                condition=models.Q(is_default=True),
+                name="profiles_address_one_default",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["phone"], name="profiles_address_phone_idx"),
+        ]
@@ -0,0 +1,42 @@
+from rest_framework import serializers
+
+from apps.profiles.models import ShippingAddress
+
+
+class ShippingAddressSerializer(serializers.ModelSerializer):
+    """Сериализатор адреса доставки пользователя.
+    Пользователь определяется по запросу и не передаётся клиентом.
+    Флаг `is_default` обрабатывается сервисом адресной книги, который
+    снимает его с остальных адресов пользователя."""
+
+    class Meta:
+        """Метаданные сериализатора."""
+
+        model = ShippingAddress
+        fields = (
+            "id",
+            "full_name",
+            "email",
+            "phone",
+            "address",
+            "city",
+            "country",
+            "zipcode",
+            "is_default",
+            "created_at",
+            "updated_at",
+        )
+        read_only_fields = ("id", "created_at", "updated_at")
+
+
+class ShippingAddressBulkItemSerializer(ShippingAddressSerializer):
+    """Элемент массового обновления адресов: идентификатор и изменяемые поля."""
+
+    id = serializers.UUIDField()
+
+    def validate(self, attrs: dict) -> dict:
+        """Проверяет, что передан идентификатор адреса (частичная валидация его не требует)."""
+
+        if "id" not in attrs:
+            raise serializers.ValidationError({"id": "Обязательное поле."})
+        return attrs
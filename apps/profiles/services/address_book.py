@@ -0,0 +1,141 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.profiles.models import ShippingAddress
+from apps.profiles.serializers import (
+    ShippingAddressBulkItemSerializer,
+    ShippingAddressSerializer,
+)
+
+
+DEFAULT_ADDRESS_CACHE_KEY = "profiles:default_address:{user_id}"
+DEFAULT_ADDRESS_CACHE_TIMEOUT = 10 * 60
+# Маркер «у пользователя нет адреса по умолчанию», чтобы не ходить в БД повторно.
+NO_DEFAULT_ADDRESS = ""
+
+
+def get_default_address(user_id: uuid.UUID) -> dict | None:
+    """Возвращает адрес доставки пользователя по умолчанию в сериализованном виде.
+    Значение берётся из общего для всех процессов кэша (CACHES), а при промахе
+    читается одним запросом по частичному уникальному индексу `(user) WHERE
+    is_default`. После любого изменения адресов пользователя значение удаляется из
+    кэша при фиксации транзакции (`invalidate_default_address`). Значение,
+    прочитанное из БД одновременно с изменением, хранится не дольше
+    DEFAULT_ADDRESS_CACHE_TIMEOUT."""
+
+    key = DEFAULT_ADDRESS_CACHE_KEY.format(user_id=user_id)
+    data = cache.get(key)
+    if data is None:
+        address = ShippingAddress.objects.get_or_none(user_id=user_id, is_default=True)
+        data = ShippingAddressSerializer(address).data if address else NO_DEFAULT_ADDRESS
+        cache.set(key, data, DEFAULT_ADDRESS_CACHE_TIMEOUT)
+    return data or None
+
+
+def invalidate_default_address(user_id: uuid.UUID):
+    """Удаляет закэшированный адрес по умолчанию после фиксации транзакции.
+    До фиксации другие процессы читают из БД прежний адрес, поэтому удаление из
+    кэша раньше позволило бы им снова закэшировать устаревшее значение."""
+
+    key = DEFAULT_ADDRESS_CACHE_KEY.format(user_id=user_id)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def lock_address_book(user_id: uuid.UUID):
+    """Блокирует строку пользователя до конца транзакции.
+    Изменения адресной книги одного пользователя выполняются последовательно,
+    поэтому параллельные запросы не нарушают уникальный индекс `is_default`."""
+
+    list(
+        get_user_model()
+        .objects.select_for_update()
+        .filter(pk=user_id)
+        .values_list("pk", flat=True)
+    )
+
+
+def clear_default_address(user_id: uuid.UUID, exclude: uuid.UUID | None = None):
+    """Снимает флаг `is_default` с адресов пользователя, кроме `exclude`."""
+
+    defaults = ShippingAddress.objects.filter(user_id=user_id, is_default=True)
+    if exclude is not None:
+        defaults = defaults.exclude(pk=exclude)
+    defaults.update(is_default=False, updated_at=timezone.now())
+    invalidate_default_address(user_id)
+
+
+@transaction.atomic
+def save_address(serializer: ShippingAddressSerializer, user_id: uuid.UUID) -> ShippingAddress:
+    """Создаёт или обновляет адрес пользователя.
+    Первый адрес пользователя автоматически становится адресом по умолчанию.
+    Кэш адреса по умолчанию сбрасывают `clear_default_address` и обработчик
+    post_save адреса."""
+
+    lock_address_book(user_id)
+    is_default = serializer.validated_data.get("is_default")
+    if serializer.instance is None and is_default is None:
+        is_default = not ShippingAddress.objects.filter(user_id=user_id).exists()
+    if is_default:
+        clear_default_address(user_id, exclude=getattr(serializer.instance, "pk", None))
+
+    extra = {} if is_default is None else {"is_default": is_default}
+    return serializer.save(user_id=user_id, **extra)
+
+
+@transaction.atomic
+def bulk_update_addresses(user_id: uuid.UUID, items: list[dict]) -> list[ShippingAddress]:
+    """Обновляет несколько адресов пользователя одним запросом `bulk_update`.
+    Адреса загружаются одним запросом, каждый элемент валидируется отдельно;
+    при ошибке хотя бы в одном элементе ничего не сохраняется."""
+
+    errors, validated = [], []
+    item_serializers = [
+        ShippingAddressBulkItemSerializer(data=item, partial=True) for item in items
+    ]
+    valid_ids = [s.validated_data["id"] for s in item_serializers if s.is_valid()]
+
+    lock_address_book(user_id)
+    addresses = ShippingAddress.objects.filter(user_id=user_id).in_bulk(valid_ids)
+
+    for serializer in item_serializers:
+        if serializer.errors:
+            errors.append(serializer.errors)
+            continue
+        address = addresses.get(serializer.validated_data["id"])
+        if address is None:
+            errors.append({"id": ["Адрес не найден."]})
+            continue
+        errors.append({})
+        validated.append((address, serializer.validated_data))
+
+    defaults = [address for address, data in validated if data.get("is_default")]
+    if len(defaults) > 1:
+        raise serializers.ValidationError(
+            {"is_default": "Адресом по умолчанию может быть только один адрес."}
+        )
+    if any(errors):
+        raise serializers.ValidationError(errors)
+
+    if defaults:
+        clear_default_address(user_id, exclude=defaults[0].pk)
+        for address, _data in validated:
+            address.is_default = address is defaults[0]
+
+    now = timezone.now()
+    fields = {"updated_at"}
+    for address, data in validated:
+        for name, value in data.items():
+            if name != "id":
+                setattr(address, name, value)
+                fields.add(name)
+        address.updated_at = now
+
+    updated = [address for address, _data in validated]
+    ShippingAddress.objects.bulk_update(updated, fields=sorted(fields))
+    invalidate_default_address(user_id)
+    return updated
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.profiles.models import ShippingAddress
+from apps.profiles.services.address_book import invalidate_default_address
+
+
+@receiver(post_save, sender=ShippingAddress)
+@receiver(post_delete, sender=ShippingAddress)
+def invalidate_default_address_cache(sender, instance: ShippingAddress, **kwargs):
+    """Сбрасывает кэш адреса по умолчанию при изменении или удалении адреса."""
+
+    invalidate_default_address(instance.user_id)
@@ -1,3 +1,109 @@
+from django.core.cache import cache
+from django.db import IntegrityError
 from django.test import TestCase
+from rest_framework import serializers
 
-# Create your tests here.
+from apps.accounts.models import User
+from apps.profiles.models import ShippingAddress
+from apps.profiles.serializers import ShippingAddressSerializer
+from apps.profiles.services.address_book import (
+    bulk_update_addresses,
+    get_default_address,
+    save_address,
+)
+
+
+ADDRESS = {
+    "full_name": "Иван Петров",
+    "email": "ivan@example.com",
+    "phone": "+79990000000",
+    "address": "ул. Ленина, 1",
+    "city": "Москва",
+    "country": "Россия",
+    "zipcode": "101000",
+}
+
+
+class AddressBookTests(TestCase):
+    """Адресная книга: единственный адрес по умолчанию и его кэш."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email="buyer@example.com")
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def save(self, instance: ShippingAddress | None = None, **data) -> ShippingAddress:
+        """Создаёт или изменяет адрес через сервис адресной книги."""
+
+        serializer = ShippingAddressSerializer(
+            instance, data={**ADDRESS, **data}, partial=instance is not None
+        )
+        serializer.is_valid(raise_exception=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            return save_address(serializer, self.user.pk)
+
+    def test_first_address_becomes_default(self):
+        """Первый адрес становится адресом по умолчанию, следующие — нет."""
+
+        first = self.save()
+        second = self.save(city="Казань")
+
+        self.assertTrue(first.is_default)
+        self.assertFalse(second.is_default)
+
+    def test_new_default_replaces_previous(self):
+        """Новый адрес по умолчанию снимает флаг с прежнего."""
+
+        first = self.save()
+        second = self.save(city="Казань", is_default=True)
+
+        first.refresh_from_db()
+        self.assertFalse(first.is_default)
+        self.assertEqual(list(ShippingAddress.objects.filter(is_default=True)), [second])
+
+    def test_second_default_is_rejected_by_database(self):
+        """Частичный уникальный индекс не допускает двух адресов по умолчанию."""
+
+        self.save()
+
+        with self.assertRaises(IntegrityError):
+            ShippingAddress.objects.create(user=self.user, is_default=True, **ADDRESS)
+
+    def test_bulk_update_with_two_defaults_changes_nothing(self):
+        """Массовое изменение с двумя адресами по умолчанию отклоняется целиком."""
+
+        first = self.save()
+        second = self.save(city="Казань")
+
+        with self.assertRaises(serializers.ValidationError):
+            bulk_update_addresses(
+                self.user.pk,
+                [
+                    {"id": str(first.pk), "is_default": True, "city": "Сочи"},
+                    {"id": str(second.pk), "is_default": True},
+                ],
+            )
+
+        first.refresh_from_db()
+        self.assertEqual(first.city, "Москва")
+
+    def test_default_address_is_cached_until_change(self):
+        """Адрес по умолчанию читается из кэша, пока адреса пользователя не изменятся."""
+
+        first = self.save()
+        self.assertEqual(get_default_address(self.user.pk)["id"], str(first.pk))
+        with self.assertNumQueries(0):
+            get_default_address(self.user.pk)
+
+        second = self.save(city="Казань")
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_update_addresses(self.user.pk, [{"id": str(second.pk), "is_default": True}])
+
+        self.assertEqual(get_default_address(self.user.pk)["id"], str(second.pk))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertIsNone(get_default_address(self.user.pk))
@@ -0,0 +1,32 @@
+from django.urls import path
+
+from apps.profiles.views import (
+    DefaultShippingAddressAPIView,
+    ShippingAddressBulkUpdateAPIView,
+    ShippingAddressDetailAPIView,
+    ShippingAddressListCreateAPIView,
+)
+
+
+urlpatterns = [
+    path(
+        "addresses/",
+        ShippingAddressListCreateAPIView.as_view(),
+        name="shipping_addresses",
+    ),
+    path(
+        "addresses/default/",
+        DefaultShippingAddressAPIView.as_view(),
+        name="default_shipping_address",
+    ),
+    path(
+        "addresses/bulk/",
+        ShippingAddressBulkUpdateAPIView.as_view(),
+        name="shipping_addresses_bulk",
+    ),
+    path(
+        "addresses/<uuid:pk>/",
+        ShippingAddressDetailAPIView.as_view(),
+        name="shipping_address",
+    ),
+]
@@ -1,3 +1,95 @@
-from django.shortcuts import render
+from django.db.models import QuerySet
+from rest_framework import generics, permissions, status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from apps.common.services.idempotency import idempotent
+from apps.profiles.models import ShippingAddress
+from apps.profiles.serializers import ShippingAddressSerializer
+from apps.profiles.services.address_book import (
+    bulk_update_addresses,
+    get_default_address,
+    save_address,
+)
+
+
+class ShippingAddressListCreateAPIView(generics.ListCreateAPIView):
+    """Эндпоинт адресной книги пользователя.
+    Возвращает адреса доставки текущего пользователя (адрес по умолчанию первым)
+    и позволяет добавить новый адрес."""
+
+    serializer_class = ShippingAddressSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self) -> QuerySet[ShippingAddress]:
+        """Возвращает адреса текущего пользователя."""
+
+        return ShippingAddress.objects.filter(user=self.request.user)
+
+    @idempotent
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        """Добавляет адрес; повтор запроса с тем же `Idempotency-Key` не создаёт
+        второй адрес."""
+
+        return super().post(request, *args, **kwargs)
+
+    def perform_create(self, serializer: ShippingAddressSerializer):
+        """Сохраняет адрес через сервис адресной книги."""
+
+        save_address(serializer, self.request.user.pk)
+
+
+class ShippingAddressDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
+    """Эндпоинт для просмотра, изменения и удаления адреса доставки текущего пользователя."""
+
+    serializer_class = ShippingAddressSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self) -> QuerySet[ShippingAddress]:
+        """Возвращает адреса текущего пользователя."""
+
+        return ShippingAddress.objects.filter(user=self.request.user)
+
+    def perform_update(self, serializer: ShippingAddressSerializer):
+        """Сохраняет адрес через сервис адресной книги."""
+
+        save_address(serializer, self.request.user.pk)
+
+
+class DefaultShippingAddressAPIView(APIView):
+    """Эндпоинт, возвращающий адрес доставки пользователя по умолчанию.
+    Используется при оформлении заказа на каждом запросе, поэтому адрес
+    отдаётся из общего кэша и читается из БД только после его изменения."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request: Request) -> Response:
+        """Возвращает адрес по умолчанию или 404, если он не задан."""
+
+        data = get_default_address(request.user.pk)
+        if data is None:
+            return Response(
+                {"detail": "Адрес по умолчанию не задан."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(data)
+
+
+class ShippingAddressBulkUpdateAPIView(APIView):
+    """Эндпоинт для массового изменения адресов текущего пользователя.
+    Принимает список объектов с полем `id` и изменяемыми полями. Все изменения
+    применяются в одной транзакции одним запросом `bulk_update`."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def patch(self, request: Request) -> Response:
+        """Применяет изменения и возвращает обновлённые адреса."""
+
+        if not isinstance(request.data, list):
+            return Response(
+                {"detail": "Ожидается список адресов."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        addresses = bulk_update_addresses(request.user.pk, request.data)
+        return Response(ShippingAddressSerializer(addresses, many=True).data)
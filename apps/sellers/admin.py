@@ -1,3 +1,65 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db.models import QuerySet
+from django.http import HttpRequest
 
-# Register your models here.
+from apps.common.admin import LargeTableAdmin
+from apps.sellers.models import Seller
+from apps.sellers.services.moderation import approve_sellers, reject_sellers
+
+
+class ModerationStatusFilter(admin.SimpleListFilter):
+    """Фильтр продавцов по статусу модерации.
+    Значение «Ожидают проверки» соответствует частичному индексу очереди модерации."""
+
+    title = "Модерация"
+    parameter_name = "moderation"
+
+    def lookups(self, request: HttpRequest, model_admin: admin.ModelAdmin) -> list[tuple]:
+        """Возвращает варианты фильтра."""
+
+        return [
+            ("pending", "Ожидают проверки"),
+            ("approved", "Подтверждены"),
+            ("rejected", "Отклонены"),
+        ]
+
+    def queryset(self, request: HttpRequest, queryset: QuerySet[Seller]) -> QuerySet[Seller]:
+        """Фильтрует продавцов по выбранному статусу."""
+
+        if self.value() == "pending":
+            return queryset.filter(is_approved=False, moderated_at__isnull=True)
+        if self.value() == "approved":
+            return queryset.filter(is_approved=True)
+        if self.value() == "rejected":
+            return queryset.filter(is_approved=False, moderated_at__isnull=False)
+        return queryset
+
+
+@admin.register(Seller)
+class SellerAdmin(LargeTableAdmin):
+    """Админка продавцов с очередью модерации.
+    Пользователь загружается вместе с продавцом и выбирается автодополнением,
+    а решения по выбранным продавцам применяются одним UPDATE. Поиск выполняется
+    по началу slug, точному номеру телефона или идентификатору."""
+
+    list_display = ("__str__", "user", "phone_number", "created_at", "moderated_at")
+    list_filter = (ModerationStatusFilter,)
+    list_select_related = ("user",)
+    search_fields = ("slug__startswith", "phone_number__exact")
+    autocomplete_fields = ("user",)
+    readonly_fields = ("is_approved", "moderated_at", "created_at", "updated_at")
+    actions = ("approve", "reject")
+
+    @admin.action(description="Подтвердить выбранных продавцов")
+    def approve(self, request: HttpRequest, queryset: QuerySet[Seller]):
+        """Подтверждает выбранных продавцов и отправляет им уведомления."""
+
+        results = approve_sellers(list(queryset.values_list("pk", flat=True)))
+        self.message_user(request, f"Подтверждено продавцов: {len(results)}", messages.SUCCESS)
+
+    @admin.action(description="Отклонить выбранных продавцов")
+    def reject(self, request: HttpRequest, queryset: QuerySet[Seller]):
+        """Отклоняет выбранных продавцов и отправляет им уведомления."""
+
+        results = reject_sellers(list(queryset.values_list("pk", flat=True)))
+        self.message_user(request, f"Отклонено продавцов: {len(results)}", messages.SUCCESS)
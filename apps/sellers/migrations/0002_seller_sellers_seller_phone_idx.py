@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-19 04:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sellers', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='seller',
+            index=models.Index(fields=['phone_number'], name='sellers_seller_phone_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0 on 2026-10-19 04:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sellers', '0002_seller_sellers_seller_phone_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='seller',
+            name='moderated_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Дата модерации'),
+        ),
+        migrations.AddIndex(
+            model_name='seller',
+            index=models.Index(condition=models.Q(('is_approved', False), ('moderated_at__isnull', True)), fields=['created_at', 'id'], name='sellers_seller_moderation_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-19 04:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sellers', '0003_seller_moderation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='seller',
+            index=models.Index(fields=['-created_at'], name='sellers_seller_created_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-19 04:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sellers', '0004_seller_sellers_seller_created_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='seller',
+            index=models.Index(fields=['updated_at', 'id'], name='sellers_seller_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0 on 2026-10-19 04:56
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sellers', '0005_seller_sellers_seller_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='seller',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)], verbose_name='Широта'),
+        ),
+        migrations.AddField(
+            model_name='seller',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)], verbose_name='Долгота'),
+        ),
+    ]
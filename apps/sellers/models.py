@@ -1,9 +1,13 @@
-from phonenumber_field.modelfields import PhoneNumberField
 from autoslug import AutoSlugField
-from django.db import models
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, router, transaction
 from django.conf import settings
+from django.utils import timezone
 
+from apps.common.fields import PhoneNumberField
 from apps.common.models import BaseModel
+from apps.common.services import outbox
+from apps.common.services.geo import encode_geohash
 
 
 class Seller(BaseModel):
@@ -44,6 +48,21 @@ class Seller(BaseModel):
         blank=True, null=True, verbose_name="Описание продавца"
     )
     is_approved = models.BooleanField(default=False, verbose_name="Проверен")
+    moderated_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Дата модерации"
+    )
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+        verbose_name="Широта",
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+        verbose_name="Долгота",
+    )
 
     def __str__(self) -> str:
         """Возвращает строковое представление объекта продавца."""
@@ -53,8 +72,78 @@ class Seller(BaseModel):
             return f"Продавец: {display_name} подтвержден"
         return f"Продавец: {display_name} не подтвержден"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает координаты, загруженные из БД, чтобы при сохранении определить
+        их изменение без дополнительного запроса."""
+
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_location = (
+            instance.__dict__.get("latitude", models.DEFERRED),
+            instance.__dict__.get("longitude", models.DEFERRED),
+        )
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Сохраняет продавца и переносит его объявления, если координаты изменились.
+        Объявления, координаты которых совпадают с прежними координатами продавца
+        (взяты у продавца или не заданы), получают новые координаты одним UPDATE
+        в той же транзакции."""
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not {"latitude", "longitude"} & set(update_fields):
+            return super().save(*args, **kwargs)
+
+        previous = getattr(self, "_loaded_location", None)
+        location = (
+            self.__dict__.get("latitude", models.DEFERRED),
+            self.__dict__.get("longitude", models.DEFERRED),
+        )
+        if previous is None or models.DEFERRED in previous or previous == location:
+            super().save(*args, **kwargs)
+        else:
+            using = kwargs.get("using") or router.db_for_write(Seller, instance=self)
+            with transaction.atomic(using=using, savepoint=False):
+                super().save(*args, **kwargs)
+                self._move_announcements(previous, using)
+        self._loaded_location = location
+
+    def _move_announcements(self, previous: tuple, using: str):
+        """Присваивает текущие координаты объявлениям, стоящим в точке `previous`."""
+
+        announcement_model = self.announcements.model
+        queryset = announcement_model._base_manager.using(using).filter(
+            seller_id=self.pk, latitude=previous[0], longitude=previous[1]
+        )
+        pks = list(queryset.values_list("pk", flat=True))
+        if not pks:
+            return
+
+        location = {"latitude": self.latitude, "longitude": self.longitude, "geohash": None}
+        if self.latitude is not None and self.longitude is not None:
+            location["geohash"] = encode_geohash(self.latitude, self.longitude)
+        updated_at = timezone.now()
+        announcement_model._base_manager.using(using).filter(pk__in=pks).update(
+            **location, updated_at=updated_at
+        )
+        if announcement_model.outbox_tracked:
+            outbox.record_bulk(
+                announcement_model, pks, "updated", {**location, "updated_at": updated_at}, using
+            )
+
     class Meta:
         """Мета-класс для настройки модели."""
 
         verbose_name = "Продавец"
         verbose_name_plural = "Продавцы"
+        indexes = [
+            models.Index(fields=["-created_at"], name="sellers_seller_created_idx"),
+            models.Index(fields=["updated_at", "id"], name="sellers_seller_updated_idx"),
+            models.Index(fields=["phone_number"], name="sellers_seller_phone_idx"),
+            # Очередь модерации: непроверенные продавцы, по которым ещё нет решения.
+            models.Index(
+                fields=["created_at", "id"],
+                condition=models.Q(is_approved=False, moderated_at__isnull=True),
+                name="sellers_seller_moderation_idx",
+            ),
+        ]
@@ -0,0 +1,21 @@
+from rest_framework import permissions
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from apps.sellers.models import Seller
+
+
+class IsSeller(permissions.BasePermission):
+    """Разрешает доступ только пользователям с профилем продавца.
+    Продавец загружается один раз за запрос и сохраняется в `request.seller`."""
+
+    message = "Действие доступно только продавцам."
+
+    def has_permission(self, request: Request, view: APIView) -> bool:
+        """Проверяет, что у пользователя есть профиль продавца."""
+
+        if not request.user or not request.user.is_authenticated:
+            return False
+        if not hasattr(request, "seller"):
+            request.seller = Seller.objects.only("id").get_or_none(user_id=request.user.pk)
+        return request.seller is not None
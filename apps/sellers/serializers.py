@@ -0,0 +1,39 @@
+from rest_framework import serializers
+
+from apps.common.services.read_serializers import ReadSerializer
+from apps.sellers.models import Seller
+
+
+class SellerModerationSerializer(serializers.ModelSerializer):
+    """Сериализатор продавца в очереди модерации.
+    Email пользователя берётся из связанного объекта, загруженного тем же запросом."""
+
+    email = serializers.EmailField(source="user.email", read_only=True)
+
+    class Meta:
+        """Метаданные сериализатора."""
+
+        model = Seller
+        fields = (
+            "id",
+            "email",
+            "company_name",
+            "name",
+            "phone_number",
+            "website_url",
+            "description",
+            "created_at",
+        )
+        read_only_fields = fields
+
+
+seller_moderation_reader = ReadSerializer(SellerModerationSerializer)
+
+
+class SellerModerationDecisionSerializer(serializers.Serializer):
+    """Решение модератора по группе продавцов."""
+
+    ids = serializers.ListField(
+        child=serializers.UUIDField(), allow_empty=False, max_length=1000
+    )
+    decision = serializers.ChoiceField(choices=["approve", "reject"])
@@ -0,0 +1,125 @@
+import uuid
+from dataclasses import dataclass
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from apps.common.services import outbox
+from apps.common.services.mail import enqueue_emails
+from apps.common.services.pagination import decode_keyset_cursor, encode_cursor, keyset_filter
+from apps.sellers.models import Seller
+
+
+QUEUE_ORDERING = ["created_at", "id"]
+
+APPROVED_SUBJECT = "Ваш профиль продавца подтверждён"
+APPROVED_MESSAGE = "Здравствуйте! Ваш профиль продавца «{name}» прошёл проверку."
+REJECTED_SUBJECT = "Ваш профиль продавца не прошёл проверку"
+REJECTED_MESSAGE = "Здравствуйте! Ваш профиль продавца «{name}» не прошёл проверку."
+
+
+@dataclass(frozen=True)
+class ModerationResult:
+    """Продавец, по которому принято решение, и адрес для уведомления."""
+
+    seller_id: uuid.UUID
+    name: str
+    email: str
+
+
+def moderation_queue() -> QuerySet[Seller]:
+    """Возвращает продавцов, ожидающих проверки, от давно зарегистрированных к новым.
+    Выборка читается по частичному индексу `(created_at, id) WHERE NOT is_approved
+    AND moderated_at IS NULL`, а пользователь загружается тем же запросом."""
+
+    return (
+        Seller.objects.filter(is_approved=False, moderated_at__isnull=True)
+        .select_related("user")
+        .order_by(*QUEUE_ORDERING)
+    )
+
+
+def get_queue_page(cursor: str | None, limit: int) -> tuple[QuerySet[Seller], str | None]:
+    """Возвращает страницу очереди модерации и курсор следующей страницы.
+    Страница выбирается по ключу `(created_at, id)` последней строки, а не через
+    OFFSET, поэтому время ответа не растёт по мере листания очереди. Ключи
+    `limit + 1` строк читаются из индекса одним запросом: лишняя строка показывает,
+    есть ли следующая страница, а курсор берётся из последней строки страницы.
+    Страница возвращается как queryset именно этих строк, поэтому она и курсор
+    согласованы, даже если очередь изменилась между запросами.
+    Выбрасывает ValueError, если курсор повреждён."""
+
+    queryset = moderation_queue()
+    if cursor:
+        values = decode_keyset_cursor(cursor, Seller, QUEUE_ORDERING)
+        queryset = queryset.filter(keyset_filter(QUEUE_ORDERING, values))
+
+    keys = list(queryset.values_list(*QUEUE_ORDERING)[: limit + 1])
+    page = keys[:limit]
+    next_cursor = encode_cursor(page[-1]) if len(keys) > limit else None
+    return moderation_queue().filter(pk__in=[pk for _created_at, pk in page]), next_cursor
+
+
+def _moderate(seller_ids: list[uuid.UUID], is_approved: bool) -> list[ModerationResult]:
+    """Записывает решение по продавцам одним UPDATE и возвращает тех, кого оно затронуло.
+    Продавцы, по которым решение уже принято, пропускаются. `updated_at` получает
+    время решения, поэтому инкрементальная выгрузка видит изменение. Email пользователей
+    возвращается тем же запросом (`UPDATE ... FROM ... RETURNING`), а уведомления
+    ставятся в очередь писем в той же транзакции."""
+
+    sql = f"""
+        UPDATE {Seller._meta.db_table} AS s
+        SET is_approved = %s, moderated_at = %s, updated_at = %s
+        FROM {get_user_model()._meta.db_table} AS u
+        WHERE u.id = s.user_id
+            AND s.id = ANY(%s)
+            AND NOT s.is_approved
+            AND s.moderated_at IS NULL
+        RETURNING s.id, COALESCE(NULLIF(s.company_name, ''), s.name, u.email), u.email
+    """
+    moderated_at = timezone.now()
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [is_approved, moderated_at, moderated_at, list(seller_ids)])
+            results = [ModerationResult(*row) for row in cursor.fetchall()]
+        if results and Seller.outbox_tracked:
+            outbox.record_bulk(
+                Seller,
+                [result.seller_id for result in results],
+                "updated",
+                {
+                    "is_approved": is_approved,
+                    "moderated_at": moderated_at,
+                    "updated_at": moderated_at,
+                },
+                connection.alias,
+            )
+        if results:
+            queue_moderation_notifications(results, is_approved)
+    return results
+
+
+def queue_moderation_notifications(results: list[ModerationResult], is_approved: bool):
+    """Ставит уведомления о решении в очередь писем одним INSERT."""
+
+    if is_approved:
+        subject, template = APPROVED_SUBJECT, APPROVED_MESSAGE
+    else:
+        subject, template = REJECTED_SUBJECT, REJECTED_MESSAGE
+    enqueue_emails(
+        (result.email, subject, template.format(name=result.name)) for result in results
+    )
+
+
+def approve_sellers(seller_ids: list[uuid.UUID]) -> list[ModerationResult]:
+    """Подтверждает продавцов и ставит уведомления им в очередь писем."""
+
+    return _moderate(seller_ids, is_approved=True)
+
+
+def reject_sellers(seller_ids: list[uuid.UUID]) -> list[ModerationResult]:
+    """Отклоняет продавцов и ставит уведомления им в очередь писем."""
+
+    return _moderate(seller_ids, is_approved=False)
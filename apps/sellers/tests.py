@@ -1,3 +1,118 @@
+import unittest
+import uuid
+from datetime import timedelta
+
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.accounts.models import User
+from apps.common.renderers import FastJSONRenderer
+from apps.common.services.export import EXPORTS, get_export_queryset
+from apps.common.services.pagination import encode_cursor
+from apps.sellers.models import Seller
+from apps.sellers.serializers import SellerModerationSerializer, seller_moderation_reader
+from apps.sellers.services.moderation import approve_sellers, get_queue_page, moderation_queue
+
+
+class SellerReadSerializerTests(TestCase):
+    """Быстрая сериализация очереди модерации."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for number in range(3):
+            user = User.objects.create(email=f"seller{number}@example.com")
+            Seller.objects.create(
+                user=user,
+                company_name=f"Компания {number}" if number % 2 else "",
+                phone_number="+79990000000",
+                website_url="https://example.com" if number % 2 else None,
+            )
+
+    def test_fast_serialization_matches_drf(self):
+        """Быстрая сериализация даёт тот же JSON, что и DRF-сериализатор."""
+
+        queryset = moderation_queue()
+        expected = JSONRenderer().render(SellerModerationSerializer(queryset, many=True).data)
+        actual = FastJSONRenderer().render(seller_moderation_reader.serialize(queryset))
+
+        self.assertEqual(actual, expected)
+
+
+class ModerationQueueTests(TestCase):
+    """Страницы очереди модерации."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Продавцы попарно зарегистрированы одновременно: порядок внутри пары
+        # задаёт id, в том числе на границе страниц.
+        created_at = timezone.now() - timedelta(days=1)
+        for number in range(5):
+            user = User.objects.create(email=f"seller{number}@example.com")
+            seller = Seller.objects.create(
+                user=user, company_name=f"Компания {number}", phone_number="+79990000000"
+            )
+            Seller.objects.filter(pk=seller.pk).update(
+                created_at=created_at + timedelta(minutes=number // 2)
+            )
+        Seller.objects.filter(company_name="Компания 3").update(is_approved=True)
+
+    def test_pages_follow_queue_order_without_gaps(self):
+        """Курсор проходит всю очередь по порядку; у последней страницы его нет."""
+
+        expected = list(moderation_queue().values_list("pk", flat=True))
+        seen, cursor, pages = [], None, 0
+        while True:
+            page, cursor = get_queue_page(cursor, 1)
+            seen += [seller.pk for seller in page]
+            pages += 1
+            if cursor is None:
+                break
+
+        self.assertEqual(len(expected), 4)
+        self.assertEqual(seen, expected)
+        self.assertEqual(pages, 4)
+
+    def test_page_is_read_in_two_queries(self):
+        """Ключи страницы и её строки читаются двумя запросами."""
+
+        with self.assertNumQueries(2):
+            page, _cursor = get_queue_page(None, 3)
+            seller_moderation_reader.serialize(page)
+
+    def test_invalid_cursor_is_rejected(self):
+        """Повреждённый курсор или курсор с неверными значениями приводит к ValueError."""
+
+        cursors = [
+            "not-a-cursor",
+            encode_cursor([timezone.now().isoformat()]),
+            encode_cursor(["вчера", str(uuid.uuid4())]),
+            encode_cursor([timezone.now().isoformat(), "not-a-uuid"]),
+            encode_cursor([None, None]),
+        ]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor), self.assertRaises(ValueError):
+                get_queue_page(cursor, 2)
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql", "Решение модератора записывается SQL PostgreSQL."
+)
+class ModerationExportTests(TestCase):
+    """Решение модератора в инкрементальной выгрузке продавцов."""
+
+    def test_moderated_seller_is_exported_since_previous_export(self):
+        """После решения продавец попадает в выгрузку с `since` предыдущей выгрузки."""
+
+        user = User.objects.create(email="seller@example.com")
+        seller = Seller.objects.create(user=user, phone_number="+79990000000")
+        Seller.objects.filter(pk=seller.pk).update(
+            updated_at=timezone.now() - timedelta(days=1)
+        )
+        since = timezone.now()
+
+        approve_sellers([seller.pk])
 
-# Create your tests here.
+        exported = get_export_queryset(EXPORTS["sellers"], since)
+        self.assertEqual([row[0] for row in exported], [seller.pk])
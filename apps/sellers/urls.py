@@ -0,0 +1,12 @@
+from django.urls import path
+
+from apps.sellers.views import SellerModerationQueueAPIView
+
+
+urlpatterns = [
+    path(
+        "moderation/",
+        SellerModerationQueueAPIView.as_view(),
+        name="seller_moderation_queue",
+    ),
+]
@@ -1,3 +1,53 @@
-from django.shortcuts import render
+from rest_framework import permissions, serializers
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from apps.sellers.serializers import (
+    SellerModerationDecisionSerializer,
+    seller_moderation_reader,
+)
+from apps.sellers.services.moderation import approve_sellers, get_queue_page, reject_sellers
+
+
+class ModerationQueueParamsSerializer(serializers.Serializer):
+    """Параметры страницы очереди модерации."""
+
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=200, default=50)
+
+
+class SellerModerationQueueAPIView(APIView):
+    """Эндпоинт очереди модерации продавцов.
+    GET возвращает страницу непроверенных продавцов и курсор следующей страницы,
+    POST подтверждает или отклоняет группу продавцов одним запросом к БД."""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request: Request) -> Response:
+        """Возвращает страницу очереди модерации."""
+
+        params = ModerationQueueParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        try:
+            sellers, next_cursor = get_queue_page(
+                params.validated_data.get("cursor"), params.validated_data["limit"]
+            )
+        except ValueError as e:
+            raise serializers.ValidationError({"cursor": str(e)})
+
+        results = seller_moderation_reader.serialize(sellers)
+        return Response({"results": results, "next_cursor": next_cursor})
+
+    def post(self, request: Request) -> Response:
+        """Применяет решение модератора и возвращает идентификаторы затронутых продавцов.
+        Продавцы, по которым решение уже принято, не изменяются."""
+
+        serializer = SellerModerationDecisionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+        if serializer.validated_data["decision"] == "approve":
+            results = approve_sellers(ids)
+        else:
+            results = reject_sellers(ids)
+        return Response({"moderated": [result.seller_id for result in results]})
@@ -100,6 +100,23 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/ref/settings/#caches
+
+# Данные, которые должны быть согласованы между процессами (версия сводки фасетов,
+# адреса доставки по умолчанию), хранятся в кэше, поэтому в production кэш должен
+# быть общим для всех процессов: например,
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache и
+# CACHE_LOCATION=redis://localhost:6379/0 (нужен пакет redis). Кэш в памяти процесса
+# по умолчанию подходит только для разработки с одним процессом.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -145,6 +162,10 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "apps.common.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
@@ -154,6 +175,88 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
 }
 
+# Отдавать заранее сгенерированную OpenAPI-схему вместо построения на каждый запрос.
+# Файл создаётся командой `python manage.py build_schema`.
+OPENAPI_SCHEMA_PRECOMPILED = os.getenv("OPENAPI_SCHEMA_PRECOMPILED", "False") == "True"
+OPENAPI_SCHEMA_FILE = BASE_DIR / "openapi.json"
+
+# Лента свежих объявлений категории: сколько объявлений хранить в памяти процесса
+# и через сколько секунд перечитывать ленту из БД (изменения из других процессов).
+HOT_FEED_SIZE = 20
+HOT_FEED_TTL = 60
+
+# Сводка для фасетного поиска: срок хранения в кэше и минимальный возраст,
+# после которого устаревшая (после изменения объявлений) сводка перестраивается.
+FACET_SUMMARY_TTL = 60 * 60
+FACET_SUMMARY_MIN_AGE = 5
+
+# Популярность объявлений: просмотры копятся в памяти процесса и записываются в БД
+# пачкой раз в POPULARITY_FLUSH_INTERVAL секунд или при накоплении
+# POPULARITY_FLUSH_MAX_PENDING просмотров; больше этого числа просмотров в памяти
+# не хранится, и пока они не записаны, новые просмотры отбрасываются. При аварийном
+# завершении процесса теряется не больше просмотров, чем накоплено с последней записи.
+# Вклад просмотра в популярность уменьшается вдвое за POPULARITY_HALF_LIFE секунд.
+POPULARITY_FLUSH_INTERVAL = int(os.getenv("POPULARITY_FLUSH_INTERVAL", 10))
+POPULARITY_FLUSH_MAX_PENDING = int(os.getenv("POPULARITY_FLUSH_MAX_PENDING", 1000))
+POPULARITY_HALF_LIFE = 24 * 60 * 60
+
+# Похожие объявления: сколько похожих объявлений хранится для каждого объявления
+# и во сколько раз цена похожего объявления может отличаться от цены исходного.
+SIMILAR_ANNOUNCEMENTS_COUNT = int(os.getenv("SIMILAR_ANNOUNCEMENTS_COUNT", 12))
+SIMILAR_PRICE_RATIO = float(os.getenv("SIMILAR_PRICE_RATIO", 2))
+
+# Очередь пересчёта похожих объявлений (команда `reindex_similar`): сколько
+# объявлений пересчитывается за одну пачку и на сколько секунд пачка занимается
+# процессом; если процесс не завершил пересчёт за это время, пачку возьмёт другой.
+SIMILAR_REINDEX_BATCH_SIZE = 200
+SIMILAR_REINDEX_LEASE = 5 * 60
+
+# Outbox: модели, изменения которых записываются в таблицу событий для внешних
+# потребителей, и размер пачки доставки. Процесс доставки занимает позицию
+# потребителя на OUTBOX_RELAY_LEASE секунд: срок должен превышать время отправки
+# пачки, иначе её может повторно отправить другой процесс.
+OUTBOX_MODELS = [
+    "accounts.User",
+    "sellers.Seller",
+    "announcements.Category",
+    "announcements.Announcement",
+]
+OUTBOX_BATCH_SIZE = 500
+OUTBOX_RELAY_LEASE = 5 * 60
+OUTBOX_WEBHOOK_URL = os.getenv("OUTBOX_WEBHOOK_URL")
+OUTBOX_WEBHOOK_SECRET = os.getenv("OUTBOX_WEBHOOK_SECRET")
+
+# Почта. Для локальной проверки достаточно запустить SMTP-заглушку, например
+# `python -m aiosmtpd -n -l localhost:1025`, и указать EMAIL_PORT=1025.
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend")
+EMAIL_HOST = os.getenv("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", 25))
+EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "False") == "True"
+EMAIL_TIMEOUT = 10
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "webmaster@localhost")
+
+# Очередь писем: сколько писем отправляется за одну пачку, не больше скольких писем
+# в секунду (0 — без ограничения), сколько попыток делается до отказа и задержка
+# перед повторной попыткой в секундах (удваивается с каждой попыткой, но не больше
+# EMAIL_OUTBOX_MAX_RETRY_DELAY). Пачка занимается процессом на EMAIL_OUTBOX_LEASE
+# секунд: если процесс не записал результат отправки за это время, письма пачки
+# снова попадают в очередь.
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 100))
+EMAIL_OUTBOX_RATE_LIMIT = float(os.getenv("EMAIL_OUTBOX_RATE_LIMIT", 10))
+EMAIL_OUTBOX_MAX_ATTEMPTS = 6
+EMAIL_OUTBOX_RETRY_DELAY = 60
+EMAIL_OUTBOX_MAX_RETRY_DELAY = 60 * 60
+EMAIL_OUTBOX_LEASE = 15 * 60
+
+# Сколько секунд хранится ответ на запрос с заголовком Idempotency-Key: в течение
+# этого времени повтор запроса с тем же ключом получает тот же ответ. Выполняемый
+# запрос занимает ключ не дольше IDEMPOTENCY_KEY_LEASE секунд: если процесс
+# завершился, не сохранив ответ, после этого срока запрос можно повторить.
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", 24 * 60 * 60))
+IDEMPOTENCY_KEY_LEASE = 5 * 60
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
@@ -15,18 +15,29 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from apps.common.views import CompiledSchemaView, lazy_view
+
+
+if settings.OPENAPI_SCHEMA_PRECOMPILED:
+    schema_view = CompiledSchemaView.as_view()
+else:
+    schema_view = lazy_view("drf_spectacular.views.SpectacularAPIView")
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/schema/", schema_view, name="schema"),
     path(
         "api/docs/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
+        lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="schema"),
         name="swagger-ui",
     ),
     path("auth/", include("apps.accounts.urls")),
+    path("profiles/", include("apps.profiles.urls")),
+    path("announcements/", include("apps.announcements.urls")),
+    path("sellers/", include("apps.sellers.urls")),
+    path("support/", include("apps.common.urls")),
 ]